@@ -8,6 +8,12 @@ import logging
 
 from app.integrations.neo4j import neo4j_client
 from app.integrations.graphiti import build_communities as graphiti_build_communities
+from app.services.graph_stats import (
+    ENTITY_LABEL,
+    EPISODE_LABEL,
+    RELATION_TYPE,
+    get_graph_stats_service,
+)
 
 logger = logging.getLogger('diveteacher.api.graph')
 
@@ -30,6 +36,7 @@ async def build_communities_endpoint(background_tasks: BackgroundTasks):
     async def run_community_building():
         success = await graphiti_build_communities()
         if success:
+            get_graph_stats_service().invalidate()  # New Community nodes
             logger.info("✅ Background community building completed")
         else:
             logger.error("❌ Background community building failed")
@@ -49,46 +56,22 @@ async def get_graph_stats():
 
     Returns:
         Graph statistics (episodes, entities, relationships)
-    """
-
-    neo4j_client.connect()
 
-    # Query pour stats complètes (Episodes, Entities, Relations)
-    query = """
-    MATCH (e:Episode)
-    WITH count(e) AS episode_count
-    MATCH (n:Entity)
-    WITH episode_count, count(n) AS entity_count
-    MATCH ()-[r:RELATES_TO]->()
-    RETURN
-        episode_count,
-        entity_count,
-        count(r) AS relationship_count
+    Note:
+        Served by the graph stats service (count store, cached
+        GRAPH_STATS_TTL_SEC, updated by ingestion in between)
     """
-
     try:
-        records, summary, keys = neo4j_client.driver.execute_query(
-            query,
-            database_=neo4j_client.database
-        )
-
-        if records:
-            data = dict(records[0])
-            return JSONResponse(content={
-                "episodes": data.get("episode_count", 0),
-                "entities": data.get("entity_count", 0),
-                "relationships": data.get("relationship_count", 0)
-            })
-        else:
-            return JSONResponse(content={
-                "episodes": 0,
-                "entities": 0,
-                "relationships": 0
-            })
-
+        stats = await get_graph_stats_service().get_stats()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    return JSONResponse(content={
+        "episodes": stats["nodes"]["by_label"].get(EPISODE_LABEL, 0),
+        "entities": stats["nodes"]["by_label"].get(ENTITY_LABEL, 0),
+        "relationships": stats["relationships"]["by_type"].get(RELATION_TYPE, 0)
+    })
+
 
 @router.get("/graph/document/{document_id}")
 async def get_document_graph(document_id: str):
@@ -9,6 +9,13 @@ from datetime import datetime
 from app.integrations.neo4j import neo4j_client
 from app.core.llm import get_llm
 from app.core.config import settings
+from app.core.rate_limiter import get_rate_limiter_stats
+from app.integrations.embedding_cache import get_embedding_cache_stats
+from app.integrations.llm_cache import get_llm_cache_stats
+from app.integrations.dockling import get_docling_executor_stats
+from app.integrations.conversion_cache import get_conversion_cache_stats
+from app.services.upload_store import get_upload_store
+from app.core.status_store import get_status_store
 
 router = APIRouter()
 
@@ -48,5 +55,33 @@ async def health_check():
         health_status["services"]["llm"] = f"error: {str(e)}"
         health_status["status"] = "degraded"
 
+    # API caches (informational, never degrade health)
+    try:
+        health_status["caches"] = {
+            "embeddings": get_embedding_cache_stats(),
+            "llm_responses": get_llm_cache_stats(),
+            "docling_conversions": get_conversion_cache_stats()
+        }
+    except Exception as e:
+        health_status["caches"] = {"error": str(e)}
+
+    # Provider rate limiters (only those already created by ingestion/search)
+    health_status["rate_limits"] = get_rate_limiter_stats()
+
+    # Docling conversion backend (thread | process pool)
+    health_status["docling_executor"] = get_docling_executor_stats()
+
+    # Upload store: stored source files + uploads volume disk usage
+    try:
+        health_status["uploads"] = get_upload_store().get_stats()
+    except Exception as e:
+        health_status["uploads"] = {"error": str(e)}
+
+    # Processing status store (bounded, memory | sqlite)
+    try:
+        health_status["processing_status"] = get_status_store().get_stats()
+    except Exception as e:
+        health_status["processing_status"] = {"error": str(e)}
+
     return JSONResponse(content=health_status)
 
@@ -21,6 +21,7 @@ from pydantic import BaseModel, Field
 
 from app.integrations.neo4j import neo4j_client
 from app.core.config import settings
+from app.services.graph_stats import get_graph_stats_service
 
 logger = logging.getLogger('diveteacher.neo4j_api')
 
@@ -111,98 +112,25 @@ async def get_neo4j_stats():
     - Index information
     - Storage metrics
 
-    This endpoint is read-only and safe to call frequently.
+    This endpoint is read-only and safe to call frequently: counts come from
+    the Neo4j count store, cached GRAPH_STATS_TTL_SEC and updated by
+    ingestion in between (nodes.total counts multi-label nodes once).
     """
-    logger.info("📊 Fetching Neo4j statistics...")
-
     try:
-        with neo4j_client.driver.session() as session:
-            # Get Neo4j version and database info
-            version_result = session.run("CALL dbms.components() YIELD name, versions")
-            version_record = version_result.single()
-            version = version_record["versions"][0] if version_record else "unknown"
-
-            # Get node counts by label
-            node_counts_result = session.run("""
-                CALL db.labels() YIELD label
-                CALL {
-                    WITH label
-                    MATCH (n)
-                    WHERE label IN labels(n)
-                    RETURN count(n) as count
-                }
-                RETURN label, count
-                ORDER BY count DESC
-            """)
-
-            nodes_by_label = {}
-            total_nodes = 0
-            for record in node_counts_result:
-                label = record["label"]
-                count = record["count"]
-                nodes_by_label[label] = count
-                total_nodes += count
-
-            # Get relationship counts by type
-            rel_counts_result = session.run("""
-                CALL db.relationshipTypes() YIELD relationshipType
-                CALL {
-                    WITH relationshipType
-                    MATCH ()-[r]->()
-                    WHERE type(r) = relationshipType
-                    RETURN count(r) as count
-                }
-                RETURN relationshipType, count
-                ORDER BY count DESC
-            """)
-
-            rels_by_type = {}
-            total_rels = 0
-            for record in rel_counts_result:
-                rel_type = record["relationshipType"]
-                count = record["count"]
-                rels_by_type[rel_type] = count
-                total_rels += count
-
-            # Get index information
-            indexes_result = session.run("SHOW INDEXES")
-            indexes = []
-            for record in indexes_result:
-                indexes.append({
-                    "name": record.get("name", ""),
-                    "type": record.get("type", ""),
-                    "state": record.get("state", ""),
-                    "labels": record.get("labelsOrTypes", []),
-                    "properties": record.get("properties", [])
-                })
-
-            # Build response
-            stats = {
-                "status": "healthy",
-                "version": version,
-                "database": "neo4j",
-                "nodes": {
-                    "total": total_nodes,
-                    "by_label": nodes_by_label
-                },
-                "relationships": {
-                    "total": total_rels,
-                    "by_type": rels_by_type
-                },
-                "indexes": {
-                    "total": len(indexes),
-                    "types": list(set([idx["type"] for idx in indexes])),
-                    "details": indexes
-                }
-            }
-
-            logger.info(f"✅ Statistics retrieved: {total_nodes} nodes, {total_rels} relationships")
-            return stats
-
+        stats = await get_graph_stats_service().get_stats()
     except Exception as e:
         logger.error(f"❌ Failed to get Neo4j statistics: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to retrieve statistics: {str(e)}")
 
+    return {
+        "status": "healthy",
+        "version": stats["version"],
+        "database": stats["database"],
+        "nodes": stats["nodes"],
+        "relationships": stats["relationships"],
+        "indexes": stats["indexes"],
+    }
+
 
 @router.post("/query", response_model=QueryResponse)
 async def execute_neo4j_query(request: QueryRequest):
@@ -221,6 +149,9 @@ async def execute_neo4j_query(request: QueryRequest):
     - Count nodes: `MATCH (n) RETURN count(n) as count`
     - Find entities: `MATCH (n:EntityNode) RETURN n.name LIMIT 10`
     - Check relationships: `MATCH ()-[r]->() RETURN type(r), count(r)`
+
+    Note:
+        Queries that change the graph invalidate the cached graph statistics.
     """
     logger.info(f"🔍 Executing Cypher query: {request.cypher[:100]}...")
 
@@ -247,6 +178,9 @@ async def execute_neo4j_query(request: QueryRequest):
 
             # Get summary
             summary_info = result.consume()
+            if summary_info.counters.contains_updates:
+                # Write query (CREATE, MERGE, DELETE, ...): recount on the next stats call
+                get_graph_stats_service().invalidate()
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
 
             summary = {
@@ -535,16 +469,10 @@ async def clear_neo4j_graph(request: ClearRequest):
             backup_export_id = backup_export.export_id
             logger.info(f"✅ Backup created: {backup_export_id}")
 
-        # Step 2: Get current counts
+        # Step 2: Get current counts (count store)
         with neo4j_client.driver.session() as session:
-            count_result = session.run("""
-                MATCH (n)
-                OPTIONAL MATCH ()-[r]->()
-                RETURN count(DISTINCT n) as nodes, count(r) as rels
-            """)
-            counts = count_result.single()
-            nodes_count = counts["nodes"]
-            rels_count = counts["rels"]
+            nodes_count = session.run("MATCH (n) RETURN count(n) as count").single()["count"]
+            rels_count = session.run("MATCH ()-[r]->() RETURN count(r) as count").single()["count"]
 
             logger.warning(f"⚠️  Deleting {nodes_count} nodes and {rels_count} relationships...")
 
@@ -553,6 +481,8 @@ async def clear_neo4j_graph(request: ClearRequest):
 
             logger.info("✅ All data deleted")
 
+        get_graph_stats_service().reset_counts()
+
         return ClearResponse(
             status="cleared",
             backup_export_id=backup_export_id,
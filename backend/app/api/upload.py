@@ -2,34 +2,112 @@
 File Upload Endpoint - Production-Ready with DocumentQueue (ARIA v2.0.0)
 
 Architecture:
-- DocumentQueue: Sequential FIFO processing
-- SafeIngestionQueue: Token-aware rate limiting (in processor)
+- DocumentQueue: FIFO, stage-overlapped (conversion / chunking / ingestion workers)
+- RateLimiters: Shared RPM/TPM token buckets per provider (Gemini, OpenAI)
 - Background Processing: asyncio-based (no threading)
 
 Changes from v1.0.0:
 - Upload → enqueue to DocumentQueue (not direct processing)
-- DocumentQueue handles sequential processing
-- One document at a time (no concurrent processing)
-- Inter-document delays (60s) for additional rate limit safety
+- DocumentQueue runs conversion, chunking and ingestion on separate workers
+- Document N+1 converts while document N ingests (bounded hand-off queues)
+- API calls paced by the shared RateLimiters (no fixed inter-document delay)
+- Resumable uploads: session → PUT byte ranges → finalize (large manuals
+  over slow connections resume instead of restarting from byte zero)
 """
 
 import os
 import uuid
+import asyncio
+import hashlib
+from contextlib import contextmanager
 import aiofiles
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Set, Tuple
 from pydantic import BaseModel
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import re
 import logging
 
 from app.core.config import settings
-from app.core.processor import get_processing_status
+from app.core.processor import get_processing_status, retry_failed_chunks
+from app.core.status_events import get_status_event_broker
+from app.core.status_store import TERMINAL_STATUSES
+from app.integrations.conversion_cache import hash_file
+from app.integrations.dockling import CONVERSION_PROFILES
+from app.services.document_analyzer import analyze_document
 from app.services.document_queue import get_document_queue
+from app.services.ingestion_checkpoint import get_checkpoint_store
+from app.services.upload_store import get_upload_store
 
 router = APIRouter()
 logger = logging.getLogger('diveteacher.upload')
 
+# Multipart framing around the file (boundaries, part headers, form fields)
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def upload_too_large(content_length: Optional[str]) -> bool:
+    """
+    True when a request's Content-Length exceeds MAX_UPLOAD_SIZE_MB
+
+    Checked by the HTTP middleware (main.py) before any body is read.
+    Chunked requests (no Content-Length) are bounded while streaming.
+    """
+    if not content_length or not content_length.isdigit():
+        return False
+    return int(content_length) > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+
+
+async def stream_upload_to_disk(file: UploadFile, dest_path: str) -> Tuple[int, str]:
+    """
+    Stream an upload to dest_path in UPLOAD_BLOCK_SIZE_KB blocks
+
+    The bytes go to a temporary file next to dest_path while SHA-256 is
+    computed, then the file is atomically renamed: dest_path never holds a
+    partial upload, and memory stays at one block per upload.
+
+    Args:
+        file: Uploaded file
+        dest_path: Final path (in UPLOAD_DIR)
+
+    Returns:
+        (size in bytes, SHA-256 hex digest)
+
+    Raises:
+        HTTPException 413: File larger than MAX_UPLOAD_SIZE_MB (temp file removed)
+    """
+    max_size = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    block_size = settings.UPLOAD_BLOCK_SIZE_KB * 1024
+    tmp_path = os.path.join(os.path.dirname(dest_path), f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    total_size = 0
+
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            while True:
+                block = await file.read(block_size)
+                if not block:
+                    break
+                total_size += len(block)
+                if total_size > max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE_MB}MB"
+                    )
+                digest.update(block)
+                await f.write(block)
+
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return total_size, digest.hexdigest()
+
 
 # ════════════════════════════════════════════════════════
 # Pydantic Models for Enhanced Status API
@@ -39,6 +117,7 @@ class IngestionProgress(BaseModel):
     """Real-time ingestion progress (Bug #9 Fix)"""
     chunks_completed: int
     chunks_total: int
+    total_estimated: Optional[bool] = None  # Streamed pipeline: total known once chunking ends
     progress_pct: int
     current_chunk_index: int
 
@@ -49,12 +128,31 @@ class ProcessingMetrics(BaseModel):
     filename: Optional[str] = None
     pages: Optional[int] = None
     conversion_duration: Optional[float] = None
+    conversion_shards: Optional[List[Dict[str, Any]]] = None  # [{pages, duration}] per page-range shard
+    conversion_profile: Optional[str] = None  # fast | balanced | accurate (resolved, never "auto")
+    estimate: Optional[Dict[str, Any]] = None  # Pre-flight {conversion_sec, chunks, llm_tokens, ingestion_sec, total_sec}
+    conversion_cache_hit: Optional[bool] = None  # Converted document reused (same file + options + Docling)
+    ocr: Optional[Dict[str, Any]] = None  # {mode, pages_ocr, pages_skipped} (per-page OCR decision)
     num_chunks: Optional[int] = None
     avg_chunk_size: Optional[float] = None
     chunking_duration: Optional[float] = None
     ingestion_duration: Optional[float] = None
-    entities: Optional[int] = None       # ← Bug #10 Fix
-    relations: Optional[int] = None      # ← Bug #10 Fix
+    chunks_skipped: Optional[int] = None  # Already in graph (content_hash match)
+    llm_cache: Optional[Dict[str, Any]] = None  # {hits, misses, hit_rate, by_kind}
+    chunks_failed: Optional[int] = None  # Dead-lettered (see /upload/{id}/retry-failed)
+    entities: Optional[int] = None  # Extracted or resolved by this document (add_episode results)
+    relations: Optional[int] = None  # Extracted or resolved by this document (add_episode results)
+    entities_created: Optional[int] = None  # Of which new in the graph
+    relations_created: Optional[int] = None  # Of which new in the graph
+    graph_delta_exact: Optional[bool] = None  # False if a bulk batch returned no results
+
+
+class UploadSessionRequest(BaseModel):
+    """Resumable upload session creation"""
+    filename: str
+    size_bytes: int
+    content_type: Optional[str] = None
+    profile: Optional[str] = None  # fast | balanced | accurate | auto
 
 
 class UploadStatusResponse(BaseModel):
@@ -83,7 +181,8 @@ os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
 @router.post("/upload")
 async def upload_document(
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    profile: Optional[str] = Form(None)
 ):
     """
     Upload document for processing
@@ -93,9 +192,12 @@ async def upload_document(
 
     Args:
         file: Uploaded file (PDF, PPT, etc.)
+        profile: Optional conversion profile (fast | balanced | accurate | auto,
+            default: DOCLING_CONVERSION_PROFILE)
 
     Returns:
-        Upload ID and status
+        Upload ID and status (duplicate=True with the existing upload ID
+        when the same file content was already uploaded)
     """
 
     logger.info("=" * 60)
@@ -105,68 +207,324 @@ async def upload_document(
     print(f"{'='*60}\n", flush=True)
 
     try:
-        # Validate file extension
-        file_ext = Path(file.filename).suffix.lstrip(".")
-        allowed_extensions = settings.ALLOWED_EXTENSIONS.split(",")
+        profile = _validate_upload_request(file.filename, profile)
+
+        # Generate unique upload ID
+        upload_id = str(uuid.uuid4())
+        logger.info(f"✅ Generated upload_id: {upload_id}")
+
+        # Stream to disk (size limit + SHA-256 on the fly, atomic rename)
+        incoming_path = get_upload_store().incoming_path(upload_id)
+        total_size, sha256 = await stream_upload_to_disk(file, incoming_path)
+
+        return await _register_upload(
+            upload_id, incoming_path, file.filename, file.content_type, total_size, sha256, profile
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Upload error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ════════════════════════════════════════════════════════
+# Resumable Uploads (session → PUT byte ranges → finalize)
+# ════════════════════════════════════════════════════════
+
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+# Sessions with a request writing / finalizing right now (entries never outlive
+# the request, so expired or abandoned sessions leave nothing behind)
+_busy_sessions: Set[str] = set()
+
+
+@contextmanager
+def _session_busy(session_id: str, detail: str) -> Iterator[None]:
+    """Exclusive access to a session's partial file for one request (409 if taken)"""
+    if session_id in _busy_sessions:
+        raise HTTPException(status_code=409, detail=detail)
+    _busy_sessions.add(session_id)
+    try:
+        yield
+    finally:
+        _busy_sessions.discard(session_id)
+
+
+@router.post("/upload/sessions", status_code=201)
+async def create_upload_session(request: UploadSessionRequest):
+    """
+    Open a resumable upload session
+
+    Protocol:
+        1. POST /upload/sessions {filename, size_bytes, profile?} → session_id
+        2. PUT /upload/sessions/{id} with Content-Range: bytes start-end/total
+           (repeat; after a failure, GET the session and resume at "offset")
+        3. POST /upload/sessions/{id}/finalize → queued (same response as POST /upload)
+
+    Returns:
+        Session ID, received offset (0) and suggested chunk size
+    """
+    profile = _validate_upload_request(request.filename, request.profile)
+
+    if request.size_bytes <= 0:
+        raise HTTPException(status_code=400, detail="size_bytes must be positive")
+    if request.size_bytes > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE_MB}MB"
+        )
+
+    session_id = str(uuid.uuid4())
+    await asyncio.to_thread(
+        get_upload_store().create_session,
+        session_id, Path(request.filename).name, request.size_bytes, request.content_type, profile
+    )
 
-        if file_ext.lower() not in allowed_extensions:
+    logger.info(f"📤 Upload session opened: {request.filename} ({request.size_bytes} bytes)", extra={'upload_id': session_id})
+
+    return {
+        "session_id": session_id,
+        "offset": 0,
+        "size_bytes": request.size_bytes,
+        "chunk_size": settings.UPLOAD_SESSION_CHUNK_MB * 1024 * 1024,
+    }
+
+
+async def _get_session_or_404(session_id: str) -> Dict[str, Any]:
+    session = await asyncio.to_thread(get_upload_store().get_session, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Upload session not found: {session_id}")
+    return session
+
+
+def _session_response(session: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "session_id": session["session_id"],
+        "filename": session["filename"],
+        "offset": session["offset"],
+        "size_bytes": session["size_bytes"],
+        "complete": session["offset"] == session["size_bytes"],
+    }
+
+
+@router.get("/upload/sessions/{session_id}")
+async def get_upload_session(session_id: str):
+    """Received offset of a resumable upload (resume the PUTs from there)"""
+    return _session_response(await _get_session_or_404(session_id))
+
+
+@router.put("/upload/sessions/{session_id}")
+async def put_upload_session_range(session_id: str, request: Request):
+    """
+    Append one byte range to a resumable upload
+
+    Headers:
+        Content-Range: bytes start-end/total (end inclusive, total = size_bytes)
+
+    Note:
+        - start must not be past the received offset (409 + current offset)
+        - Bytes already received (retry after a lost response) are skipped
+        - The body is streamed to disk, never held in memory
+    """
+    session = await _get_session_or_404(session_id)
+
+    match = _CONTENT_RANGE.match(request.headers.get("content-range", ""))
+    if not match:
+        raise HTTPException(status_code=400, detail="Content-Range header required: bytes start-end/total")
+    start, end, total = (int(value) for value in match.groups())
+    if total != session["size_bytes"] or end < start or end >= total:
+        raise HTTPException(status_code=400, detail=f"Invalid Content-Range for a {session['size_bytes']}-byte upload")
+
+    with _session_busy(session_id, "Another range is being written to this session"):
+        offset = (await _get_session_or_404(session_id))["offset"]
+        if start > offset:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Range starts past the received offset", "offset": offset}
+            )
+
+        skip = offset - start  # Overlap with bytes already received
+        remaining = end + 1 - offset
+        async with aiofiles.open(get_upload_store().incoming_path(session_id), "ab") as f:
+            async for block in request.stream():
+                if skip:
+                    dropped = min(skip, len(block))
+                    block, skip = block[dropped:], skip - dropped
+                if not block or remaining <= 0:
+                    continue
+                block = block[:remaining]
+                remaining -= len(block)
+                await f.write(block)
+
+        await asyncio.to_thread(get_upload_store().touch_session, session_id)
+
+    return _session_response(await _get_session_or_404(session_id))
+
+
+@router.post("/upload/sessions/{session_id}/finalize")
+async def finalize_upload_session(session_id: str):
+    """
+    Complete a resumable upload: hash, store and enqueue
+
+    Returns:
+        Same response as POST /upload (upload_id = session_id, or the
+        existing upload ID for a duplicate)
+    """
+    with _session_busy(session_id, "A range is still being written to this session"):
+        # Read under the guard: a concurrent finalize may have consumed the session
+        session = await _get_session_or_404(session_id)
+        if session["offset"] != session["size_bytes"]:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Upload incomplete", "offset": session["offset"], "size_bytes": session["size_bytes"]}
+            )
+        incoming_path = get_upload_store().incoming_path(session_id)
+        sha256 = await asyncio.to_thread(hash_file, incoming_path)
+        await asyncio.to_thread(get_upload_store().delete_session, session_id, False)
+
+    logger.info(f"📤 Upload session finalized: {session['filename']}", extra={'upload_id': session_id})
+
+    return await _register_upload(
+        session_id, incoming_path, session["filename"], session["content_type"],
+        session["size_bytes"], sha256, session["profile"]
+    )
+
+
+@router.delete("/upload/sessions/{session_id}")
+async def abort_upload_session(session_id: str):
+    """Abort a resumable upload (partial file removed)"""
+    with _session_busy(session_id, "A range is being written to this session"):
+        await _get_session_or_404(session_id)
+        await asyncio.to_thread(get_upload_store().delete_session, session_id)
+    return {"session_id": session_id, "status": "aborted"}
+
+
+def _validate_upload_request(filename: str, profile: Optional[str]) -> Optional[str]:
+    """
+    Check extension and conversion profile of an upload
+
+    Returns:
+        Normalized profile (or None)
+
+    Raises:
+        HTTPException 400: Extension not allowed or unknown profile
+    """
+    file_ext = Path(filename).suffix.lstrip(".")
+    allowed_extensions = settings.ALLOWED_EXTENSIONS.split(",")
+
+    if file_ext.lower() not in allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type not allowed. Allowed: {', '.join(allowed_extensions)}"
+        )
+
+    logger.info(f"✅ File extension validated: {file_ext}")
+
+    # Validate conversion profile
+    if profile is not None:
+        profile = profile.strip().lower()
+        if profile != "auto" and profile not in CONVERSION_PROFILES:
             raise HTTPException(
                 status_code=400,
-                detail=f"File type not allowed. Allowed: {', '.join(allowed_extensions)}"
+                detail=f"Unknown conversion profile. Allowed: auto, {', '.join(CONVERSION_PROFILES)}"
             )
+    return profile
 
-        logger.info(f"✅ File extension validated: {file_ext}")
-
-        # Validate file size (read in chunks to avoid memory issues)
-        max_size = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024  # Convert to bytes
-        total_size = 0
-        chunks = []
-
-        # Read file
-        chunk_size = 8192
-        while True:
-            chunk = await file.read(chunk_size)
-            if not chunk:
-                break
-            total_size += len(chunk)
-            if total_size > max_size:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE_MB}MB"
-                )
-            chunks.append(chunk)
 
-        logger.info(f"✅ File read: {total_size} bytes ({len(chunks)} chunks)")
+# Upload IDs between their hash claim and enqueue (live for duplicate detection)
+_pending_claims: Set[str] = set()
 
-        # Generate unique upload ID
-        upload_id = str(uuid.uuid4())
-        logger.info(f"✅ Generated upload_id: {upload_id}")
 
-        # Save file to upload directory
-        file_path = os.path.join(settings.UPLOAD_DIR, f"{upload_id}_{file.filename}")
+async def _register_upload(
+    upload_id: str,
+    incoming_path: str,
+    filename: str,
+    content_type: Optional[str],
+    total_size: int,
+    sha256: str,
+    profile: Optional[str]
+) -> JSONResponse:
+    """
+    Store a fully received upload and enqueue it (shared by the direct and
+    resumable upload endpoints)
 
-        async with aiofiles.open(file_path, "wb") as f:
-            for chunk in chunks:
-                await f.write(chunk)
+    Args:
+        upload_id: Upload ID
+        incoming_path: Received file (UploadStore.incoming_path)
+        filename: Original filename
+        content_type: Declared MIME type
+        total_size: File size in bytes
+        sha256: Content hash
+        profile: Conversion profile (or None)
 
-        logger.info(f"✅ File saved to: {file_path}")
+    Returns:
+        Upload response (queued, or duplicate of an existing upload), with
+        the pre-flight analysis and cost estimate
+
+    Raises:
+        HTTPException 400: Password-protected PDF (pre-flight)
+    """
+    store = get_upload_store()
+    # Claimed but not yet enqueued: a concurrent upload of the same bytes is a duplicate
+    _pending_claims.add(upload_id)
+    try:
+        if settings.UPLOAD_DEDUPLICATION_ENABLED:
+            # Content-addressed store: same bytes → existing upload, nothing enqueued
+            duplicate = await asyncio.to_thread(
+                store.claim, sha256, upload_id, filename, total_size, _live_upload_ids()
+            )
+            if duplicate:
+                os.unlink(incoming_path)
+                return _duplicate_response(duplicate, filename)
+
+        # Pre-flight: pages, text layer, encryption → cost estimate (no conversion)
+        preflight = None
+        if settings.PREFLIGHT_ENABLED:
+            preflight = await asyncio.to_thread(analyze_document, incoming_path)
+            if preflight.get("encrypted"):
+                os.unlink(incoming_path)
+                if settings.UPLOAD_DEDUPLICATION_ENABLED:
+                    await asyncio.to_thread(store.mark_finished, upload_id, False)
+                raise HTTPException(
+                    status_code=400,
+                    detail="Password-protected PDF: remove the password and upload again"
+                )
+            logger.info(
+                f"🔎 Pre-flight: {preflight.get('pages')} pages, "
+                f"{len(preflight.get('pages_needing_ocr') or [])} need OCR, "
+                f"~{(preflight.get('estimate') or {}).get('total_sec')}s estimated",
+                extra={'upload_id': upload_id}
+            )
+
+        if settings.UPLOAD_DEDUPLICATION_ENABLED:
+
+            file_path = await asyncio.to_thread(store.adopt, sha256, incoming_path, filename)
+        else:
+            file_path = os.path.join(settings.UPLOAD_DIR, f"{upload_id}_{filename}")
+            os.replace(incoming_path, file_path)
+
+        logger.info(f"✅ File saved to: {file_path} ({total_size} bytes, sha256 {sha256[:12]}…)")
 
         # Prepare metadata
         metadata = {
-            "filename": file.filename,
+            "filename": filename,
             "size_bytes": total_size,
-            "content_type": file.content_type,
+            "content_type": content_type,
+            "sha256": sha256,
         }
+        if profile:
+            metadata["conversion_profile"] = profile
+        if preflight:
+            metadata["preflight"] = preflight
 
         # ═══════════════════════════════════════════════════════════
         # 🔧 NEW: Production-Ready DocumentQueue (ARIA v2.0.0)
         # ═══════════════════════════════════════════════════════════
         # Upload → Enqueue (not direct processing)
         # Queue handles:
-        # - Sequential processing (one doc at a time)
+        # - Stage workers (convert N+1 while N ingests)
         # - FIFO order
-        # - Inter-document delays (60s)
-        # - SafeIngestionQueue inside processor
+        # - RateLimiters pace Gemini/OpenAI calls inside processor
         # ═══════════════════════════════════════════════════════════
 
         print(f"[{upload_id}] Enqueueing to DocumentQueue...", flush=True)
@@ -181,52 +539,84 @@ async def upload_document(
             upload_id=upload_id,
             metadata=metadata
         )
+    finally:
+        _pending_claims.discard(upload_id)
+
+    logger.info(f"[{upload_id}] ✅ Document enqueued")
+    logger.info(f"   Queue position: {queue_entry['queue_position']}")
+    logger.info(f"   Queue size: {len(queue.queue)}")
+    print(f"[{upload_id}] ✅ Enqueued (position: {queue_entry['queue_position']})", flush=True)
+
+    # ═══════════════════════════════════════════════════════════
+    # Initialize status dict for immediate status endpoint response
+    # ═══════════════════════════════════════════════════════════
+    from app.core.processor import processing_status
+    from datetime import datetime
+
+    processing_status[upload_id] = {
+        "status": "queued",  # ← Changed from "processing" to "queued"
+        "stage": "queued",
+        "sub_stage": "waiting_in_queue",
+        "progress": 0,
+        "progress_detail": {
+            "current": 0,
+            "total": 4,
+            "unit": "stages"
+        },
+        "queue_position": queue_entry['queue_position'],  # ← NEW
+        "error": None,
+        "started_at": datetime.now().isoformat(),
+        "metrics": {
+            "file_size_mb": round(total_size / (1024 * 1024), 2),
+            "filename": filename,
+            "estimate": (preflight or {}).get("estimate")
+        }
+    }
 
-        logger.info(f"[{upload_id}] ✅ Document enqueued")
-        logger.info(f"   Queue position: {queue_entry['queue_position']}")
-        logger.info(f"   Queue size: {len(queue.queue)}")
-        print(f"[{upload_id}] ✅ Enqueued (position: {queue_entry['queue_position']})", flush=True)
+    logger.info(f"[{upload_id}] ✅ Status dict initialized (queued)")
 
-        # ═══════════════════════════════════════════════════════════
-        # Initialize status dict for immediate status endpoint response
-        # ═══════════════════════════════════════════════════════════
-        from app.core.processor import processing_status
-        from datetime import datetime
-
-        processing_status[upload_id] = {
-            "status": "queued",  # ← Changed from "processing" to "queued"
-            "stage": "queued",
-            "sub_stage": "waiting_in_queue",
-            "progress": 0,
-            "progress_detail": {
-                "current": 0,
-                "total": 4,
-                "unit": "stages"
-            },
-            "queue_position": queue_entry['queue_position'],  # ← NEW
-            "error": None,
-            "started_at": datetime.now().isoformat(),
-            "metrics": {
-                "file_size_mb": round(total_size / (1024 * 1024), 2),
-                "filename": file.filename
-            }
-        }
+    return JSONResponse(content={
+        "upload_id": upload_id,
+        "filename": filename,
+        "status": "queued",
+        "queue_position": queue_entry['queue_position'],
+        "preflight": _preflight_summary(preflight) if preflight else None,
+        "message": f"Document uploaded and queued for processing (position: {queue_entry['queue_position']})"
+    })
 
-        logger.info(f"[{upload_id}] ✅ Status dict initialized (queued)")
 
-        return JSONResponse(content={
-            "upload_id": upload_id,
-            "filename": file.filename,
-            "status": "queued",
-            "queue_position": queue_entry['queue_position'],
-            "message": f"Document uploaded and queued for processing (position: {queue_entry['queue_position']})"
-        })
+def _preflight_summary(preflight: Dict[str, Any]) -> Dict[str, Any]:
+    """Pre-flight analysis for API responses (OCR page list → count)"""
+    summary = {key: value for key, value in preflight.items() if key != "pages_needing_ocr"}
+    if "pages_needing_ocr" in preflight:
+        summary["pages_needing_ocr"] = len(preflight["pages_needing_ocr"])
+    return summary
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"❌ Upload error: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _live_upload_ids() -> set:
+    """Upload IDs claimed, queued or in the pipeline in this process"""
+    queue = get_document_queue()
+    return {entry["upload_id"] for entry in queue.queue} | set(queue.in_flight) | _pending_claims
+
+
+def _duplicate_response(existing: Dict[str, Any], filename: str) -> JSONResponse:
+    """Upload response for content already uploaded (no new processing)"""
+    status = get_processing_status(existing["upload_id"])
+    current = status["status"] if status else existing["status"]
+
+    logger.info(
+        f"♻️  Duplicate upload: {filename} = {existing['filename']} ({current})",
+        extra={'upload_id': existing["upload_id"]}
+    )
+
+    return JSONResponse(content={
+        "upload_id": existing["upload_id"],
+        "filename": existing["filename"],
+        "status": current,
+        "duplicate": True,
+        "queue_position": status.get("queue_position") if status else None,
+        "message": f"Identical file already uploaded as {existing['filename']} ({current}) - not processed again"
+    })
 
 
 def _sanitize_for_json(obj):
@@ -275,8 +665,28 @@ def _sanitize_for_json(obj):
             return f"<{obj.__class__.__name__}>"
 
 
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    304 response if the client's If-None-Match already names this version
+
+    Responses carry Cache-Control: no-cache, so browsers revalidate every
+    poll and fetch() transparently gets the cached body on 304.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
+
 @router.get("/upload/{upload_id}/status", response_model=None)
-async def get_upload_status(upload_id: str):
+async def get_upload_status(upload_id: str, request: Request):
     """
     Get processing status for uploaded document (Enhanced with real-time progress)
 
@@ -296,6 +706,10 @@ async def get_upload_status(upload_id: str):
         - metrics: Stage-specific metrics including entities/relations (Bug #10 Fix)
         - durations: Time spent in each stage
         - started_at, completed_at/failed_at: Timestamps
+
+    Note:
+        ETag = status version (increases on every change); If-None-Match
+        with the current version returns 304 without body.
     """
 
     status = get_processing_status(upload_id)
@@ -306,16 +720,24 @@ async def get_upload_status(upload_id: str):
             detail=f"Upload ID not found: {upload_id}"
         )
 
+    etag = _etag(status.version)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
     # Sanitize status dict to ensure JSON serializability
     sanitized_status = _sanitize_for_json(status)
 
     # Pre-serialize to JSON to ensure no errors
     import json as json_module
-    from starlette.responses import Response
 
     try:
         json_str = json_module.dumps(sanitized_status, indent=2)
-        return Response(content=json_str, media_type="application/json")
+        return Response(
+            content=json_str,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
     except Exception as e:
         logger.error(f"[{upload_id}] ❌ Status serialization failed: {e}")
         return JSONResponse(content={
@@ -325,6 +747,97 @@ async def get_upload_status(upload_id: str):
         }, status_code=500)
 
 
+SSE_RETRY_MS = 3000  # EventSource reconnect delay after a dropped stream
+
+
+def _format_sse(event_id: int, event: str, data: Dict[str, Any]) -> str:
+    """One SSE message (id, event type, JSON data)"""
+    import json as json_module
+
+    return f"id: {event_id}\nevent: {event}\ndata: {json_module.dumps(data)}\n\n"
+
+
+@router.get("/upload/{upload_id}/events")
+async def stream_upload_events(
+    upload_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream processing status changes (Server-Sent Events)
+
+    Push alternative to polling GET /upload/{upload_id}/status for the
+    whole ingestion: one connection, only changed fields are sent.
+
+    Args:
+        upload_id: Upload identifier
+        last_event_id: Last-Event-ID header (sent by EventSource on reconnect)
+
+    Events:
+        - snapshot: all streamed fields (first event, or resume too old)
+        - progress: changed fields only (null = field removed)
+        - end: document completed or failed, stream closes
+        - ": heartbeat" comments every SSE_HEARTBEAT_SEC while idle
+
+    Note:
+        Streamed fields: status, stage, sub_stage, progress, progress_detail,
+        ingestion_progress, metrics, durations, error, completed_at, failed_at
+        (metadata and the rest stay on GET /status).
+    """
+    status = get_processing_status(upload_id)
+    if not status:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Upload ID not found: {upload_id}"
+        )
+
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+
+    broker = get_status_event_broker()
+    queue, initial = broker.subscribe(upload_id, resume_from)
+
+    async def event_generator():
+        """Generate SSE events until the document finishes or the client leaves"""
+        # Resumed after the final event: nothing more will come
+        finished = not initial and status.get("status") in TERMINAL_STATUSES
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+
+            pending = list(initial)
+            while not finished:
+                if not pending:
+                    try:
+                        pending.append(await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SEC))
+                    except asyncio.TimeoutError:
+                        if await request.is_disconnected() or not broker.refresh(upload_id):
+                            break
+                        if queue.empty():
+                            yield ": heartbeat\n\n"
+                        continue
+
+                event_id, event, data = pending.pop(0)
+                yield _format_sse(event_id, event, data)
+                finished = data.get("status") in TERMINAL_STATUSES
+
+            if finished:
+                yield "event: end\ndata: {}\n\n"
+        finally:
+            broker.unsubscribe(upload_id, queue)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Disable nginx buffering
+        }
+    )
+
+
 @router.get("/upload/{upload_id}/logs")
 async def get_upload_logs(
     upload_id: str,
@@ -411,12 +924,79 @@ async def get_upload_logs(
     })
 
 
+# Background retry-failed runs: strong references (the event loop keeps only
+# weak ones), one run per upload
+_retry_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _on_retry_done(upload_id: str, task: asyncio.Task) -> None:
+    _retry_tasks.pop(upload_id, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            f"[{upload_id}] ❌ Retry of failed chunks crashed: {task.exception()}",
+            exc_info=task.exception()
+        )
+
+
+@router.post("/upload/{upload_id}/retry-failed")
+async def retry_failed_upload_chunks(upload_id: str):
+    """
+    Re-ingest only the chunks of an upload that failed after every retry.
+
+    Args:
+        upload_id: Upload identifier
+
+    Returns:
+        Number of chunks scheduled for retry (runs in background,
+        progress in /upload/{upload_id}/status)
+
+    Raises:
+        404: No failed chunks for this upload
+        409: Upload is still queued or processing, or a retry is running
+    """
+    if upload_id in _retry_tasks:
+        raise HTTPException(
+            status_code=409,
+            detail=f"A retry is already running for upload {upload_id}"
+        )
+
+    status = get_processing_status(upload_id)
+    if status and status.get("status") in ("queued", "processing"):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload {upload_id} is still {status['status']}"
+        )
+
+    failed_chunks = await asyncio.to_thread(get_checkpoint_store().get_dead_letters, upload_id)
+    if not failed_chunks:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No failed chunks for upload: {upload_id}"
+        )
+
+    task = asyncio.create_task(retry_failed_chunks(upload_id))
+    _retry_tasks[upload_id] = task
+    task.add_done_callback(lambda done: _on_retry_done(upload_id, done))
+    logger.info(f"[{upload_id}] 🔁 Retry scheduled for {len(failed_chunks)} failed chunks")
+
+    return JSONResponse(content={
+        "upload_id": upload_id,
+        "status": "retrying",
+        "chunks_to_retry": len(failed_chunks),
+        "chunk_indexes": [letter["chunk_index"] for letter in failed_chunks],
+        "last_errors": {
+            str(letter["chunk_index"]): f"{letter['error_type']}: {letter['error']}"
+            for letter in failed_chunks
+        },
+    }, status_code=202)
+
+
 # ════════════════════════════════════════════════════════
 # Document Queue Management Endpoints (ARIA v2.0.0)
 # ════════════════════════════════════════════════════════
 
 @router.get("/queue/status")
-async def get_queue_status():
+async def get_queue_status(request: Request):
     """
     Get document processing queue status.
 
@@ -457,11 +1037,21 @@ async def get_queue_status():
                 "success_rate": 83.3
             }
         }
+
+    Note:
+        ETag = queue snapshot version; If-None-Match with the current
+        version returns 304 without body.
     """
     queue = get_document_queue()
+
+    etag = _etag(queue.version)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
     status = queue.get_status()
 
-    return JSONResponse(content=status)
+    return JSONResponse(content=status, headers={"ETag": etag, "Cache-Control": "no-cache"})
 
 
 @router.post("/queue/clear-history")
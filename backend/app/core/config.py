@@ -51,17 +51,75 @@ class Settings(BaseSettings):
     GRAPHITI_ENABLED: bool = True
     GRAPHITI_LLM_MODEL: str = "gemini-2.5-flash-lite"  # Google Gemini 2.5 Flash-Lite (~$1-2/year!)
     GRAPHITI_LLM_TEMPERATURE: float = 0.0  # Deterministic for entity extraction
-    GRAPHITI_ESTIMATED_TOKENS_PER_CHUNK: int = 3_000  # Conservative estimate
+    GRAPHITI_ESTIMATED_TOKENS_PER_CHUNK: int = 3_000  # Fallback when a chunk has no num_tokens
     GRAPHITI_SEMAPHORE_LIMIT: int = 10  # Concurrent LLM calls (4K RPM = safe)
+    GRAPHITI_INGEST_CONCURRENCY: int = 1  # Chunks in flight per document (1 = sequential)
+    GRAPHITI_BULK_INGESTION: bool = False  # Opt-in add_episode_bulk (first-time loads)
+    GRAPHITI_BULK_BATCH_SIZE: int = 20  # Chunks per add_episode_bulk call
+    STREAMED_PIPELINE_ENABLED: bool = True  # Ingest chunks while HybridChunker is still producing them
+    GRAPHITI_CHUNK_MAX_ATTEMPTS: int = 4  # Per chunk, transient errors only (429, timeouts, 5xx)
+    GRAPHITI_RETRY_BASE_DELAY_SEC: float = 2.0  # Full-jitter exponential backoff scale
+    GRAPHITI_RETRY_MAX_DELAY_SEC: float = 60.0
+    
+    # Provider Rate Limits (shared token buckets, adaptive concurrency)
+    GEMINI_RPM_LIMIT: int = 4_000  # Gemini 2.5 Flash-Lite Tier 1
+    GEMINI_TPM_LIMIT: int = 4_000_000
+    OPENAI_EMBEDDING_RPM_LIMIT: int = 3_000  # text-embedding-3-small Tier 1
+    OPENAI_EMBEDDING_TPM_LIMIT: int = 1_000_000
+    RATE_LIMIT_HEADROOM: float = 0.9  # Use 90% of each ceiling
+    QUEUE_INTER_DOCUMENT_DELAY_SEC: int = 0  # Optional pause between documents (limiters pace calls)
+    QUEUE_CONVERSION_WORKERS: int = 1  # Docling conversions in parallel (CPU-bound)
+    QUEUE_OFFICE_CONVERSION_WORKERS: int = 1  # DOCX/PPTX conversions (own lane: never wait behind PDFs)
+    QUEUE_CHUNKING_WORKERS: int = 1  # HybridChunker runs in parallel (CPU-bound)
+    QUEUE_INGESTION_WORKERS: int = 1  # Documents ingesting in parallel (network-bound)
+    QUEUE_SCHEDULING: str = "fifo"  # "fifo" | "shortest_first" (pre-flight estimate, aged by wait time)
+    QUEUE_HISTORY_MAX: int = 500  # Completed/failed documents kept in queue history (counters are totals)
+    QUEUE_STAGE_BUFFER: int = 1  # Documents waiting between stages (bounds DoclingDocuments in memory)
+    GRAPHITI_SKIP_INGESTED_CHUNKS: bool = True  # Skip chunks whose content_hash is already in the graph
+    GRAPH_STATS_TTL_SEC: int = 60  # /graph/stats and /neo4j/stats cache (ingestion keeps counts current in between)
     
     # Docling HybridChunker Configuration (Gap #3 - Contextual Retrieval)
     DOCLING_MAX_TOKENS: int = 2000  # Optimal for educational manuals (10-100 pages)
     DOCLING_MERGE_PEERS: bool = True  # Merge small adjacent chunks (avoid micro-chunks)
     DOCLING_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"  # Match embedding model
     
+    # Persistent API Caches (SQLite on the uploads volume)
+    CACHE_DIR: str = "/uploads/.cache"
+    EMBEDDING_CACHE_ENABLED: bool = True  # Content-addressed OpenAI embedding cache
+    EMBEDDING_CACHE_MAX_MB: int = 512  # LRU eviction above this size
+    LLM_CACHE_ENABLED: bool = True  # Prompt-hash Gemini response cache (temperature 0.0)
+    LLM_CACHE_EXTRACTION: bool = True  # Cache entity/edge extraction prompts
+    LLM_CACHE_DEDUPE: bool = True  # Cache node/edge dedupe prompts
+    LLM_CACHE_OTHER: bool = False  # Cache remaining prompts (summaries, invalidation)
+    LLM_CACHE_TTL_HOURS: int = 720  # 30 days
+    LLM_CACHE_MAX_MB: int = 256  # LRU eviction above this size
+    CONVERSION_CACHE_ENABLED: bool = True  # Converted DoclingDocuments keyed by file hash + options + version
+    CONVERSION_CACHE_MAX_MB: int = 2048  # LRU eviction above this size
+    
+    # Durable Pipeline State (SQLite on the uploads volume)
+    STATE_DIR: str = "/uploads/.state"
+    INGESTION_CHECKPOINTS_ENABLED: bool = True  # Resume interrupted ingestions after restart
+    
+    # Processing Status (bounded; see app/core/status_store.py)
+    STATUS_BACKEND: str = "memory"  # "memory" | "sqlite" (survives restarts, shared by API workers)
+    STATUS_MAX_ENTRIES: int = 1000  # Finished entries evicted (least recently updated) above this
+    STATUS_TTL_HOURS: int = 24  # Completed/failed entries expire after this
+    STATUS_STALE_HOURS: int = 72  # Entries never updated for this long (crash orphans) expire
+    STATUS_SWEEP_INTERVAL_SEC: int = 300  # Background TTL sweep period
+    STATUS_WRITE_DELAY_SEC: float = 0.25  # SQLite write-behind: changes within this window share one transaction
+    SSE_HEARTBEAT_SEC: int = 15  # Keep-alive comment on idle /events streams (proxies close silent ones)
+    SSE_HISTORY_EVENTS: int = 100  # Deltas kept per upload for Last-Event-ID resume
+    
     # File Storage
     UPLOAD_DIR: str = "/uploads"
     MAX_UPLOAD_SIZE_MB: int = 50
+    UPLOAD_BLOCK_SIZE_KB: int = 1024  # Streamed upload write size (memory per upload)
+    UPLOAD_DEDUPLICATION_ENABLED: bool = True  # Same SHA-256 → existing upload_id, not processed again
+    UPLOAD_DELETE_AFTER_SUCCESS: bool = False  # Opt-in: remove the source file once the document is ingested
+    UPLOAD_RETENTION_DAYS: int = 30  # Remove any remaining source file after N days (0 = keep forever)
+    UPLOAD_SESSION_TTL_HOURS: int = 24  # Resumable upload sessions idle longer than this are dropped
+    UPLOAD_SESSION_CHUNK_MB: int = 5  # Suggested PUT size for resumable uploads
+    PREFLIGHT_ENABLED: bool = True  # Analyze uploads (pages, text layer, encryption) and estimate cost
     ALLOWED_EXTENSIONS: str = "pdf,ppt,pptx,doc,docx"
     
     # Monitoring (Sentry)
@@ -71,7 +129,17 @@ class Settings(BaseSettings):
     
     # Processing
     DOCLING_TIMEOUT: int = 900  # 15 minutes (allows for model download on first run)
-    PROCESSING_WORKERS: int = 2
+    PROCESSING_WORKERS: int = 2  # Docling threads (DOCLING_EXECUTOR="thread")
+    DOCLING_EXECUTOR: str = "thread"  # "thread" (shared converter) | "process" (one converter per worker)
+    DOCLING_OFFICE_WORKERS: int = 2  # DOCX/PPTX conversion threads (separate from the PDF executor)
+    DOCLING_PROCESS_WORKERS: int = 4  # Conversion processes (DOCLING_EXECUTOR="process")
+    DOCLING_PROCESS_MAX_TASKS_PER_WORKER: int = 20  # Recycle a worker after N documents (bounds memory growth)
+    DOCLING_SHARD_PAGES: int = 20  # Pages per conversion shard (0 = never shard)
+    DOCLING_SHARD_MIN_PAGES: int = 40  # Only PDFs longer than this are sharded
+    DOCLING_OCR_MODE: str = "auto"  # "auto" (OCR pages without a text layer) | "always" | "never"
+    DOCLING_OCR_MIN_TEXT_CHARS: int = 32  # Fewer extractable characters → page is treated as a scan
+    DOCLING_OCR_IMAGE_COVERAGE: float = 0.5  # Images covering more of the page → OCR (text in pictures)
+    DOCLING_CONVERSION_PROFILE: str = "accurate"  # Default when the upload sets none: fast | balanced | accurate | auto
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,262 @@
+"""
+Persistent Content-Addressed Disk Cache (SQLite)
+
+Small key/value store shared by the API-cost caches (embeddings, LLM responses):
+- SQLite file on the uploads volume (survives container restarts)
+- Size-bounded LRU eviction (last_access ordering)
+- Optional TTL (entries older than ttl_seconds are treated as misses)
+- Hit/miss/eviction counters for monitoring
+
+The API is synchronous (sqlite3). Async callers should wrap calls in
+asyncio.to_thread() to keep the event loop free, like the Neo4j client does.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional
+
+logger = logging.getLogger('diveteacher.cache')
+
+
+def content_key(*parts: str) -> str:
+    """
+    Build a content-addressed cache key (SHA-256 over all parts)
+
+    Example:
+        content_key("text-embedding-3-small", "1536", text)
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")  # Separator: ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    SQLite-backed LRU cache with optional TTL
+
+    Features:
+    - get/set and batched get_many/set_many (one transaction per batch)
+    - LRU eviction down to 90% of max_bytes when the limit is exceeded
+    - Thread-safe (one connection guarded by a lock, WAL journal)
+
+    Usage:
+        cache = DiskCache("/uploads/.cache/embeddings.sqlite", max_bytes=512 * 1024 * 1024)
+        cache.set(key, b"...")
+        value = cache.get(key)  # None on miss
+    """
+
+    EVICTION_TARGET_RATIO = 0.9  # Evict down to 90% of max_bytes (avoid evicting on every set)
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        ttl_seconds: Optional[int] = None,
+        name: str = "cache"
+    ):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: SQLite file path (parent directory is created if needed)
+            max_bytes: Maximum total size of stored values
+            ttl_seconds: Optional time-to-live (None = no expiry)
+            name: Name used in logs and stats
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        logger.info(
+            f"🗄️  DiskCache '{name}' opened: {path} "
+            f"({self._total_bytes / (1024 * 1024):.1f}/{max_bytes / (1024 * 1024):.0f} MB)"
+        )
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a value (None on miss or expiry)"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Get several values in one transaction.
+
+        Returns:
+            Dict of key → value for hits only (misses are absent)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        expired = []
+
+        with self._lock:
+            for start in range(0, len(keys), 500):  # SQLite variable limit
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at FROM entries WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self._is_expired(created_at, now):
+                        expired.append(key)
+                    else:
+                        found[key] = value
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE entries SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+            if expired:
+                self._delete_locked(expired)
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a value (replaces any existing entry)"""
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, bytes]) -> None:
+        """Store several values in one transaction, then evict if over max_bytes"""
+        if not items:
+            return
+
+        now = time.time()
+
+        with self._lock:
+            replaced = self._sum_sizes_locked(list(items))
+
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, value, len(value), now, now) for key, value in items.items()]
+            )
+            self._conn.execute("COMMIT")
+
+            self._total_bytes += sum(len(value) for value in items.values()) - replaced
+
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+
+    def _sum_sizes_locked(self, keys: list) -> int:
+        total = 0
+        for start in range(0, len(keys), 500):  # SQLite variable limit
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            total += self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM entries WHERE key IN ({placeholders})",
+                batch
+            ).fetchone()[0]
+        return total
+
+    def _delete_locked(self, keys: list) -> None:
+        self._total_bytes -= self._sum_sizes_locked(keys)
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            self._conn.execute(f"DELETE FROM entries WHERE key IN ({placeholders})", batch)
+
+    def _evict_locked(self) -> None:
+        """Evict expired entries, then least-recently-used ones down to the target size"""
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+
+        # Re-sync with disk (another worker process may share the file)
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        target = int(self.max_bytes * self.EVICTION_TARGET_RATIO)
+
+        evicted = 0
+        while self._total_bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access ASC LIMIT 256"
+            ).fetchall()
+            if not rows:
+                break
+
+            to_delete = []
+            for key, size in rows:
+                if self._total_bytes <= target:
+                    break
+                to_delete.append(key)
+                self._total_bytes -= size
+
+            placeholders = ",".join("?" * len(to_delete))
+            self._conn.execute(f"DELETE FROM entries WHERE key IN ({placeholders})", to_delete)
+            evicted += len(to_delete)
+
+        if evicted:
+            self.evictions += evicted
+            logger.info(f"🧹 DiskCache '{self.name}': evicted {evicted} LRU entries")
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics (for health/monitoring endpoints)"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": entries,
+            "size_mb": round(self._total_bytes / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the SQLite connection"""
+        with self._lock:
+            self._conn.close()
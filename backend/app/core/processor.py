@@ -11,7 +11,7 @@ import os
 import asyncio
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Set
 from datetime import datetime
 from time import time
 
@@ -26,89 +26,34 @@ from app.integrations.dockling import (
 )
 from app.services.document_chunker import get_chunker  # ARIA production-validated pattern (RecursiveCharacterTextSplitter)
 from app.integrations.graphiti import ingest_chunks_to_graph
-from app.integrations.neo4j import neo4j_client
+from app.core.config import settings
+from app.services.ingestion_checkpoint import get_checkpoint_store
+from app.services.document_analyzer import record_ingestion_throughput
+from app.core.status_store import get_status_store
 import sentry_sdk
 
 logger = logging.getLogger('diveteacher.processor')
 
-# In-memory status tracking (in production, use Redis or database)
-processing_status: Dict[str, Dict[str, Any]] = {}
+# Status tracking: bounded store (TTL + max entries), optionally SQLite-backed
+processing_status = get_status_store()
 
 
-async def get_entity_count() -> int:
-    """
-    Query Neo4j for Entity node count
-
-    Returns:
-        Total number of Entity nodes in Neo4j
-
-    Note:
-        - Uses asyncio.to_thread for synchronous Neo4j driver
-        - Returns 0 if query fails (graceful degradation)
-    """
-    try:
-        # Run in thread pool (Neo4j driver is synchronous)
-        def _query():
-            with neo4j_client.driver.session() as session:
-                result = session.run("MATCH (n:Entity) RETURN count(n) as count")
-                record = result.single()
-                return record["count"] if record else 0
-
-        count = await asyncio.to_thread(_query)
-        return count
-    except Exception as e:
-        logger.warning(f"⚠️  Failed to get entity count: {e}")
-        return 0
-
-
-async def get_relation_count() -> int:
-    """
-    Query Neo4j for RELATES_TO relationship count
-
-    Returns:
-        Total number of RELATES_TO relationships in Neo4j
-
-    Note:
-        - Uses asyncio.to_thread for synchronous Neo4j driver
-        - Returns 0 if query fails (graceful degradation)
-    """
-    try:
-        def _query():
-            with neo4j_client.driver.session() as session:
-                result = session.run(
-                    "MATCH ()-[r:RELATES_TO]->() RETURN count(r) as count"
-                )
-                record = result.single()
-                return record["count"] if record else 0
-
-        count = await asyncio.to_thread(_query)
-        return count
-    except Exception as e:
-        logger.warning(f"⚠️  Failed to get relation count: {e}")
-        return 0
-
-
-async def process_document(
+def start_document_job(
     file_path: str,
     upload_id: str,
     metadata: Optional[Dict[str, Any]] = None
-) -> None:
+) -> Dict[str, Any]:
     """
-    Process uploaded document through the complete pipeline
-
-    Steps:
-    1. Validate (dans convert_document_to_docling)
-    2. Convert to DoclingDocument (Docling)
-    3. Chunk semantically (HybridChunker)
-    4. Ingest to knowledge graph (Graphiti + Neo4j)
-    5. Update status & cleanup
+    Initialize the status dict and the job state shared by the pipeline stages
 
     Args:
         file_path: Path to uploaded file
         upload_id: Unique upload identifier
         metadata: Optional document metadata
-    """
 
+    Returns:
+        Job dict passed to convert_stage → chunk_stage → ingest_stage
+    """
     # Initialize status dict FIRST (before any exception)
     file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
     file_size_mb = file_size / (1024 * 1024)
@@ -127,7 +72,8 @@ async def process_document(
         "started_at": datetime.now().isoformat(),
         "metrics": {
             "file_size_mb": round(file_size_mb, 2),
-            "filename": Path(file_path).name
+            "filename": Path(file_path).name,
+            "estimate": ((metadata or {}).get("preflight") or {}).get("estimate")
         }
     }
 
@@ -143,231 +89,387 @@ async def process_document(
         }
     )
 
-    start_time = time()
-
-    try:
-        # STEP 1: Convert to DoclingDocument
-        processing_status[upload_id].update({
-            "stage": "conversion",
-            "sub_stage": "docling_start",
-            "progress": 10,
-            "progress_detail": {
-                "current": 1,
-                "total": 4,
-                "unit": "stages"
-            }
-        })
+    return {
+        "file_path": file_path,
+        "upload_id": upload_id,
+        "metadata": metadata,
+        "file_size_mb": file_size_mb,
+        "start_time": time(),
+        "checkpoint": None,
+        "done_positions": set(),  # Chunk positions ingested before an interruption
+        "streamed": False,
+        "streamed_chunks": [],  # Filled by the chunk stream as it is consumed
+        "stream_state": {},
+        "estimated_chunks": None,
+        "docling_doc": None,
+        "doc_metadata": {},
+        "num_pages": 0,
+        "chunks": None,
+        "chunk_source": None,
+        "conversion_duration": 0.0,
+        "chunking_duration": 0.0,
+    }
 
-        log_stage_start(logger, upload_id, "conversion")
-        conversion_start = time()
 
-        docling_doc = await convert_document_to_docling(file_path, upload_id=upload_id)
-        doc_metadata = extract_document_metadata(docling_doc)
+async def convert_stage(job: Dict[str, Any]) -> None:
+    """
+    STEP 1: Convert to DoclingDocument (skipped when resuming from a checkpoint)
 
-        conversion_duration = time() - conversion_start
+    Args:
+        job: Job dict from start_document_job()
+    """
+    file_path = job["file_path"]
+    upload_id = job["upload_id"]
+
+    # Resume: reuse chunking output saved before an interruption
+    if settings.INGESTION_CHECKPOINTS_ENABLED:
+        job["checkpoint"] = await asyncio.to_thread(get_checkpoint_store().load_chunks, upload_id)
+
+    checkpoint = job["checkpoint"]
+    if checkpoint is not None:
+        chunks = checkpoint["chunks"]
+        job["chunks"] = chunks
+        job["chunk_source"] = chunks
+        job["doc_metadata"] = checkpoint["doc_metadata"]
+        job["done_positions"] = checkpoint["done_positions"]
+        job["num_pages"] = job["doc_metadata"].get("num_pages", 0)
 
-        log_stage_complete(
-            logger,
-            upload_id=upload_id,
-            stage="conversion",
-            duration=conversion_duration,
-            metrics={
-                "pages": len(docling_doc.pages) if hasattr(docling_doc, 'pages') else 0,
-                "file_size_mb": round(file_size_mb, 2)
-            }
+        logger.info(
+            f"♻️  Resuming from checkpoint: {len(checkpoint['done_positions'])}/{len(chunks)} chunks "
+            f"already ingested (conversion + chunking skipped)",
+            extra={'upload_id': upload_id, 'stage': 'resume'}
         )
-
         processing_status[upload_id].update({
-            "progress": 40,
-            "sub_stage": "conversion_complete",
+            "sub_stage": "resumed_from_checkpoint",
             "metrics": {
                 **processing_status[upload_id].get("metrics", {}),
-                "pages": len(docling_doc.pages) if hasattr(docling_doc, 'pages') else 0,
-                "conversion_duration": round(conversion_duration, 2)
+                "pages": job["num_pages"],
+                "num_chunks": len(chunks),
+                "resumed": True,
             }
         })
+        return
 
-        # STEP 2: Semantic Chunking
-        processing_status[upload_id].update({
-            "stage": "chunking",
-            "sub_stage": "tokenizing",
-            "progress": 50,
-            "progress_detail": {
-                "current": 2,
-                "total": 4,
-                "unit": "stages"
-            }
-        })
+    processing_status[upload_id].update({
+        "stage": "conversion",
+        "sub_stage": "docling_start",
+        "progress": 10,
+        "progress_detail": {
+            "current": 1,
+            "total": 4,
+            "unit": "stages"
+        }
+    })
 
-        log_stage_start(logger, upload_id, "chunking")
-        chunking_start = time()
+    log_stage_start(logger, upload_id, "conversion")
+    conversion_start = time()
 
-        chunker = get_chunker()
-        chunks = chunker.chunk_document(
-            docling_doc=docling_doc,
-            filename=Path(file_path).name,
-            upload_id=upload_id
-        )
+    conversion_metrics: Dict[str, Any] = {}
+    docling_doc = await convert_document_to_docling(
+        file_path,
+        upload_id=upload_id,
+        conversion_metrics=conversion_metrics,
+        profile=(job["metadata"] or {}).get("conversion_profile"),
+        preflight=(job["metadata"] or {}).get("preflight")
+    )
+    job["docling_doc"] = docling_doc
+    job["doc_metadata"] = extract_document_metadata(docling_doc)
+    num_pages = len(docling_doc.pages) if hasattr(docling_doc, 'pages') else 0
+    job["num_pages"] = num_pages
 
-        chunking_duration = time() - chunking_start
-        # Chunks are dicts with "text" key, not objects with .content attribute
-        avg_chunk_size = sum(len(c["text"]) for c in chunks) / len(chunks) if chunks else 0
-        total_tokens = sum(c.get("metadata", {}).get("num_tokens", 0) for c in chunks)
+    conversion_duration = time() - conversion_start
+    job["conversion_duration"] = conversion_duration
 
-        log_stage_complete(
-            logger,
-            upload_id=upload_id,
-            stage="chunking",
-            duration=chunking_duration,
-            metrics={
-                "num_chunks": len(chunks),
-                "avg_chunk_size": round(avg_chunk_size, 0),
-                "total_tokens": total_tokens
-            }
-        )
+    log_stage_complete(
+        logger,
+        upload_id=upload_id,
+        stage="conversion",
+        duration=conversion_duration,
+        metrics={
+            "pages": num_pages,
+            "file_size_mb": round(job["file_size_mb"], 2),
+            "shards": conversion_metrics.get("shards"),
+            "profile": conversion_metrics.get("profile")
+        }
+    )
 
-        processing_status[upload_id].update({
-            "progress": 70,
-            "sub_stage": "chunking_complete",
-            "metrics": {
-                **processing_status[upload_id].get("metrics", {}),
-                "num_chunks": len(chunks),
-                "avg_chunk_size": round(avg_chunk_size, 0),
-                "chunking_duration": round(chunking_duration, 2)
-            }
-        })
+    processing_status[upload_id].update({
+        "progress": 40,
+        "sub_stage": "conversion_complete",
+        "metrics": {
+            **processing_status[upload_id].get("metrics", {}),
+            "pages": num_pages,
+            "conversion_duration": round(conversion_duration, 2),
+            "conversion_profile": conversion_metrics.get("profile"),
+            "conversion_shards": conversion_metrics.get("shards"),
+            "conversion_cache_hit": conversion_metrics.get("cache_hit", False),
+            "ocr": conversion_metrics.get("ocr")
+        }
+    })
 
-        # STEP 3: Ingest to Knowledge Graph
-        processing_status[upload_id].update({
-            "stage": "ingestion",
-            "sub_stage": "graphiti_start",
-            "progress": 75,
-            "progress_detail": {
-                "current": 3,
-                "total": 4,
-                "unit": "stages"
-            },
-            "ingestion_progress": {
-                "chunks_completed": 0,
-                "chunks_total": len(chunks),
-                "progress_pct": 0,
-                "current_chunk_index": 0,
-            }
-        })
 
-        log_stage_start(
-            logger,
-            upload_id,
-            "ingestion",
-            details={"num_chunks": len(chunks)}
+async def chunk_stage(job: Dict[str, Any]) -> None:
+    """
+    STEP 2: Semantic chunking (HybridChunker)
+
+    Args:
+        job: Job dict after convert_stage()
+
+    Note:
+        - Skipped when resuming from a checkpoint
+        - Streamed pipeline: only prepares the chunk stream; chunking then
+          runs alongside ingestion (ingest_stage)
+    """
+    if job["checkpoint"] is not None:
+        return
+
+    file_path = job["file_path"]
+    upload_id = job["upload_id"]
+    docling_doc = job["docling_doc"]
+
+    processing_status[upload_id].update({
+        "stage": "chunking",
+        "sub_stage": "tokenizing",
+        "progress": 50,
+        "progress_detail": {
+            "current": 2,
+            "total": 4,
+            "unit": "stages"
+        }
+    })
+
+    # Streamed pipeline: ingestion starts while chunking is still running
+    if settings.STREAMED_PIPELINE_ENABLED and settings.GRAPHITI_ENABLED:
+        job["streamed"] = True
+        job["estimated_chunks"] = get_chunker().estimate_total_chunks(docling_doc)
+        job["chunk_source"] = _stream_chunks(
+            docling_doc, Path(file_path).name, upload_id, job["doc_metadata"],
+            collected=job["streamed_chunks"], state=job["stream_state"],
+            done_positions=job["done_positions"]
         )
-        ingestion_start = time()
+        return
 
-        # Enriched metadata
-        enriched_metadata = {
-            "filename": Path(file_path).name,
-            "upload_id": upload_id,
-            "processed_at": datetime.now().isoformat(),
+    log_stage_start(logger, upload_id, "chunking")
+    chunking_start = time()
+
+    chunker = get_chunker()
+    chunks = await asyncio.to_thread(
+        chunker.chunk_document,
+        docling_doc=docling_doc,
+        filename=Path(file_path).name,
+        upload_id=upload_id
+    )
+
+    chunking_duration = time() - chunking_start
+    # Chunks are dicts with "text" key, not objects with .content attribute
+    avg_chunk_size = sum(len(c["text"]) for c in chunks) / len(chunks) if chunks else 0
+    total_tokens = sum(c.get("metadata", {}).get("num_tokens", 0) for c in chunks)
+
+    log_stage_complete(
+        logger,
+        upload_id=upload_id,
+        stage="chunking",
+        duration=chunking_duration,
+        metrics={
             "num_chunks": len(chunks),
-            **doc_metadata,
-            **(metadata or {})
+            "avg_chunk_size": round(avg_chunk_size, 0),
+            "total_tokens": total_tokens
         }
+    )
 
-        # 🔧 Pass processing_status for real-time updates
-        await ingest_chunks_to_graph(
-            chunks=chunks,
-            metadata=enriched_metadata,
-            upload_id=upload_id,
-            processing_status=processing_status  # ← ADD THIS
+    processing_status[upload_id].update({
+        "progress": 70,
+        "sub_stage": "chunking_complete",
+        "metrics": {
+            **processing_status[upload_id].get("metrics", {}),
+            "num_chunks": len(chunks),
+            "avg_chunk_size": round(avg_chunk_size, 0),
+            "chunking_duration": round(chunking_duration, 2)
+        }
+    })
+
+    if settings.INGESTION_CHECKPOINTS_ENABLED:
+        job["done_positions"].update(
+            await asyncio.to_thread(get_checkpoint_store().save_chunks, upload_id, chunks, job["doc_metadata"])
         )
 
-        ingestion_duration = time() - ingestion_start
+    job["chunks"] = chunks
+    job["chunk_source"] = chunks
+    job["chunking_duration"] = chunking_duration
+    job["docling_doc"] = None  # Release the converted document early
 
-        log_stage_complete(
-            logger,
-            upload_id=upload_id,
-            stage="ingestion",
-            duration=ingestion_duration,
-            metrics={
-                "chunks_processed": len(chunks)
-            }
-        )
 
-        # 🔧 QUERY NEO4J FOR ENTITY/RELATION COUNTS (Bug #10 Fix)
-        logger.info("📊 Querying Neo4j for entity/relation counts...", extra={'upload_id': upload_id})
-        entity_count = await get_entity_count()
-        relation_count = await get_relation_count()
-        logger.info(
-            f"✅ Neo4j counts: {entity_count} entities, {relation_count} relations",
-            extra={
-                'upload_id': upload_id,
-                'entities': entity_count,
-                'relations': relation_count
-            }
-        )
+async def ingest_stage(job: Dict[str, Any]) -> None:
+    """
+    STEP 3-4: Ingest to knowledge graph (Graphiti + Neo4j), then finalize
 
-        processing_status[upload_id].update({
-            "progress": 95,
-            "sub_stage": "ingestion_complete",
-            "metrics": {
-                **processing_status[upload_id].get("metrics", {}),
-                "ingestion_duration": round(ingestion_duration, 2),
-                "entities": entity_count,      # ← ADD
-                "relations": relation_count,    # ← ADD
-            }
-        })
+    Args:
+        job: Job dict after chunk_stage()
+    """
+    file_path = job["file_path"]
+    upload_id = job["upload_id"]
+    chunks = job["chunks"]
+    estimated_chunks = job["estimated_chunks"]
+    doc_metadata = job["doc_metadata"]
+
+    processing_status[upload_id].update({
+        "stage": "ingestion",
+        "sub_stage": "graphiti_start",
+        "progress": 75,
+        "progress_detail": {
+            "current": 3,
+            "total": 4,
+            "unit": "stages"
+        },
+        "ingestion_progress": {
+            "chunks_completed": 0,
+            "chunks_total": len(chunks) if chunks is not None else estimated_chunks,
+            "total_estimated": chunks is None,
+            "progress_pct": 0,
+            "current_chunk_index": 0,
+        }
+    })
 
-        # STEP 4: Finalize and complete
-        total_duration = time() - start_time
+    log_stage_start(
+        logger,
+        upload_id,
+        "ingestion",
+        details={
+            "num_chunks": len(chunks) if chunks is not None else None,
+            "estimated_chunks": estimated_chunks,
+            "streamed": job["streamed"]
+        }
+    )
+    ingestion_start = time()
+
+    # Enriched metadata
+    enriched_metadata = {
+        "filename": Path(file_path).name,
+        "upload_id": upload_id,
+        "processed_at": datetime.now().isoformat(),
+        "num_chunks": len(chunks) if chunks is not None else None,
+        **doc_metadata,
+        **(job["metadata"] or {})
+    }
 
-        # Ensure metadata is JSON-serializable
-        safe_metadata = {}
-        for key, value in doc_metadata.items():
-            if isinstance(value, datetime):
-                safe_metadata[key] = value.isoformat()
-            elif callable(value):
-                continue
-            else:
-                safe_metadata[key] = value
+    # 🔧 Pass processing_status for real-time updates
+    ingestion_summary = await ingest_chunks_to_graph(
+        chunks=job["chunk_source"],
+        metadata=enriched_metadata,
+        upload_id=upload_id,
+        processing_status=processing_status,  # ← ADD THIS
+        done_positions=job["done_positions"],
+        estimated_total=estimated_chunks
+    )
 
-        processing_status[upload_id].update({
-            "status": "completed",
-            "stage": "completed",
-            "sub_stage": "finalized",
-            "progress": 100,
-            "progress_detail": {
-                "current": 4,
-                "total": 4,
-                "unit": "stages"
-            },
-            "metadata": safe_metadata,
-            "durations": {
-                "conversion": round(conversion_duration, 2),
-                "chunking": round(chunking_duration, 2),
-                "ingestion": round(ingestion_duration, 2),
-                "total": round(total_duration, 2)
-            },
-            "completed_at": datetime.now().isoformat(),
-        })
+    ingestion_duration = time() - ingestion_start
 
-        logger.info(
-            "✅ Processing complete",
-            extra={
-                'upload_id': upload_id,
-                'stage': 'completed',
-                'duration': round(total_duration, 2),
-                'metrics': {
-                    'total_duration': round(total_duration, 2),
-                    'conversion_duration': round(conversion_duration, 2),
-                    'chunking_duration': round(chunking_duration, 2),
-                    'ingestion_duration': round(ingestion_duration, 2),
-                    'num_chunks': len(chunks),
-                    'pages': len(docling_doc.pages) if hasattr(docling_doc, 'pages') else 0
-                }
+    if job["streamed"]:
+        chunks = job["streamed_chunks"]
+        job["chunks"] = chunks
+        job["chunking_duration"] = job["stream_state"].get("chunking_duration", 0.0)
+        job["docling_doc"] = None
+    conversion_duration = job["conversion_duration"]
+    chunking_duration = job["chunking_duration"]
+
+    log_stage_complete(
+        logger,
+        upload_id=upload_id,
+        stage="ingestion",
+        duration=ingestion_duration,
+        metrics={
+            "chunks_processed": len(chunks),
+            "chunks_skipped": (ingestion_summary or {}).get("skipped", 0)
+        }
+    )
+
+    # Observed ingestion throughput (pre-flight estimates of later uploads)
+    record_ingestion_throughput(
+        len(chunks) - (ingestion_summary or {}).get("skipped", 0), ingestion_duration
+    )
+
+    # Entities/relations of THIS document, captured from the add_episode results
+    graph_delta = (ingestion_summary or {}).get("graph_delta") or {}
+    logger.info(
+        f"✅ Graph delta: {graph_delta.get('entities', 0)} entities, {graph_delta.get('relations', 0)} relations",
+        extra={
+            'upload_id': upload_id,
+            'entities': graph_delta.get('entities', 0),
+            'relations': graph_delta.get('relations', 0)
+        }
+    )
+
+    processing_status[upload_id].update({
+        "progress": 95,
+        "sub_stage": "ingestion_complete",
+        "metrics": {
+            **processing_status[upload_id].get("metrics", {}),
+            "ingestion_duration": round(ingestion_duration, 2),
+            "chunks_skipped": (ingestion_summary or {}).get("skipped", 0),
+            "chunks_failed": (ingestion_summary or {}).get("failed", 0),  # Dead-lettered
+            "llm_cache": (ingestion_summary or {}).get("llm_cache"),
+            "entities": graph_delta.get("entities"),
+            "relations": graph_delta.get("relations"),
+            "entities_created": graph_delta.get("entities_created"),
+            "relations_created": graph_delta.get("relations_created"),
+            "graph_delta_exact": graph_delta.get("exact"),
+        }
+    })
+
+    # STEP 4: Finalize and complete
+    total_duration = time() - job["start_time"]
+
+    # Ensure metadata is JSON-serializable
+    safe_metadata = {}
+    for key, value in doc_metadata.items():
+        if isinstance(value, datetime):
+            safe_metadata[key] = value.isoformat()
+        elif callable(value):
+            continue
+        else:
+            safe_metadata[key] = value
+
+    processing_status[upload_id].update({
+        "status": "completed",
+        "stage": "completed",
+        "sub_stage": "finalized",
+        "progress": 100,
+        "progress_detail": {
+            "current": 4,
+            "total": 4,
+            "unit": "stages"
+        },
+        "metadata": safe_metadata,
+        "durations": {
+            "conversion": round(conversion_duration, 2),
+            "chunking": round(chunking_duration, 2),
+            "ingestion": round(ingestion_duration, 2),
+            "total": round(total_duration, 2)
+        },
+        "completed_at": datetime.now().isoformat(),
+    })
+
+    logger.info(
+        "✅ Processing complete",
+        extra={
+            'upload_id': upload_id,
+            'stage': 'completed',
+            'duration': round(total_duration, 2),
+            'metrics': {
+                'total_duration': round(total_duration, 2),
+                'conversion_duration': round(conversion_duration, 2),
+                'chunking_duration': round(chunking_duration, 2),
+                'ingestion_duration': round(ingestion_duration, 2),
+                'num_chunks': len(chunks),
+                'pages': job["num_pages"]
             }
-        )
+        }
+    )
+
 
-    except ValueError as e:
+def _record_failure(upload_id: str, e: Exception) -> None:
+    """Mark a document failed in processing_status (validation, timeout or other error)"""
+    if isinstance(e, ValueError):
         log_error(logger, upload_id, "validation", e)
         sentry_sdk.capture_exception(e)
         processing_status[upload_id].update({
@@ -377,9 +479,8 @@ async def process_document(
             "error": str(e),
             "failed_at": datetime.now().isoformat(),
         })
-        raise
 
-    except TimeoutError as e:
+    elif isinstance(e, TimeoutError):
         log_error(logger, upload_id, "conversion", e)
         sentry_sdk.capture_exception(e)
         processing_status[upload_id].update({
@@ -389,9 +490,8 @@ async def process_document(
             "error": str(e),
             "failed_at": datetime.now().isoformat(),
         })
-        raise
 
-    except Exception as e:
+    else:
         log_error(logger, upload_id, processing_status[upload_id].get("stage", "unknown"), e)
         sentry_sdk.capture_exception(e)
 
@@ -405,16 +505,255 @@ async def process_document(
                 "failed_at": datetime.now().isoformat(),
             })
 
-    finally:
-        status = processing_status.get(upload_id, {}).get("status", "unknown")
-        logger.info(
-            f"Processing finished: {status}",
-            extra={
-                'upload_id': upload_id,
-                'stage': 'finalized',
-                'final_status': status
-            }
+
+async def _finish_job(job: Dict[str, Any]) -> None:
+    upload_id = job["upload_id"]
+    status = processing_status.get(upload_id, {}).get("status", "unknown")
+    job["docling_doc"] = None
+
+    # Close the checkpoint (interrupted runs stay resumable: status "processing")
+    if settings.INGESTION_CHECKPOINTS_ENABLED and status in ("completed", "failed"):
+        try:
+            await asyncio.to_thread(get_checkpoint_store().finish_document, upload_id, status)
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to close ingestion checkpoint: {e}", extra={'upload_id': upload_id})
+
+    logger.info(
+        f"Processing finished: {status}",
+        extra={
+            'upload_id': upload_id,
+            'stage': 'finalized',
+            'final_status': status
+        }
+    )
+
+
+async def run_pipeline_stage(
+    job: Dict[str, Any],
+    stage: Callable[[Dict[str, Any]], Awaitable[None]]
+) -> bool:
+    """
+    Run one pipeline stage with the pipeline's error handling
+
+    Args:
+        job: Job dict from start_document_job()
+        stage: convert_stage, chunk_stage or ingest_stage
+
+    Returns:
+        True if the document can move to the next stage, False if it failed
+        (status updated, job closed)
+
+    Note:
+        - ingest_stage is the last stage: the job is closed after it
+        - Cancellation (shutdown) closes the job without failing it, so the
+          checkpoint stays resumable
+    """
+    try:
+        await stage(job)
+    except Exception as e:
+        _record_failure(job["upload_id"], e)
+        await _finish_job(job)
+        return False
+    except BaseException:
+        await _finish_job(job)
+        raise
+
+    if stage is ingest_stage:
+        await _finish_job(job)
+    return True
+
+
+async def process_document(
+    file_path: str,
+    upload_id: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Process uploaded document through the complete pipeline
+
+    Steps:
+    1. Validate (dans convert_document_to_docling)
+    2. Convert to DoclingDocument (Docling)
+    3. Chunk semantically (HybridChunker)
+    4. Ingest to knowledge graph (Graphiti + Neo4j)
+    5. Update status & cleanup
+
+    Stages (run back to back here; DocumentQueue runs them on separate
+    workers so document N+1 converts while document N ingests):
+        start_document_job → convert_stage → chunk_stage → ingest_stage
+
+    Streamed pipeline (STREAMED_PIPELINE_ENABLED):
+    - Steps 3-4 overlap: chunks are ingested as HybridChunker produces them
+    - Ingestion progress uses an estimated chunk total until chunking ends
+
+    Checkpoints (INGESTION_CHECKPOINTS_ENABLED):
+    - Chunking output is persisted before ingestion, and each ingested chunk
+      is marked done as ingestion proceeds
+    - After a restart, steps 2-3 are skipped and ingestion resumes from the
+      first incomplete chunk
+
+    Args:
+        file_path: Path to uploaded file
+        upload_id: Unique upload identifier
+        metadata: Optional document metadata
+    """
+    job = start_document_job(file_path, upload_id, metadata)
+
+    for stage in (convert_stage, chunk_stage, ingest_stage):
+        if not await run_pipeline_stage(job, stage):
+            return None
+
+
+async def retry_failed_chunks(upload_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Re-ingest only the dead-lettered chunks of an upload
+
+    Args:
+        upload_id: Upload identifier
+
+    Returns:
+        Ingestion summary, or None if the upload has no failed chunks or
+        the retry itself failed (error reported in processing_status)
+
+    Note:
+        - Chunks come from the dead-letter store (no reconversion/rechunking)
+        - Chunks ingested by the retry leave the dead-letter store; chunks that
+          fail again stay there (failures counter incremented)
+        - processing_status is recreated if the backend restarted meanwhile
+    """
+    dead_letters = await asyncio.to_thread(get_checkpoint_store().get_dead_letters, upload_id)
+    if not dead_letters:
+        return None
+
+    chunks = [letter["chunk"] for letter in dead_letters]
+    metadata = dead_letters[0]["metadata"]
+
+    status = processing_status.setdefault(upload_id, {
+        "status": "completed",
+        "stage": "completed",
+        "progress": 100,
+        "error": None,
+        "started_at": datetime.now().isoformat(),
+        "metrics": {"filename": metadata.get("filename")},
+    })
+    status.update({
+        "status": "processing",
+        "stage": "ingestion",
+        "sub_stage": "retrying_failed_chunks",
+        "retry": {"chunks_total": len(chunks), "started_at": datetime.now().isoformat()},
+    })
+
+    logger.info(
+        f"🔁 Retrying {len(chunks)} failed chunks",
+        extra={'upload_id': upload_id, 'stage': 'ingestion', 'chunks_total': len(chunks)}
+    )
+
+    try:
+        summary = await ingest_chunks_to_graph(
+            chunks=chunks,
+            metadata=metadata,
+            upload_id=upload_id,
+            processing_status=processing_status,
+            bulk=False,  # Per-chunk: add_episode_bulk can't reuse episodes already written
+            check_existing=True  # A timed-out attempt may have been written after all
         )
+    except Exception as e:
+        log_error(logger, upload_id, "ingestion", e)
+        sentry_sdk.capture_exception(e)
+        status.update({
+            "status": "failed",
+            "stage": "failed",
+            "sub_stage": "retry_failed",
+            "error": str(e),
+            "failed_at": datetime.now().isoformat(),
+        })
+        return None
+
+    remaining = await asyncio.to_thread(get_checkpoint_store().count_dead_letters, upload_id)
+    status.update({
+        "status": "completed",
+        "stage": "completed",
+        "sub_stage": "finalized",
+        "progress": 100,
+        "retry": {**status["retry"], "summary": summary, "completed_at": datetime.now().isoformat()},
+        "metrics": {
+            **status.get("metrics", {}),
+            "chunks_failed": remaining,
+        },
+    })
+
+    return summary
+
+
+async def _stream_chunks(
+    docling_doc: Any,
+    filename: str,
+    upload_id: str,
+    doc_metadata: Dict[str, Any],
+    collected: List[Dict[str, Any]],
+    state: Dict[str, Any],
+    done_positions: Set[int]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streamed STEP 2: yield chunks to ingestion while HybridChunker runs
+
+    Args:
+        docling_doc: Converted DoclingDocument
+        filename: Original filename
+        upload_id: Upload identifier
+        doc_metadata: Document metadata (checkpoint)
+        collected: Receives every chunk produced (for final metrics)
+        state: Receives "chunking_duration" once the stream is exhausted
+        done_positions: Receives the position of each chunk an interrupted
+            run already ingested (same chunk saved and marked done), before
+            the chunk is yielded
+
+    Note:
+        - Each chunk is checkpointed before it is handed to ingestion
+        - Chunking metrics/logs are emitted when the last chunk is produced
+    """
+    log_stage_start(logger, upload_id, "chunking", details={"streamed": True})
+    chunking_start = time()
+    chunker = get_chunker()
+
+    async for chunk in chunker.aiter_chunks(docling_doc, filename, upload_id):
+        if settings.INGESTION_CHECKPOINTS_ENABLED:
+            done_positions.update(
+                await asyncio.to_thread(get_checkpoint_store().append_chunks, upload_id, len(collected), [chunk])
+            )
+        collected.append(chunk)
+        yield chunk
+
+    for chunk in collected:
+        chunk["metadata"]["total_chunks"] = len(collected)
+
+    chunking_duration = time() - chunking_start
+    state["chunking_duration"] = chunking_duration
+    avg_chunk_size = sum(len(c["text"]) for c in collected) / len(collected) if collected else 0
+
+    logger.info(f"[{upload_id}] ✅ Created {len(collected)} semantic chunks (HybridChunker, streamed)")
+    chunker.log_chunk_stats(collected, upload_id)
+    log_stage_complete(
+        logger,
+        upload_id=upload_id,
+        stage="chunking",
+        duration=chunking_duration,
+        metrics={
+            "num_chunks": len(collected),
+            "avg_chunk_size": round(avg_chunk_size, 0),
+            "total_tokens": sum(c["metadata"].get("num_tokens", 0) for c in collected)
+        }
+    )
+
+    processing_status[upload_id]["metrics"] = {
+        **processing_status[upload_id].get("metrics", {}),
+        "num_chunks": len(collected),
+        "avg_chunk_size": round(avg_chunk_size, 0),
+        "chunking_duration": round(chunking_duration, 2)
+    }
+
+    if settings.INGESTION_CHECKPOINTS_ENABLED:
+        await asyncio.to_thread(get_checkpoint_store().complete_chunking, upload_id, len(collected), doc_metadata)
 
 
 def get_processing_status(upload_id: str) -> Optional[Dict[str, Any]]:
@@ -422,19 +761,21 @@ def get_processing_status(upload_id: str) -> Optional[Dict[str, Any]]:
     return processing_status.get(upload_id)
 
 
-async def cleanup_old_status(max_age_hours: int = 24):
-    """Cleanup old processing status entries"""
-    from datetime import datetime, timedelta
-
-    cutoff = datetime.now() - timedelta(hours=max_age_hours)
+async def cleanup_old_status(max_age_hours: Optional[int] = None) -> int:
+    """
+    Cleanup old processing status entries
 
-    to_delete = []
-    for upload_id, status in processing_status.items():
-        started_at = datetime.fromisoformat(status.get("started_at", ""))
-        if started_at < cutoff:
-            to_delete.append(upload_id)
+    Expiry is based on each entry's last update (entries without started_at,
+    e.g. recreated by a retry, are handled too). The status sweeper runs this
+    periodically; calling it directly forces a sweep.
 
-    for upload_id in to_delete:
-        del processing_status[upload_id]
+    Args:
+        max_age_hours: TTL for finished entries (default: STATUS_TTL_HOURS)
 
-    logger.info(f"Cleaned up {len(to_delete)} old status entries")
+    Returns:
+        Number of entries removed
+    """
+    ttl_sec = max_age_hours * 3600 if max_age_hours is not None else None
+    removed = await processing_status.sweep(ttl_sec)
+    logger.info(f"Cleaned up {removed} old status entries")
+    return removed
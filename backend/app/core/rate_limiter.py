@@ -0,0 +1,275 @@
+"""
+Adaptive Token-Bucket Rate Limiter (per API provider)
+
+Replaces the fixed safety margins (60s inter-document delay, static
+SEMAPHORE_LIMIT) with limits driven by real usage:
+- Request bucket (RPM) and token bucket (TPM), refilled continuously
+- Token reservations are corrected with the actual usage reported by the API
+- Adaptive concurrency (AIMD): halved on 429, +1 after a run of successes
+
+One limiter per provider is shared by every caller in the process:
+    limiter = get_rate_limiter("gemini")
+    async with limiter.limit(estimated_tokens=1200) as usage:
+        response = await call_api()
+        usage.actual_tokens = response.usage.total_tokens
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger('diveteacher.rate_limiter')
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Detect provider rate-limit errors (HTTP 429 / RESOURCE_EXHAUSTED)
+
+    Works for openai.RateLimitError, google.genai ClientError(429) and
+    Graphiti's RateLimitError without importing any provider SDK.
+    """
+    if type(error).__name__ == "RateLimitError":
+        return True
+
+    for attr in ("status_code", "code", "status"):
+        if getattr(error, attr, None) in (429, "429", "RESOURCE_EXHAUSTED"):
+            return True
+
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "resource_exhausted" in message
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used before a call"""
+    return max(1, len(text) // 4)
+
+
+class _Usage:
+    """Filled by the caller inside limit() with the real token count"""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+
+class RateLimiter:
+    """
+    Async RPM + TPM token buckets with adaptive concurrency.
+
+    Features:
+    - acquire() waits until a request slot, the token budget and a
+      concurrency slot are all available (FIFO-ish via asyncio.Condition)
+    - release() returns the concurrency slot and corrects the token bucket
+      by (actual - estimated) tokens
+    - on_rate_limited() halves concurrency and drains the buckets so every
+      caller backs off together
+    """
+
+    SUCCESSES_BEFORE_INCREASE = 20  # Additive increase after this many clean calls
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int,
+        tpm: int,
+        max_concurrency: int,
+        min_concurrency: int = 1
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            name: Provider name (logs/stats)
+            rpm: Requests per minute ceiling
+            tpm: Tokens per minute ceiling
+            max_concurrency: Upper bound for in-flight calls
+            min_concurrency: Lower bound when shrinking after 429s
+        """
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.concurrency = self.max_concurrency
+
+        # Buckets start full (capacity = one minute of budget)
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last_refill = time.monotonic()
+
+        self._in_flight = 0
+        self._consecutive_successes = 0
+        self._condition = asyncio.Condition()
+
+        # Stats
+        self.total_requests = 0
+        self.total_tokens = 0
+        self.rate_limited = 0
+        self.wait_time = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60)
+
+    def _seconds_until_available(self, tokens: int) -> float:
+        """0 if the buckets allow the call now, otherwise seconds until they refill enough"""
+        # A call larger than the whole bucket may start once the bucket is full
+        tokens = min(tokens, self.tpm)
+        waits = [0.0]
+        if self._requests < 1:
+            waits.append((1 - self._requests) * 60 / self.rpm)
+        if self._tokens < tokens:
+            waits.append((tokens - self._tokens) * 60 / self.tpm)
+        return max(waits)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait for a request slot, `tokens` of budget and a concurrency slot"""
+        start = time.monotonic()
+
+        async with self._condition:
+            while True:
+                self._refill()
+                wait = self._seconds_until_available(tokens)
+                if wait == 0 and self._in_flight < self.concurrency:
+                    break
+                try:
+                    # Woken early by release(); otherwise re-check after the refill wait
+                    await asyncio.wait_for(self._condition.wait(), timeout=wait or None)
+                except asyncio.TimeoutError:
+                    pass
+
+            self._requests -= 1
+            self._tokens -= tokens
+            self._in_flight += 1
+
+        self.total_requests += 1
+        self.wait_time += time.monotonic() - start
+
+    async def wait_for_capacity(self, tokens: int) -> None:
+        """
+        Wait until the token bucket holds `tokens` without consuming them.
+
+        Used to pace work admission (e.g. one chunk's expected cost) ahead
+        of the individual API calls that will actually spend the budget.
+        """
+        while True:
+            async with self._condition:
+                self._refill()
+                wait = self._seconds_until_available(tokens)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def release(self, estimated_tokens: int, actual_tokens: Optional[int] = None) -> None:
+        """Return the concurrency slot and reconcile the token reservation"""
+        async with self._condition:
+            self._in_flight -= 1
+            if actual_tokens is not None:
+                self._tokens -= actual_tokens - estimated_tokens
+            self.total_tokens += actual_tokens if actual_tokens is not None else estimated_tokens
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Additive increase of concurrency after a run of clean calls"""
+        self._consecutive_successes += 1
+        if (
+            self._consecutive_successes >= self.SUCCESSES_BEFORE_INCREASE
+            and self.concurrency < self.max_concurrency
+        ):
+            self.concurrency += 1
+            self._consecutive_successes = 0
+            logger.info(f"📈 {self.name}: concurrency raised to {self.concurrency}")
+
+    def on_rate_limited(self) -> None:
+        """Multiplicative decrease: halve concurrency and drain the buckets"""
+        self.rate_limited += 1
+        self._consecutive_successes = 0
+        self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+        self._requests = min(self._requests, 0.0)
+        self._tokens = min(self._tokens, 0.0)
+        logger.warning(
+            f"⚠️  {self.name}: rate limited (429) - concurrency reduced to {self.concurrency}"
+        )
+
+    @asynccontextmanager
+    async def limit(self, estimated_tokens: int):
+        """
+        Acquire around one API call.
+
+        Yields a usage object: set `usage.actual_tokens` when the response
+        reports real usage. 429 errors shrink concurrency automatically.
+        """
+        usage = _Usage(estimated_tokens)
+        await self.acquire(estimated_tokens)
+        try:
+            yield usage
+        except BaseException as e:
+            if isinstance(e, Exception) and is_rate_limit_error(e):
+                self.on_rate_limited()
+            raise
+        else:
+            self.on_success()
+        finally:
+            await self.release(estimated_tokens, usage.actual_tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limiter statistics (for health/monitoring endpoints)"""
+        return {
+            "rpm_limit": self.rpm,
+            "tpm_limit": self.tpm,
+            "concurrency": self.concurrency,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "total_requests": self.total_requests,
+            "total_tokens": self.total_tokens,
+            "rate_limited": self.rate_limited,
+            "total_wait_seconds": round(self.wait_time, 2),
+        }
+
+
+# ════════════════════════════════════════════════════════
+# Global Limiters (one per provider)
+# ════════════════════════════════════════════════════════
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Get or create the shared limiter for a provider ("gemini", "openai").
+
+    Limits come from settings (ceiling × RATE_LIMIT_HEADROOM); max
+    concurrency is GRAPHITI_SEMAPHORE_LIMIT.
+    """
+    from app.core.config import settings
+
+    if provider not in _limiters:
+        if provider == "gemini":
+            rpm, tpm = settings.GEMINI_RPM_LIMIT, settings.GEMINI_TPM_LIMIT
+        elif provider == "openai":
+            rpm, tpm = settings.OPENAI_EMBEDDING_RPM_LIMIT, settings.OPENAI_EMBEDDING_TPM_LIMIT
+        else:
+            raise ValueError(f"Unknown rate-limited provider: {provider}")
+
+        headroom = settings.RATE_LIMIT_HEADROOM
+        _limiters[provider] = RateLimiter(
+            name=provider,
+            rpm=max(1, int(rpm * headroom)),
+            tpm=max(1, int(tpm * headroom)),
+            max_concurrency=settings.GRAPHITI_SEMAPHORE_LIMIT
+        )
+        logger.info(
+            f"🚦 Rate limiter '{provider}': {int(rpm * headroom)} RPM, "
+            f"{int(tpm * headroom)} TPM, concurrency ≤ {settings.GRAPHITI_SEMAPHORE_LIMIT}"
+        )
+
+    return _limiters[provider]
+
+
+def get_rate_limiter_stats() -> Dict[str, Any]:
+    """Stats for every limiter created so far"""
+    return {name: limiter.get_stats() for name, limiter in _limiters.items()}
@@ -0,0 +1,119 @@
+"""
+Retry Policy for Provider Calls (exponential backoff + full jitter)
+
+Classifies failures by exception type so only transient errors are retried:
+- Transient: rate limits (429), timeouts, connection resets, 5xx from the
+  provider or Neo4j ServiceUnavailable/TransientError
+- Permanent: everything else (validation errors, malformed responses, ...)
+
+Usage:
+    result = await retry_async(
+        lambda: client.add_episode(...),
+        max_attempts=settings.GRAPHITI_CHUNK_MAX_ATTEMPTS,
+    )
+"""
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.rate_limiter import is_rate_limit_error
+
+logger = logging.getLogger('diveteacher.retry')
+
+# Exception class names that signal a transient condition (no SDK imports needed)
+_TRANSIENT_ERROR_NAMES = (
+    "Timeout",
+    "Connection",
+    "ServiceUnavailable",
+    "TransientError",
+    "InternalServerError",
+    "ServerError",
+    "APIError",
+    "SessionExpired",
+)
+
+_TRANSIENT_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Decide whether a failed call is worth retrying
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        True for rate limits, timeouts, connection errors and 5xx responses
+    """
+    if is_rate_limit_error(error):
+        return True
+
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+
+    name = type(error).__name__
+    if any(marker in name for marker in _TRANSIENT_ERROR_NAMES):
+        return True
+
+    for attr in ("status_code", "code", "status"):
+        if getattr(error, attr, None) in _TRANSIENT_STATUS_CODES:
+            return True
+
+    return False
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Full-jitter exponential backoff: uniform(0, min(max_delay, base * 2^attempt))
+
+    Args:
+        attempt: Retry number (0 for the first retry)
+        base_delay: Delay scale in seconds
+        max_delay: Upper bound in seconds
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def retry_async(
+    call: Callable[[], Awaitable[Any]],
+    max_attempts: int,
+    base_delay: float = 2.0,
+    max_delay: float = 60.0,
+    description: str = "call",
+    on_retry: Optional[Callable[[int, BaseException, float], None]] = None
+) -> Any:
+    """
+    Await `call()` until it succeeds, a permanent error occurs or attempts run out
+
+    Args:
+        call: Zero-argument coroutine factory (a fresh coroutine per attempt)
+        max_attempts: Total attempts including the first one
+        base_delay: Backoff scale in seconds
+        max_delay: Backoff upper bound in seconds
+        description: Label for retry logs
+        on_retry: Optional hook (attempt, error, delay) before each sleep
+
+    Returns:
+        The call's result
+
+    Raises:
+        The last error (permanent, or transient after max_attempts)
+    """
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as e:
+            attempt += 1
+            if attempt >= max_attempts or not is_transient_error(e):
+                raise
+
+            delay = backoff_delay(attempt - 1, base_delay, max_delay)
+            logger.warning(
+                f"🔁 {description} failed ({type(e).__name__}: {e}) - "
+                f"retry {attempt}/{max_attempts - 1} in {delay:.1f}s"
+            )
+            if on_retry:
+                on_retry(attempt, e, delay)
+            await asyncio.sleep(delay)
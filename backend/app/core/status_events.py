@@ -0,0 +1,189 @@
+"""
+Processing Status Events (push updates for SSE clients)
+
+GET /api/upload/{id}/events streams status deltas instead of clients
+polling /status for the whole ingestion:
+- The StatusStore notifies the broker on every top-level change
+- The broker diffs the streamed fields against the last snapshot and pushes
+  only changed fields (SSE event id increasing per change)
+- Recent deltas are kept per upload (SSE_HISTORY_EVENTS) so a reconnecting
+  client (Last-Event-ID) gets what it missed, or a snapshot when too old
+
+Only uploads with at least one subscriber since their status was created are
+tracked; other status updates cost one dict lookup.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.status_store import StatusStore, get_status_store
+
+logger = logging.getLogger('diveteacher.status')
+
+# Status fields pushed to clients (everything else stays on GET /status)
+STREAMED_FIELDS = (
+    "status",
+    "stage",
+    "sub_stage",
+    "progress",
+    "progress_detail",
+    "ingestion_progress",
+    "metrics",
+    "durations",
+    "error",
+    "completed_at",
+    "failed_at",
+)
+
+Event = Tuple[int, str, Dict[str, Any]]  # (id, "snapshot" | "progress", data)
+
+
+class _TrackedUpload:
+    __slots__ = ("seq", "resumable_from", "snapshot", "history", "subscribers")
+
+    def __init__(self, seq: int, snapshot: Dict[str, Any]):
+        self.seq = seq  # Id of the latest event
+        self.resumable_from = seq  # Clients holding an older id need a snapshot
+        self.snapshot = snapshot
+        self.history: deque = deque(maxlen=max(1, settings.SSE_HISTORY_EVENTS))
+        self.subscribers: Set[asyncio.Queue] = set()
+
+
+class StatusEventBroker:
+    """
+    Per-upload status deltas fanned out to subscriber queues
+
+    Runs on the event loop; changes reported from another thread are
+    handed over with call_soon_threadsafe.
+    """
+
+    def __init__(self, store: StatusStore):
+        self.store = store
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tracked: Dict[str, _TrackedUpload] = {}
+        # Event ids: increasing across uploads and restarts (ms clock seed), so
+        # a stale Last-Event-ID never matches a newer tracking of the upload
+        self._ids = itertools.count(int(time.time() * 1000))
+        store.add_listener(self._on_status_change)
+
+    @staticmethod
+    def _project(status: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Streamed fields of a status, JSON-safe (None if the status is gone)"""
+        if not status:
+            return None
+        return json.loads(json.dumps({key: status[key] for key in STREAMED_FIELDS if key in status}, default=str))
+
+    def _on_status_change(self, upload_id: str, status: Optional[Dict[str, Any]]) -> None:
+        if upload_id not in self._tracked:
+            return
+
+        if self._loop is not None:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not self._loop:
+                self._loop.call_soon_threadsafe(self._apply, upload_id, self._project(status))
+                return
+
+        self._apply(upload_id, self._project(status))
+
+    def _apply(self, upload_id: str, snapshot: Optional[Dict[str, Any]]) -> None:
+        tracked = self._tracked.get(upload_id)
+        if tracked is None:
+            return
+
+        if snapshot is None:
+            # Status removed (expired/evicted): stop tracking once nobody listens
+            if not tracked.subscribers:
+                del self._tracked[upload_id]
+            return
+
+        delta = {key: value for key, value in snapshot.items() if tracked.snapshot.get(key) != value}
+        delta.update({key: None for key in tracked.snapshot if key not in snapshot})
+        if not delta:
+            return
+
+        if len(tracked.history) == tracked.history.maxlen:
+            tracked.resumable_from = tracked.history[0][0]
+        tracked.seq = next(self._ids)
+        tracked.snapshot = snapshot
+        tracked.history.append((tracked.seq, delta))
+        for queue in tracked.subscribers:
+            queue.put_nowait((tracked.seq, "progress", delta))
+
+    def refresh(self, upload_id: str) -> bool:
+        """
+        Re-read a status from the store and push any difference
+
+        Catches changes made by another API worker (STATUS_BACKEND=sqlite),
+        which this process is not notified of.
+
+        Returns:
+            False if the status no longer exists (expired/evicted)
+        """
+        snapshot = self._project(self.store.get(upload_id))
+        self._apply(upload_id, snapshot)
+        return snapshot is not None
+
+    def subscribe(self, upload_id: str, last_event_id: Optional[int] = None) -> Tuple[asyncio.Queue, List[Event]]:
+        """
+        Register a subscriber
+
+        Args:
+            upload_id: Upload to follow
+            last_event_id: Last event the client received (Last-Event-ID), if any
+
+        Returns:
+            (queue of future events, events to send first: missed deltas or a snapshot)
+            Empty initial events and no tracking if the upload is unknown
+        """
+        self._loop = asyncio.get_running_loop()
+
+        tracked = self._tracked.get(upload_id)
+        if tracked is None:
+            snapshot = self._project(self.store.get(upload_id))
+            if snapshot is None:
+                return asyncio.Queue(), []
+            tracked = self._tracked[upload_id] = _TrackedUpload(next(self._ids), snapshot)
+
+        # Resume only if every delta after last_event_id is still in history
+        if last_event_id is not None and tracked.resumable_from <= last_event_id <= tracked.seq:
+            initial = [(seq, "progress", delta) for seq, delta in tracked.history if seq > last_event_id]
+        else:
+            initial = [(tracked.seq, "snapshot", tracked.snapshot)]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        tracked.subscribers.add(queue)
+        return queue, initial
+
+    def unsubscribe(self, upload_id: str, queue: asyncio.Queue) -> None:
+        tracked = self._tracked.get(upload_id)
+        if tracked is None:
+            return
+        tracked.subscribers.discard(queue)
+        if not tracked.subscribers and upload_id not in self.store:
+            del self._tracked[upload_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tracked_uploads": len(self._tracked),
+            "subscribers": sum(len(tracked.subscribers) for tracked in self._tracked.values()),
+        }
+
+
+_status_event_broker: Optional[StatusEventBroker] = None
+
+
+def get_status_event_broker() -> StatusEventBroker:
+    """Get or create the status event broker singleton"""
+    global _status_event_broker
+
+    if _status_event_broker is None:
+        _status_event_broker = StatusEventBroker(get_status_store())
+    return _status_event_broker
@@ -0,0 +1,470 @@
+"""
+Processing Status Store (bounded, evicting, optional SQLite backend)
+
+processing_status used to be a module-level dict that only grew. It is now
+a StatusStore with the same mapping interface (status[upload_id].update(...)
+keeps working):
+- Finished entries (completed / failed) expire after STATUS_TTL_HOURS
+- Entries never updated for STATUS_STALE_HOURS (orphans of a crash) expire
+- Above STATUS_MAX_ENTRIES, the least recently updated finished entries are
+  evicted (queued / processing entries never are)
+- Background sweeper (start_status_sweeper) applies TTLs every
+  STATUS_SWEEP_INTERVAL_SEC
+
+Backends (STATUS_BACKEND):
+- "memory": this process only (default)
+- "sqlite": {STATE_DIR}/processing_status.sqlite; survives restarts and is
+  readable by every API worker (primary-key lookup). Changes are written
+  behind by a writer thread: the latest state of each upload changed within
+  STATUS_WRITE_DELAY_SEC goes out in one transaction, never on the event loop
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger('diveteacher.status')
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Called with (upload_id, status) after each change, (upload_id, None) on removal
+StatusListener = Callable[[str, Optional[Dict[str, Any]]], None]
+
+# Pending SQLite write: (data, updated_at, version), or None for a delete
+PendingWrite = Optional[Tuple[Dict[str, Any], float, int]]
+
+
+class StatusEntry(dict):
+    """
+    One upload's status dict
+
+    Top-level changes (item assignment, update, pop, del) are reported to
+    the store (timestamps, version, SQLite write-behind). Nested dicts are
+    replaced, not mutated, throughout the pipeline (metrics = {**metrics, ...}).
+
+    version increases on every change (ETag of GET /upload/{id}/status).
+    """
+
+    __slots__ = ("_store", "_upload_id", "version")
+
+    def __init__(self, store: "StatusStore", upload_id: str, data: Dict[str, Any], version: int = 0):
+        super().__init__(data)
+        self._store = store
+        self._upload_id = upload_id
+        self.version = version
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._store._changed(self._upload_id, self)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._store._changed(self._upload_id, self)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._store._changed(self._upload_id, self)
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._store._changed(self._upload_id, self)
+        return value
+
+
+class SQLiteStatusBackend:
+    """
+    SQLite status table (WAL: concurrent readers across API workers)
+
+    Thread-safe (one connection guarded by a lock).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS status (
+                upload_id TEXT PRIMARY KEY,
+                status TEXT,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_status_updated ON status(updated_at);
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(status)")}
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE status ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+        logger.info(f"💾 Processing status store: {path}")
+
+    def load(self, upload_id: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """(status, version) or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, version FROM status WHERE upload_id = ?", (upload_id,)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def write_batch(self, batch: Dict[str, PendingWrite]) -> None:
+        """Apply saves and deletes (None) in one transaction"""
+        rows = [
+            (upload_id, write[0].get("status"), json.dumps(write[0], default=str), write[1], write[2])
+            for upload_id, write in batch.items() if write is not None
+        ]
+        deletes = [(upload_id,) for upload_id, write in batch.items() if write is None]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO status (upload_id, status, data, updated_at, version) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.executemany("DELETE FROM status WHERE upload_id = ?", deletes)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def expire(self, finished_cutoff: float, stale_cutoff: float, max_entries: int) -> int:
+        """Apply TTLs and the entry cap; returns rows deleted"""
+        placeholders = ",".join("?" for _ in TERMINAL_STATUSES)
+        with self._lock:
+            deleted = self._conn.execute(
+                f"DELETE FROM status WHERE (status IN ({placeholders}) AND updated_at < ?) OR updated_at < ?",
+                (*TERMINAL_STATUSES, finished_cutoff, stale_cutoff)
+            ).rowcount
+            deleted += self._conn.execute(
+                f"DELETE FROM status WHERE upload_id IN ("
+                f"SELECT upload_id FROM status WHERE status IN ({placeholders}) "
+                f"ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (*TERMINAL_STATUSES, max_entries)
+            ).rowcount
+        return deleted
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM status").fetchone()[0]
+
+
+class StatusStore(MutableMapping):
+    """
+    Bounded upload_id → StatusEntry mapping
+
+    Entries written by this process stay in memory (LRU order by last
+    update); with the SQLite backend, other uploads are read from the table
+    on lookup.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_sec: float,
+        stale_sec: float,
+        backend: str = "memory"
+    ):
+        """
+        Args:
+            max_entries: Cap on entries (finished ones evicted first)
+            ttl_sec: Lifetime of finished entries after their last update
+            stale_sec: Lifetime of any entry without updates (crash orphans)
+            backend: "memory" | "sqlite"
+        """
+        if backend not in ("memory", "sqlite"):
+            raise ValueError(f"Unknown STATUS_BACKEND: {backend} (memory | sqlite)")
+
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.stale_sec = stale_sec
+        self.backend_name = backend
+        self._backend: Optional[SQLiteStatusBackend] = None
+        self._entries: "OrderedDict[str, StatusEntry]" = OrderedDict()
+        self._updated_at: Dict[str, float] = {}
+        self._evicted = 0
+        self._listeners: List[StatusListener] = []
+
+        # SQLite write-behind (latest pending write per upload)
+        self._pending: Dict[str, PendingWrite] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending_event = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def backend(self) -> Optional[SQLiteStatusBackend]:
+        """SQLite backend, opened on first use (None in memory mode)"""
+        if self.backend_name == "sqlite" and self._backend is None:
+            self._backend = SQLiteStatusBackend(f"{settings.STATE_DIR}/processing_status.sqlite")
+        return self._backend
+
+    # ═══════════════════════════════════════════════════════════
+    # Mapping interface
+    # ═══════════════════════════════════════════════════════════
+
+    def __getitem__(self, upload_id: str) -> StatusEntry:
+        entry = self._entries.get(upload_id)
+        if entry is not None:
+            return entry
+        if not self.backend:
+            raise KeyError(upload_id)
+
+        # Not written yet: the pending write is the current state
+        with self._pending_lock:
+            pending = self._pending.get(upload_id, ...)
+        if pending is None:
+            raise KeyError(upload_id)
+        if pending is not ...:
+            return StatusEntry(self, upload_id, dict(pending[0]), pending[2])
+
+        row = self.backend.load(upload_id)
+        if row is None:
+            raise KeyError(upload_id)
+        return StatusEntry(self, upload_id, *row)
+
+    def __setitem__(self, upload_id: str, value: Dict[str, Any]) -> None:
+        previous = self._entries.get(upload_id)
+        entry = StatusEntry(self, upload_id, value, previous.version if previous else 0)
+        self._entries[upload_id] = entry
+        self._changed(upload_id, entry)
+        self._enforce_max_entries()
+
+    def __delitem__(self, upload_id: str) -> None:
+        found = self._entries.pop(upload_id, None) is not None
+        self._updated_at.pop(upload_id, None)
+        if self.backend:
+            self._schedule_write(upload_id, None)
+        elif not found:
+            raise KeyError(upload_id)
+        self._notify(upload_id, None)
+
+    def __contains__(self, upload_id: object) -> bool:
+        try:
+            self[upload_id]
+            return True
+        except KeyError:
+            return False
+
+    def setdefault(self, upload_id: str, default: Dict[str, Any]) -> StatusEntry:
+        """Like dict.setdefault, but always returns the tracked StatusEntry"""
+        if upload_id not in self:
+            self[upload_id] = default
+        return self[upload_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ═══════════════════════════════════════════════════════════
+    # Change notification
+    # ═══════════════════════════════════════════════════════════
+
+    def add_listener(self, listener: StatusListener) -> None:
+        """Register a change callback (e.g. the SSE event broker)"""
+        self._listeners.append(listener)
+
+    def _notify(self, upload_id: str, entry: Optional[StatusEntry]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(upload_id, entry)
+            except Exception as e:
+                # A listener must never break the pipeline updating status
+                logger.warning(f"⚠️  Status listener failed for {upload_id}: {e}")
+
+    def _changed(self, upload_id: str, entry: StatusEntry) -> None:
+        now = time.time()
+        self._updated_at[upload_id] = now
+        # Millisecond clock floor: versions keep increasing across restarts
+        entry.version = max(entry.version + 1, int(now * 1000))
+        if upload_id in self._entries:
+            self._entries.move_to_end(upload_id)
+        if self.backend:
+            # Shallow copy: nested dicts are replaced, never mutated in place
+            self._schedule_write(upload_id, (dict(entry), now, entry.version))
+        self._notify(upload_id, entry)
+
+    # ═══════════════════════════════════════════════════════════
+    # SQLite write-behind
+    # ═══════════════════════════════════════════════════════════
+
+    def _schedule_write(self, upload_id: str, write: PendingWrite) -> None:
+        with self._pending_lock:
+            self._pending[upload_id] = write
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="status-writer", daemon=True)
+                self._writer.start()
+            self._pending_event.set()
+
+    def _write_loop(self) -> None:
+        while True:
+            self._pending_event.wait()
+            # Let the burst of changes (progress ticks) coalesce into one transaction
+            time.sleep(settings.STATUS_WRITE_DELAY_SEC)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️  Status write failed: {e}")
+                time.sleep(1)
+
+    def flush(self) -> None:
+        """Write pending changes to SQLite now (writer thread, shutdown, tests)"""
+        if not self.backend:
+            return
+        with self._flush_lock:
+            with self._pending_lock:
+                batch = dict(self._pending)
+                self._pending_event.clear()
+            if not batch:
+                return
+            self.backend.write_batch(batch)
+            with self._pending_lock:
+                # Keep writes that arrived meanwhile (same object = written)
+                for upload_id, write in batch.items():
+                    if self._pending.get(upload_id, ...) is write:
+                        del self._pending[upload_id]
+
+    # ═══════════════════════════════════════════════════════════
+    # Eviction
+    # ═══════════════════════════════════════════════════════════
+
+    def _enforce_max_entries(self) -> None:
+        """Evict least recently updated finished entries above max_entries"""
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        for upload_id in [
+            upload_id for upload_id, entry in self._entries.items()
+            if entry.get("status") in TERMINAL_STATUSES
+        ][:excess]:
+            # Memory only: the SQLite row stays readable until the sweeper expires it
+            self._entries.pop(upload_id, None)
+            self._updated_at.pop(upload_id, None)
+            self._evicted += 1
+            if not self.backend:
+                self._notify(upload_id, None)
+
+    async def sweep(self, ttl_sec: Optional[float] = None) -> int:
+        """
+        Expire finished entries older than ttl_sec and any entry without
+        updates for stale_sec
+
+        In-memory entries are expired on the event loop (where they are
+        updated); only the SQLite DELETE runs in a thread.
+
+        Args:
+            ttl_sec: Override of the finished-entry TTL for this sweep
+
+        Returns:
+            Number of entries removed
+        """
+        ttl_sec = self.ttl_sec if ttl_sec is None else ttl_sec
+        now = time.time()
+        removed = self._expire_entries(now, ttl_sec)
+        if self.backend:
+            # Memory entries are rows too: count rows only
+            removed = await asyncio.to_thread(
+                self.backend.expire, now - ttl_sec, now - self.stale_sec, self.max_entries
+            )
+
+        self._evicted += removed
+        return removed
+
+    def _expire_entries(self, now: float, ttl_sec: float) -> int:
+        expired = [
+            upload_id for upload_id, entry in self._entries.items()
+            if now - self._updated_at.get(upload_id, now) > (
+                ttl_sec if entry.get("status") in TERMINAL_STATUSES else self.stale_sec
+            )
+        ]
+        for upload_id in expired:
+            self._entries.pop(upload_id, None)
+            self._updated_at.pop(upload_id, None)
+            self._notify(upload_id, None)
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry counts (for health/monitoring endpoints)"""
+        return {
+            "backend": self.backend_name,
+            "entries_in_memory": len(self._entries),
+            "entries_persisted": self.backend.count() if self.backend else None,
+            "pending_writes": len(self._pending),
+            "max_entries": self.max_entries,
+            "evicted": self._evicted,
+        }
+
+
+_status_store: Optional[StatusStore] = None
+
+
+def get_status_store() -> StatusStore:
+    """Get or create the processing status store singleton"""
+    global _status_store
+
+    if _status_store is None:
+        _status_store = StatusStore(
+            max_entries=settings.STATUS_MAX_ENTRIES,
+            ttl_sec=settings.STATUS_TTL_HOURS * 3600,
+            stale_sec=settings.STATUS_STALE_HOURS * 3600,
+            backend=settings.STATUS_BACKEND,
+        )
+    return _status_store
+
+
+# ════════════════════════════════════════════════════════
+# Background sweeper
+# ════════════════════════════════════════════════════════
+
+_sweeper_task: Optional[asyncio.Task] = None
+
+
+async def _sweep_loop(store: StatusStore) -> None:
+    while True:
+        await asyncio.sleep(settings.STATUS_SWEEP_INTERVAL_SEC)
+        try:
+            removed = await store.sweep()
+            if removed:
+                logger.info(f"🧹 Status sweep: {removed} expired entries removed")
+        except Exception as e:
+            logger.warning(f"⚠️  Status sweep failed: {e}")
+
+
+def start_status_sweeper(store: StatusStore) -> None:
+    """Start the periodic TTL sweep (application startup)"""
+    global _sweeper_task
+
+    if _sweeper_task is None or _sweeper_task.done():
+        _sweeper_task = asyncio.create_task(_sweep_loop(store))
+
+
+async def stop_status_sweeper() -> None:
+    """Stop the periodic TTL sweep and write pending changes (application shutdown)"""
+    global _sweeper_task
+
+    if _sweeper_task is not None:
+        _sweeper_task.cancel()
+        await asyncio.gather(_sweeper_task, return_exceptions=True)
+        _sweeper_task = None
+
+    if _status_store is not None:
+        await asyncio.to_thread(_status_store.flush)
@@ -0,0 +1,94 @@
+"""
+Docling Conversion Cache (content-addressed, persistent)
+
+Re-uploading the same PDF (re-ingestion, another tenant, tests) used to pay
+the full ACCURATE + OCR conversion again. Converted documents are cached:
+- Key: SHA-256 of (file content hash, PDF pipeline options, Docling versions)
+  → an options change or a Docling upgrade never returns a stale document
+- Value: DoclingDocument JSON, zlib-compressed
+- Store: DiskCache (SQLite on the uploads volume, size-bounded LRU)
+"""
+import hashlib
+import json
+import logging
+import zlib
+from typing import Any, Dict, Optional
+
+from docling.datamodel.document import DoclingDocument
+
+from app.core.config import settings
+from app.core.disk_cache import DiskCache, content_key
+
+logger = logging.getLogger('diveteacher.conversion_cache')
+
+
+def hash_file(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's content (streamed, constant memory)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def conversion_key(file_hash: str, pipeline_signature: str) -> str:
+    """Cache key for one file converted with one pipeline configuration"""
+    from importlib.metadata import version
+
+    return content_key(
+        file_hash,
+        pipeline_signature,
+        version("docling"),
+        version("docling-core")
+    )
+
+
+def load_document(key: str) -> Optional[DoclingDocument]:
+    """Cached DoclingDocument, or None (miss or undecodable entry)"""
+    value = get_conversion_cache().get(key)
+    if value is None:
+        return None
+
+    try:
+        return DoclingDocument.model_validate(json.loads(zlib.decompress(value)))
+    except Exception as e:
+        # Schema drift inside a docling-core version: treat as a miss
+        logger.warning(f"⚠️  Cached conversion unreadable ({e}) - reconverting")
+        return None
+
+
+def save_document(key: str, document: DoclingDocument) -> None:
+    """Store a converted DoclingDocument"""
+    payload = json.dumps(document.export_to_dict(), ensure_ascii=False).encode("utf-8")
+    get_conversion_cache().set(key, zlib.compress(payload, 6))
+
+
+# Global conversion cache (singleton pattern)
+_conversion_cache: Optional[DiskCache] = None
+
+
+def get_conversion_cache() -> DiskCache:
+    """
+    Get or create the conversion DiskCache singleton
+
+    Note:
+        - File: {CACHE_DIR}/docling_conversions.sqlite
+        - Size bound: CONVERSION_CACHE_MAX_MB (LRU eviction)
+    """
+    global _conversion_cache
+
+    if _conversion_cache is None:
+        _conversion_cache = DiskCache(
+            path=f"{settings.CACHE_DIR}/docling_conversions.sqlite",
+            max_bytes=settings.CONVERSION_CACHE_MAX_MB * 1024 * 1024,
+            name="docling_conversions"
+        )
+
+    return _conversion_cache
+
+
+def get_conversion_cache_stats() -> Dict[str, Any]:
+    """Conversion cache statistics (or disabled marker)"""
+    if not settings.CONVERSION_CACHE_ENABLED:
+        return {"enabled": False}
+    return {"enabled": True, **get_conversion_cache().get_stats()}
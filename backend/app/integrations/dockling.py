@@ -3,27 +3,313 @@ Docling Integration avec Configuration Avancée
 
 Ce module gère la conversion de documents (PDF, PPT, DOCX) en DoclingDocument
 avec configuration optimisée pour DiveTeacher (OCR + tables + ACCURATE mode).
+
+Conversion backends (DOCLING_EXECUTOR):
+- "thread": ThreadPoolExecutor sharing one DoclingSingleton converter
+- "process": ProcessPoolExecutor, one converter per worker process (no GIL
+  contention on layout post-processing), workers recycled after
+  DOCLING_PROCESS_MAX_TASKS_PER_WORKER documents, pool rebuilt if a worker crashes
+
+Large PDFs (> DOCLING_SHARD_MIN_PAGES pages) are split into page ranges of
+DOCLING_SHARD_PAGES pages, converted in parallel on the executor and merged
+back into one DoclingDocument (document order, original page numbers).
+
+Office documents (DOCX/PPTX) take a lightweight path: their own converter
+(SimplePipeline, no layout/OCR models) on a separate thread pool, so a large
+slide deck never waits behind a scanned PDF on the Docling executor.
+
+OCR (DOCLING_OCR_MODE="auto"): a pypdfium2 pre-pass checks each page's text
+layer; EasyOCR only runs on page ranges without one (scanned MFT pages).
 """
 import asyncio
 import logging
+import multiprocessing
+import re
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
-from concurrent.futures import ThreadPoolExecutor
-from docling.document_converter import DocumentConverter, PdfFormatOption
+from time import perf_counter
+from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from docling.document_converter import (
+    DocumentConverter,
+    PdfFormatOption,
+    PowerpointFormatOption,
+    WordFormatOption,
+)
 from docling.datamodel.base_models import InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
 from docling.datamodel.document import DoclingDocument
 
 from app.core.config import settings
 from app.core.logging_config import log_error
+from app.integrations.conversion_cache import conversion_key, hash_file, load_document, save_document
 from app.services.document_validator import DocumentValidator
 
 logger = logging.getLogger('diveteacher.docling')
 
 # ═══════════════════════════════════════════════════════════
-# ✅ NEW: Dedicated executor for Docling (module-level)
+# ✅ Dedicated executor for Docling (thread or process pool)
+# ═══════════════════════════════════════════════════════════
+_docling_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_executor_restarts = 0
+
+
+_office_executor: Optional[ThreadPoolExecutor] = None
+
+# Formats converted on the lightweight Office path
+OFFICE_FORMATS = {".docx": "docx", ".pptx": "pptx"}
+
+# Conversion throughput per format (documents converted, not cache hits)
+_throughput_lock = threading.Lock()
+_format_throughput: Dict[str, Dict[str, float]] = {}
+
+
+def is_office_document(file_path: str) -> bool:
+    """True for formats converted on the lightweight Office path"""
+    return Path(file_path).suffix.lower() in OFFICE_FORMATS
+
+
+def _init_process_worker() -> None:
+    """Process-pool initializer: load this worker's converter once"""
+    logging.basicConfig(level=logging.INFO)  # Spawned process: no app logging config
+    DoclingSingleton.get_converter()
+
+
+def get_docling_executor() -> Executor:
+    """
+    Get or create the Docling conversion executor
+
+    Returns:
+        ThreadPoolExecutor (DOCLING_EXECUTOR="thread", PROCESSING_WORKERS threads)
+        or ProcessPoolExecutor (DOCLING_EXECUTOR="process", DOCLING_PROCESS_WORKERS
+        processes, each recycled after DOCLING_PROCESS_MAX_TASKS_PER_WORKER documents)
+    """
+    global _docling_executor
+
+    with _executor_lock:
+        if _docling_executor is None:
+            if settings.DOCLING_EXECUTOR == "process":
+                _docling_executor = ProcessPoolExecutor(
+                    max_workers=settings.DOCLING_PROCESS_WORKERS,
+                    # spawn: required by max_tasks_per_child, and no forked torch/CUDA state
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_process_worker,
+                    max_tasks_per_child=settings.DOCLING_PROCESS_MAX_TASKS_PER_WORKER or None
+                )
+                logger.info(
+                    f"🏭 Docling executor: {settings.DOCLING_PROCESS_WORKERS} processes "
+                    f"(recycled every {settings.DOCLING_PROCESS_MAX_TASKS_PER_WORKER} documents)"
+                )
+            elif settings.DOCLING_EXECUTOR == "thread":
+                _docling_executor = ThreadPoolExecutor(
+                    max_workers=settings.PROCESSING_WORKERS,
+                    thread_name_prefix="docling_"
+                )
+                logger.info(f"🧵 Docling executor: {settings.PROCESSING_WORKERS} threads (shared converter)")
+            else:
+                raise ValueError(f"Unknown DOCLING_EXECUTOR: {settings.DOCLING_EXECUTOR} (thread | process)")
+
+        return _docling_executor
+
+
+def get_office_executor() -> ThreadPoolExecutor:
+    """
+    Get or create the Office conversion executor (DOCX/PPTX)
+
+    Returns:
+        ThreadPoolExecutor with DOCLING_OFFICE_WORKERS threads, separate from
+        the Docling PDF executor (no layout/OCR models: cheap, short tasks)
+    """
+    global _office_executor
+
+    with _executor_lock:
+        if _office_executor is None:
+            _office_executor = ThreadPoolExecutor(
+                max_workers=settings.DOCLING_OFFICE_WORKERS,
+                thread_name_prefix="docling_office_"
+            )
+            logger.info(f"🧵 Office executor: {settings.DOCLING_OFFICE_WORKERS} threads (DOCX/PPTX)")
+
+        return _office_executor
+
+
+def _recycle_docling_executor(broken: Executor) -> None:
+    """Replace a broken process pool (a worker crashed: OOM kill, segfault)"""
+    global _docling_executor, _executor_restarts
+
+    with _executor_lock:
+        if _docling_executor is broken:
+            _docling_executor = None
+            _executor_restarts += 1
+    broken.shutdown(wait=False, cancel_futures=True)
+    logger.warning(f"♻️  Docling process pool rebuilt after a worker crash (restarts: {_executor_restarts})")
+
+
+def shutdown_docling_executor() -> None:
+    """Stop conversion workers (application shutdown)"""
+    global _docling_executor, _office_executor
+
+    with _executor_lock:
+        executors = [_docling_executor, _office_executor]
+        _docling_executor = _office_executor = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def record_conversion_throughput(fmt: str, pages: int, size_mb: float, seconds: float) -> None:
+    """Add one conversion to the per-format throughput counters"""
+    with _throughput_lock:
+        stats = _format_throughput.setdefault(
+            fmt, {"documents": 0, "pages": 0, "megabytes": 0.0, "seconds": 0.0}
+        )
+        stats["documents"] += 1
+        stats["pages"] += pages
+        stats["megabytes"] += size_mb
+        stats["seconds"] += seconds
+
+
+def get_conversion_throughput() -> Dict[str, Dict[str, Any]]:
+    """Per-format conversion throughput (documents, pages/s, MB/s, avg seconds)"""
+    with _throughput_lock:
+        snapshot = {fmt: dict(stats) for fmt, stats in _format_throughput.items()}
+
+    return {
+        fmt: {
+            "documents": int(stats["documents"]),
+            "pages": int(stats["pages"]),
+            "avg_seconds": round(stats["seconds"] / stats["documents"], 2),
+            "pages_per_sec": round(stats["pages"] / stats["seconds"], 2) if stats["seconds"] else None,
+            "mb_per_sec": round(stats["megabytes"] / stats["seconds"], 2) if stats["seconds"] else None,
+        }
+        for fmt, stats in snapshot.items()
+    }
+
+
+def get_docling_executor_stats() -> Dict[str, Any]:
+    """Conversion backend info (for health/monitoring endpoints)"""
+    return {
+        "mode": settings.DOCLING_EXECUTOR,
+        "workers": (
+            settings.DOCLING_PROCESS_WORKERS if settings.DOCLING_EXECUTOR == "process"
+            else settings.PROCESSING_WORKERS
+        ),
+        "max_tasks_per_worker": (
+            settings.DOCLING_PROCESS_MAX_TASKS_PER_WORKER if settings.DOCLING_EXECUTOR == "process" else None
+        ),
+        "pool_restarts": _executor_restarts,
+        "started": _docling_executor is not None,
+        "office_workers": settings.DOCLING_OFFICE_WORKERS,
+        "office_started": _office_executor is not None,
+        "throughput": get_conversion_throughput(),
+    }
+
+
+# ═══════════════════════════════════════════════════════════
+# Conversion profiles (per upload: form field or auto-selection)
 # ═══════════════════════════════════════════════════════════
-_docling_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="docling_")
+# - accurate: manuels MFT FFESSM (tableaux complexes, scans) - historical default
+# - balanced: FAST tables, OCR only where needed
+# - fast: slide decks and simple handouts (FAST tables, text layer only)
+CONVERSION_PROFILES: Dict[str, Dict[str, Any]] = {
+    "fast": {
+        "table_mode": TableFormerMode.FAST,
+        "ocr": False,
+        "page_images": False,
+        "picture_classification": False,
+    },
+    "balanced": {
+        "table_mode": TableFormerMode.FAST,
+        "ocr": True,
+        "page_images": False,
+        "picture_classification": False,
+    },
+    "accurate": {
+        "table_mode": TableFormerMode.ACCURATE,
+        "ocr": True,
+        "page_images": False,
+        "picture_classification": False,
+    },
+}
+
+DEFAULT_CONVERSION_PROFILE = "accurate"
+
+
+def select_conversion_profile(file_path: str) -> str:
+    """
+    Pick a conversion profile from document characteristics (pre-flight
+    analysis, see document_analyzer.recommend_profile)
+    """
+    from app.services.document_analyzer import analyze_document
+
+    try:
+        return analyze_document(file_path).get("recommended_profile", DEFAULT_CONVERSION_PROFILE)
+    except Exception as e:
+        logger.warning(f"⚠️  Profile auto-selection failed ({e}) - using {DEFAULT_CONVERSION_PROFILE}")
+        return DEFAULT_CONVERSION_PROFILE
+
+
+def resolve_conversion_profile(file_path: str, requested: Optional[str] = None) -> str:
+    """
+    Profile actually used for a conversion
+
+    Args:
+        file_path: Path to document
+        requested: Profile name, "auto" or None (→ DOCLING_CONVERSION_PROFILE)
+
+    Raises:
+        ValueError: Unknown profile name
+    """
+    profile = (requested or settings.DOCLING_CONVERSION_PROFILE).lower()
+    if profile == "auto":
+        return select_conversion_profile(file_path)
+    if profile not in CONVERSION_PROFILES:
+        raise ValueError(
+            f"Unknown conversion profile '{profile}'. "
+            f"Allowed: auto, {', '.join(CONVERSION_PROFILES)}"
+        )
+    return profile
+
+
+def build_pdf_pipeline_options(
+    profile: str = DEFAULT_CONVERSION_PROFILE,
+    ocr: bool = True
+) -> PdfPipelineOptions:
+    """
+    PDF pipeline configuration (also part of the conversion cache key)
+
+    Args:
+        profile: Conversion profile (CONVERSION_PROFILES)
+        ocr: EasyOCR enabled (pages without a text layer) or not (born-digital pages)
+    """
+    options = CONVERSION_PROFILES[profile]
+
+    # Configuration pour documents plongée (tableaux + OCR)
+    pipeline_options = PdfPipelineOptions(
+        do_ocr=ocr and options["ocr"],  # OCR pour scans MFT FFESSM
+        do_table_structure=True,        # Tableaux critiques pour plongée
+        generate_page_images=options["page_images"],
+        do_picture_classification=options["picture_classification"],
+        artifacts_path=None,            # Auto-download from HuggingFace
+    )
+
+    # ACCURATE: qualité maximale (extraction tables) / FAST: decks, handouts
+    pipeline_options.table_structure_options.mode = options["table_mode"]
+
+    return pipeline_options
+
+
+def pipeline_signature(profile: str = DEFAULT_CONVERSION_PROFILE) -> str:
+    """Stable description of the conversion configuration (cache key part)"""
+    return "|".join([
+        profile,
+        build_pdf_pipeline_options(profile).model_dump_json(),
+        settings.DOCLING_OCR_MODE,
+        str(settings.DOCLING_OCR_MIN_TEXT_CHARS),
+        str(settings.DOCLING_OCR_IMAGE_COVERAGE),
+    ])
 
 
 class DoclingSingleton:
@@ -32,34 +318,67 @@ class DoclingSingleton:
 
     Le converter Docling charge des modèles ML lourds (DocLayNet, TableFormer).
     Réutiliser la même instance améliore drastiquement les performances.
+    One cached converter per (profile, OCR) pair.
     """
-    _instance: Optional[DocumentConverter] = None
+    _instance: Optional[DocumentConverter] = None  # accurate + OCR converter (default)
+    _instances: Dict[Tuple[str, bool], DocumentConverter] = {}
+    _office_instance: Optional[DocumentConverter] = None  # DOCX/PPTX only
 
     @classmethod
-    def get_converter(cls) -> DocumentConverter:
-        """Get or create DocumentConverter singleton"""
-        if cls._instance is None:
-            logger.info("Initializing Docling DocumentConverter...")
-
-            # Configuration pour documents plongée (tableaux + OCR)
-            pipeline_options = PdfPipelineOptions(
-                do_ocr=True,                    # OCR pour scans MFT FFESSM
-                do_table_structure=True,        # Tableaux critiques pour plongée
-                artifacts_path=None,            # Auto-download from HuggingFace
-            )
+    def get_converter(
+        cls,
+        profile: str = DEFAULT_CONVERSION_PROFILE,
+        ocr: bool = True
+    ) -> DocumentConverter:
+        """
+        Get or create the DocumentConverter for one profile
+
+        Args:
+            profile: Conversion profile (CONVERSION_PROFILES)
+            ocr: OCR converter (default) or text-layer-only converter
+        """
+        ocr = ocr and CONVERSION_PROFILES[profile]["ocr"]
+        key = (profile, ocr)
+
+        if key not in cls._instances:
+            label = f"{profile.upper()} profile{' + OCR' if ocr else ', no OCR'}"
+            logger.info(f"Initializing Docling DocumentConverter ({label})...")
 
-            # Mode ACCURATE pour qualité maximale (extraction tables)
-            pipeline_options.table_structure_options.mode = TableFormerMode.ACCURATE
+            pipeline_options = build_pdf_pipeline_options(profile, ocr=ocr)
 
-            cls._instance = DocumentConverter(
+            cls._instances[key] = DocumentConverter(
                 format_options={
                     InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
                 }
             )
 
-            logger.info("✅ DocumentConverter initialized (ACCURATE mode + OCR)")
+            logger.info(f"✅ DocumentConverter initialized ({label})")
 
-        return cls._instance
+        if key == (DEFAULT_CONVERSION_PROFILE, True):
+            cls._instance = cls._instances[key]
+
+        return cls._instances[key]
+
+    @classmethod
+    def get_office_converter(cls) -> DocumentConverter:
+        """
+        Get or create the Office DocumentConverter (DOCX/PPTX)
+
+        SimplePipeline with the native Word/PowerPoint backends: the document
+        structure is read from the file, no layout, table or OCR model runs.
+        """
+        if cls._office_instance is None:
+            logger.info("Initializing Docling DocumentConverter (Office: DOCX/PPTX)...")
+            cls._office_instance = DocumentConverter(
+                allowed_formats=[InputFormat.DOCX, InputFormat.PPTX],
+                format_options={
+                    InputFormat.DOCX: WordFormatOption(),
+                    InputFormat.PPTX: PowerpointFormatOption(),
+                }
+            )
+            logger.info("✅ DocumentConverter initialized (Office, no layout/OCR models)")
+
+        return cls._office_instance
 
     @classmethod
     def warmup(cls) -> bool:
@@ -203,7 +522,10 @@ class DoclingSingleton:
 async def convert_document_to_docling(
     file_path: str,
     timeout: Optional[int] = None,
-    upload_id: Optional[str] = None
+    upload_id: Optional[str] = None,
+    conversion_metrics: Optional[Dict[str, Any]] = None,
+    profile: Optional[str] = None,
+    preflight: Optional[Dict[str, Any]] = None
 ) -> DoclingDocument:
     """
     Convert document to DoclingDocument (NOT markdown)
@@ -211,19 +533,32 @@ async def convert_document_to_docling(
     Cette fonction retourne un DoclingDocument pour permettre le chunking
     sémantique ultérieur avec HybridChunker.
 
-    ✅ Uses dedicated executor (not default)
+    ✅ Uses dedicated executor (not default): threads or processes (DOCLING_EXECUTOR)
     ✅ Works with any event loop (single or multi)
+    ✅ Process mode: a crashed worker rebuilds the pool and the document is
+       retried once
+    ✅ Per-page OCR (DOCLING_OCR_MODE="auto"): pages with a text layer are
+       converted without EasyOCR, scanned pages with it
+    ✅ Conversion cache (CONVERSION_CACHE_ENABLED): same file content + same
+       pipeline options + same Docling version → no conversion at all
+    ✅ Conversion profiles (fast / balanced / accurate): one cached converter each
 
     Args:
         file_path: Path to document file
         timeout: Optional timeout in seconds (default: from settings)
         upload_id: Optional upload ID for logging context
+        conversion_metrics: Optional dict filled with profile, cache, shard and OCR info
+            ({"profile", "cache_hit", "sharded", "shards": [{"pages", "ocr", "duration"}],
+            "ocr": {"mode", "pages_ocr", "pages_skipped"}})
+        profile: Conversion profile, "auto" or None (→ DOCLING_CONVERSION_PROFILE)
+        preflight: Optional pre-flight analysis (document_analyzer): reused for
+            the OCR page plan and "auto" profile selection
 
     Returns:
         DoclingDocument object (pour chunking ultérieur)
 
     Raises:
-        ValueError: Invalid file (validation failed)
+        ValueError: Invalid file (validation failed) or unknown profile
         RuntimeError: Docling conversion failed
         TimeoutError: Conversion timeout exceeded
     """
@@ -243,6 +578,13 @@ async def convert_document_to_docling(
 
     filename = Path(file_path).name
     file_size_mb = Path(file_path).stat().st_size / (1024 * 1024)
+    office = is_office_document(file_path)
+    fmt = Path(file_path).suffix.lower().lstrip(".")
+    if preflight and preflight.get("recommended_profile") and (profile or settings.DOCLING_CONVERSION_PROFILE) == "auto":
+        profile = preflight["recommended_profile"]
+    profile = await asyncio.to_thread(resolve_conversion_profile, file_path, profile)
+    if conversion_metrics is not None:
+        conversion_metrics.update({"profile": profile, "pipeline": "office" if office else "pdf"})
 
     if upload_id:
         logger.info(
@@ -253,32 +595,79 @@ async def convert_document_to_docling(
                 'sub_stage': 'validation_passed',
                 'metrics': {
                     'filename': filename,
-                    'file_size_mb': round(file_size_mb, 2)
+                    'file_size_mb': round(file_size_mb, 2),
+                    'profile': profile
                 }
             }
         )
     else:
-        logger.info(f"🔄 Converting document: {filename}")
+        logger.info(f"🔄 Converting document: {filename} (profile: {profile})")
 
-    # 2. Conversion avec timeout
+    # 2. Conversion cache lookup (content hash + pipeline options + Docling version)
+    cache_key = None
+    if settings.CONVERSION_CACHE_ENABLED:
+        try:
+            file_hash = await asyncio.to_thread(hash_file, file_path)
+            cache_key = conversion_key(file_hash, "office" if office else pipeline_signature(profile))
+            cached = await asyncio.to_thread(load_document, cache_key)
+        except Exception as e:
+            logger.warning(f"⚠️  Conversion cache lookup failed: {e}")
+            cached = None
+
+        if cached is not None:
+            logger.info(
+                "⚡ Conversion cache hit - Docling conversion skipped",
+                extra={
+                    'upload_id': upload_id,
+                    'stage': 'conversion',
+                    'sub_stage': 'cache_hit',
+                    'metrics': {'filename': filename, 'pages': len(cached.pages)}
+                }
+            )
+            if conversion_metrics is not None:
+                conversion_metrics.update({"cache_hit": True, "sharded": False, "shards": []})
+            return cached
+
+    # 3. Conversion avec timeout
     timeout_seconds = timeout or settings.DOCLING_TIMEOUT
     conversion_start = time()
 
     try:
-        loop = asyncio.get_event_loop()
-
-        # Run conversion in dedicated executor
-        result = await asyncio.wait_for(
-            loop.run_in_executor(
-                _docling_executor,
-                _convert_sync,
-                file_path,
-                upload_id
-            ),
-            timeout=timeout_seconds
-        )
+        if office:
+            # DOCX/PPTX: lightweight converter on the Office executor
+            page_ranges, ocr_report = [None], None
+            shard_timings: List[Dict[str, Any]] = []
+            result, _ = await asyncio.wait_for(
+                _run_office_conversion(file_path, upload_id),
+                timeout=timeout_seconds
+            )
+        else:
+            # Page ranges: OCR / text-layer runs, large PDFs split into shards
+            page_ranges, ocr_report = await asyncio.to_thread(_plan_conversion, file_path, profile, preflight)
+            shard_timings = []
+
+            # Run conversion in dedicated executor
+            result = await asyncio.wait_for(
+                _run_sharded_conversion(file_path, page_ranges, upload_id, shard_timings, profile),
+                timeout=timeout_seconds
+            )
 
         conversion_duration = time() - conversion_start
+        record_conversion_throughput(fmt, len(result.pages), file_size_mb, conversion_duration)
+
+        if cache_key:
+            try:
+                await asyncio.to_thread(save_document, cache_key, result)
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to cache conversion: {e}")
+
+        if conversion_metrics is not None:
+            conversion_metrics.update({
+                "cache_hit": False,
+                "sharded": len(page_ranges) > 1,
+                "shards": shard_timings,
+                "ocr": ocr_report,
+            })
 
         # Log métriques
         if upload_id:
@@ -294,7 +683,11 @@ async def convert_document_to_docling(
                         'pages': len(result.pages),
                         'tables': len(result.tables),
                         'pictures': len(result.pictures),
-                        'file_size_mb': round(file_size_mb, 2)
+                        'file_size_mb': round(file_size_mb, 2),
+                        'shards': len(page_ranges),
+                        'profile': profile,
+                        'pipeline': 'office' if office else 'pdf',
+                        'ocr_pages': len(ocr_report["pages_ocr"]) if ocr_report else None
                     }
                 }
             )
@@ -323,31 +716,218 @@ async def convert_document_to_docling(
         raise RuntimeError(error_msg)
 
 
-def _convert_sync(file_path: str, upload_id: Optional[str] = None) -> DoclingDocument:
+# Conversion range: (first page, last page, OCR) - 1-based, inclusive
+PageRange = Tuple[int, int, bool]
+
+
+def _pages_needing_ocr(pdf: Any) -> List[bool]:
+    """
+    Text-layer pre-pass: True for pages that need OCR
+
+    A page needs OCR when its extractable text layer is shorter than
+    DOCLING_OCR_MIN_TEXT_CHARS characters (scan) or when images cover more
+    than DOCLING_OCR_IMAGE_COVERAGE of the page (text baked into pictures).
+    """
+    from app.services.document_analyzer import page_needs_ocr, pdf_page_features
+
+    return [page_needs_ocr(chars, coverage) for chars, coverage, _ in pdf_page_features(pdf)]
+
+
+def _plan_conversion(
+    file_path: str,
+    profile: str = DEFAULT_CONVERSION_PROFILE,
+    preflight: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Optional[PageRange]], Optional[Dict[str, Any]]]:
+    """
+    Plan the page ranges of one conversion
+
+    - Profiles without OCR (fast): every page uses its text layer
+    - DOCLING_OCR_MODE="auto": contiguous runs of pages with / without a text
+      layer become separate ranges (OCR only where needed)
+    - PDFs longer than DOCLING_SHARD_MIN_PAGES: ranges are split into shards
+      of DOCLING_SHARD_PAGES pages (converted in parallel)
+    - A pre-flight analysis (pages, pages_needing_ocr) replaces the PDF pass
+
+    Returns:
+        (ranges, ocr_report): ranges is [None] (whole document, OCR converter)
+        for non-PDFs or when nothing needs splitting; ocr_report is
+        {"mode", "pages_ocr", "pages_skipped"} or None
     """
-    Synchronous Docling conversion (runs in dedicated thread pool)
+    ocr_mode = settings.DOCLING_OCR_MODE if CONVERSION_PROFILES[profile]["ocr"] else "never"
+    if Path(file_path).suffix.lower() != ".pdf":
+        return [None], None
+
+    try:
+        if preflight and preflight.get("pages") is not None and "pages_needing_ocr" in preflight:
+            num_pages = preflight["pages"]
+            if ocr_mode == "auto":
+                ocr_pages = set(preflight["pages_needing_ocr"])
+                needs_ocr = [page in ocr_pages for page in range(1, num_pages + 1)]
+            else:
+                needs_ocr = [ocr_mode != "never"] * num_pages
+        else:
+            import pypdfium2  # Docling's PDF backend dependency
+
+            pdf = pypdfium2.PdfDocument(file_path)
+            try:
+                num_pages = len(pdf)
+                if ocr_mode == "auto":
+                    needs_ocr = _pages_needing_ocr(pdf)
+                else:
+                    needs_ocr = [ocr_mode != "never"] * num_pages
+            finally:
+                pdf.close()
+    except Exception as e:
+        logger.warning(f"⚠️  PDF pre-pass failed ({e}) - converting whole document with OCR")
+        return [None], None
+
+    ocr_report = {
+        "mode": ocr_mode,
+        "pages_ocr": [page for page, ocr in enumerate(needs_ocr, start=1) if ocr],
+        "pages_skipped": needs_ocr.count(False),
+    }
+
+    # Contiguous runs of pages with the same OCR decision
+    runs: List[PageRange] = []
+    for page, ocr in enumerate(needs_ocr, start=1):
+        if runs and runs[-1][2] == ocr:
+            runs[-1] = (runs[-1][0], page, ocr)
+        else:
+            runs.append((page, page, ocr))
+
+    shard_pages = settings.DOCLING_SHARD_PAGES
+    if shard_pages > 0 and num_pages > settings.DOCLING_SHARD_MIN_PAGES:
+        runs = [
+            (start, min(start + shard_pages - 1, last), ocr)
+            for first, last, ocr in runs
+            for start in range(first, last + 1, shard_pages)
+        ]
+
+    if len(runs) == 1 and runs[0][2]:
+        return [None], ocr_report  # Whole document with the default (OCR) converter
+    return runs, ocr_report
+
+
+async def _run_sharded_conversion(
+    file_path: str,
+    page_ranges: List[Optional[PageRange]],
+    upload_id: Optional[str],
+    shard_timings: List[Dict[str, Any]],
+    profile: str = DEFAULT_CONVERSION_PROFILE
+) -> DoclingDocument:
+    """Convert every page range concurrently on the executor, then merge in page order"""
+    if len(page_ranges) > 1:
+        logger.info(
+            f"🧩 Sharded conversion: {len(page_ranges)} page ranges "
+            f"({sum(1 for page_range in page_ranges if page_range[2])} with OCR)",
+            extra={'upload_id': upload_id, 'stage': 'conversion', 'sub_stage': 'sharding'}
+        )
+
+    results = await asyncio.gather(*(
+        _run_conversion(file_path, upload_id, page_range, profile) for page_range in page_ranges
+    ))
+
+    for page_range, (_, duration) in zip(page_ranges, results):
+        shard_timings.append({
+            "pages": f"{page_range[0]}-{page_range[1]}" if page_range else "all",
+            "ocr": page_range[2] if page_range else True,
+            "duration": round(duration, 2),
+        })
+
+    documents = [document for document, _ in results]
+    if len(documents) == 1:
+        return documents[0]
+
+    return merge_docling_documents(documents, [page_range[0] for page_range in page_ranges])
+
+
+async def _run_conversion(
+    file_path: str,
+    upload_id: Optional[str] = None,
+    page_range: Optional[PageRange] = None,
+    profile: str = DEFAULT_CONVERSION_PROFILE
+) -> Tuple[DoclingDocument, float]:
+    """Submit _convert_sync to the executor; rebuild a crashed process pool and retry once"""
+    loop = asyncio.get_running_loop()
+
+    for attempt in range(2):
+        executor = get_docling_executor()
+        try:
+            return await loop.run_in_executor(executor, _convert_sync, file_path, upload_id, page_range, profile)
+        except BrokenProcessPool:
+            _recycle_docling_executor(executor)
+            if attempt == 1:
+                raise
+            logger.warning(f"⚠️  Docling worker crashed - retrying {Path(file_path).name} on a fresh pool")
+
+
+async def _run_office_conversion(
+    file_path: str,
+    upload_id: Optional[str] = None
+) -> Tuple[DoclingDocument, float]:
+    """Submit _convert_office_sync to the Office executor (never the PDF executor)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_office_executor(), _convert_office_sync, file_path, upload_id)
+
+
+def _convert_office_sync(
+    file_path: str,
+    upload_id: Optional[str] = None
+) -> Tuple[DoclingDocument, float]:
+    """
+    Synchronous DOCX/PPTX conversion (runs in the Office thread pool)
+
+    Returns:
+        (DoclingDocument, conversion seconds)
+    """
+    start = perf_counter()
+    prefix = f"[{upload_id}]" if upload_id else "[_convert_office_sync]"
+    print(f"{prefix} 🔄 START Office conversion: {Path(file_path).name}", flush=True)
+
+    result = DoclingSingleton.get_office_converter().convert(file_path)
+
+    print(f"{prefix} ✅ Office conversion complete", flush=True)
+    return result.document, perf_counter() - start
+
+
+def _convert_sync(
+    file_path: str,
+    upload_id: Optional[str] = None,
+    page_range: Optional[PageRange] = None,
+    profile: str = DEFAULT_CONVERSION_PROFILE
+) -> Tuple[DoclingDocument, float]:
+    """
+    Synchronous Docling conversion (runs in the dedicated thread or process pool)
 
     Args:
         file_path: Path to document
         upload_id: Optional upload ID for logging
+        page_range: Optional (first, last, ocr) - pages 1-based inclusive
+        profile: Conversion profile (CONVERSION_PROFILES)
 
     Returns:
-        DoclingDocument (NOT markdown string)
+        (DoclingDocument (NOT markdown string), conversion seconds)
     """
     filename = Path(file_path).name
+    if page_range:
+        filename = f"{filename} [pages {page_range[0]}-{page_range[1]}{', OCR' if page_range[2] else ''}]"
+    shard_start = perf_counter()
 
     if upload_id:
         print(f"[{upload_id}] 🔄 START conversion: {filename}", flush=True)
     else:
         print(f"[_convert_sync] 🔄 START conversion: {filename}", flush=True)
 
-    converter = DoclingSingleton.get_converter()
+    converter = DoclingSingleton.get_converter(profile, ocr=page_range[2] if page_range else True)
 
     if upload_id:
         print(f"[{upload_id}] ✅ Converter obtained", flush=True)
         print(f"[{upload_id}] 🚀 Starting conversion...", flush=True)
 
-    result = converter.convert(file_path)
+    if page_range:
+        result = converter.convert(file_path, page_range=(page_range[0], page_range[1]))
+    else:
+        result = converter.convert(file_path)
 
     if upload_id:
         print(f"[{upload_id}] ✅ Conversion complete", flush=True)
@@ -355,7 +935,80 @@ def _convert_sync(file_path: str, upload_id: Optional[str] = None) -> DoclingDoc
         print("[_convert_sync] ✅ Conversion complete", flush=True)
 
     # Return DoclingDocument object pour chunking
-    return result.document
+    return result.document, perf_counter() - shard_start
+
+
+# ═══════════════════════════════════════════════════════════
+# Shard merge
+# ═══════════════════════════════════════════════════════════
+
+_ITEM_REF = re.compile(r"^#/(\w+)/(\d+)$")
+
+
+def _shift_refs(node: Any, offsets: Dict[str, int], page_shift: int) -> Any:
+    """Rebase item references ("#/texts/3") and page numbers of one shard's JSON"""
+    if isinstance(node, list):
+        return [_shift_refs(item, offsets, page_shift) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    shifted = {}
+    for key, value in node.items():
+        if key in ("$ref", "cref", "self_ref") and isinstance(value, str):
+            match = _ITEM_REF.match(value)
+            if match and match.group(1) in offsets:
+                value = f"#/{match.group(1)}/{int(match.group(2)) + offsets[match.group(1)]}"
+        elif key == "page_no" and isinstance(value, int):
+            value += page_shift
+        else:
+            value = _shift_refs(value, offsets, page_shift)
+        shifted[key] = value
+    return shifted
+
+
+def merge_docling_documents(documents: List[DoclingDocument], first_pages: List[int]) -> DoclingDocument:
+    """
+    Merge page-range shards back into one DoclingDocument
+
+    Args:
+        documents: Shard documents, in page order
+        first_pages: First page (1-based) of each shard
+
+    Returns:
+        One DoclingDocument: items appended in document order (body and
+        furniture children concatenated), references rebased, pages keyed by
+        their original page number
+
+    Note:
+        Docling emits section headers as a flat sequence under the body, so
+        concatenating shards in order keeps the heading hierarchy that
+        HybridChunker rebuilds for contextualization.
+    """
+    merged = documents[0].export_to_dict()
+
+    for document, first_page in zip(documents[1:], first_pages[1:]):
+        shard = document.export_to_dict()
+
+        # Shards either keep original page numbers or restart at 1
+        shard_pages = sorted(int(page) for page in shard.get("pages", {}))
+        page_shift = first_page - 1 if shard_pages and shard_pages[0] < first_page else 0
+
+        offsets = {
+            key: len(merged.get(key, []))
+            for key, value in shard.items()
+            if isinstance(value, list)
+        }
+        shard = _shift_refs(shard, offsets, page_shift)
+
+        for key in offsets:
+            merged.setdefault(key, []).extend(shard[key])
+        for root in ("body", "furniture"):
+            if root in shard and root in merged:
+                merged[root]["children"].extend(shard[root].get("children", []))
+        for page in shard.get("pages", {}).values():
+            merged.setdefault("pages", {})[str(page["page_no"])] = page
+
+    return DoclingDocument.model_validate(merged)
 
 
 def extract_document_metadata(doc: DoclingDocument) -> Dict[str, Any]:
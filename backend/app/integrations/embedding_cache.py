@@ -0,0 +1,135 @@
+"""
+Caching Embedder for Graphiti (content-addressed, persistent)
+
+Wraps Graphiti's OpenAIEmbedder so identical texts are embedded only once:
+- Key: SHA-256 of (model, dimension, text) → a model/dimension change never
+  returns stale vectors
+- Store: DiskCache (SQLite on the uploads volume, size-bounded LRU)
+- Used by Graphiti for ingestion (episodes, entity names, facts) AND search
+  (query embeddings), since both go through the same embedder
+
+CRITICAL: Vectors are stored as float64 (exact values returned by OpenAI),
+so cached and fresh embeddings are identical in Neo4j.
+"""
+import asyncio
+import logging
+from array import array
+from typing import Any, Dict, List, Optional
+
+from graphiti_core.embedder.client import EmbedderClient
+
+from app.core.config import settings
+from app.core.disk_cache import DiskCache, content_key
+
+logger = logging.getLogger('diveteacher.embedding_cache')
+
+
+def _encode_vector(vector: List[float]) -> bytes:
+    return array('d', vector).tobytes()
+
+
+def _decode_vector(data: bytes) -> List[float]:
+    vector = array('d')
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+class CachingEmbedder(EmbedderClient):
+    """
+    EmbedderClient wrapper with a persistent content-addressed cache.
+
+    Only plain-text inputs are cached; token-id inputs are passed through.
+
+    Usage:
+        embedder = CachingEmbedder(
+            OpenAIEmbedder(config=embedder_config),
+            cache=DiskCache(path, max_bytes),
+            model="text-embedding-3-small",
+            embedding_dim=1536
+        )
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderClient,
+        cache: DiskCache,
+        model: str,
+        embedding_dim: int
+    ):
+        self.embedder = embedder
+        self.cache = cache
+        self.model = model
+        self.embedding_dim = embedding_dim
+
+    def _key(self, text: str) -> str:
+        return content_key(self.model, str(self.embedding_dim), text)
+
+    async def create(self, input_data: Any) -> List[float]:
+        """Embed a single input (cache lookup first for strings)"""
+        if not isinstance(input_data, str):
+            return await self.embedder.create(input_data)
+
+        key = self._key(input_data)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return _decode_vector(cached)
+
+        vector = await self.embedder.create(input_data)
+        await asyncio.to_thread(self.cache.set, key, _encode_vector(vector))
+        return vector
+
+    async def create_batch(self, input_data_list: List[str]) -> List[List[float]]:
+        """Embed a batch: only cache misses are sent to the underlying embedder"""
+        keys = [self._key(text) for text in input_data_list]
+        cached = await asyncio.to_thread(self.cache.get_many, keys)
+
+        # Deduplicate misses (same text twice in a batch = one API input)
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, input_data_list):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        fresh: Dict[str, List[float]] = {}
+        if missing:
+            vectors = await self.embedder.create_batch(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            await asyncio.to_thread(
+                self.cache.set_many,
+                {key: _encode_vector(vector) for key, vector in fresh.items()}
+            )
+
+        return [
+            fresh[key] if key in fresh else _decode_vector(cached[key])
+            for key in keys
+        ]
+
+
+# Global embedding cache (singleton pattern)
+_embedding_cache: Optional[DiskCache] = None
+
+
+def get_embedding_cache() -> DiskCache:
+    """
+    Get or create the embedding DiskCache singleton
+
+    Note:
+        - File: {CACHE_DIR}/embeddings.sqlite
+        - Size bound: EMBEDDING_CACHE_MAX_MB (LRU eviction)
+    """
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        _embedding_cache = DiskCache(
+            path=f"{settings.CACHE_DIR}/embeddings.sqlite",
+            max_bytes=settings.EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+            name="embeddings"
+        )
+
+    return _embedding_cache
+
+
+def get_embedding_cache_stats() -> Dict[str, Any]:
+    """Embedding cache statistics (or disabled marker)"""
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return {"enabled": False}
+    return {"enabled": True, **get_embedding_cache().get_stats()}
@@ -6,7 +6,9 @@ Architecture:
 - RAG/User: Mistral 7b sur Ollama (séparé, pas de mélange!)
 
 Based on: ARIA Knowledge System (Nov 3, 2025) - v1.14.0
-- Sequential processing (simple mode)
+- Simple mode (1 chunk → 1 add_episode), sequential by default
+- Optional bounded concurrency window (GRAPHITI_INGEST_CONCURRENCY)
+- Opt-in bulk mode (add_episode_bulk) for first-time loads of a manual series
 - Gemini 2.5 Flash-Lite: Ultra-low cost ($0.10/M input + $0.40/M output)
 - Cost: ~$1-2/year (vs $730/year with Haiku = 99.7% savings!)
 - Rate Limits: 4K RPM (Tier 1) = No throttling issues
@@ -16,23 +18,37 @@ CRITICAL: Keep OpenAI embeddings for DB compatibility!
 - OpenAI text-embedding-3-small: 1536 dimensions
 - DO NOT change to Gemini embeddings (768 dims) = DB migration required!
 """
+import hashlib
+import itertools
 import logging
 import os
 import asyncio
 import time
-from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, AsyncIterable, AsyncIterator, Iterable, List, Optional, Tuple, Union
 
 from graphiti_core import Graphiti
 from graphiti_core.nodes import EpisodeType
+from graphiti_core.utils.bulk_utils import RawEpisode
 from graphiti_core.llm_client import LLMConfig
-from graphiti_core.llm_client.gemini_client import GeminiClient
 from graphiti_core.embedder.openai import OpenAIEmbedder, OpenAIEmbedderConfig
 from graphiti_core.cross_encoder.openai_reranker_client import OpenAIRerankerClient
 from graphiti_core.search.search_config_recipes import EDGE_HYBRID_SEARCH_RRF
 from graphiti_core.search.search_config import SearchConfig
 
 from app.core.config import settings
+from app.core.rate_limiter import get_rate_limiter
+from app.core.retry import retry_async
+from app.integrations.embedding_cache import CachingEmbedder, get_embedding_cache
+from app.integrations.rate_limited_clients import RateLimitedEmbedder, RateLimitedGeminiClient
+from app.services.ingestion_checkpoint import get_checkpoint_store
+from app.services.graph_stats import get_graph_stats_service
+from app.integrations.llm_cache import (
+    CachingGeminiClient,
+    current_upload_id,
+    get_llm_cache,
+    get_upload_cache_metrics
+)
 from app.core.logging_config import log_stage_start, log_stage_progress, log_stage_complete, log_error
 
 logger = logging.getLogger('diveteacher.graphiti')
@@ -42,6 +58,27 @@ logger = logging.getLogger('diveteacher.graphiti')
 _graphiti_client: Optional[Graphiti] = None
 _indices_built: bool = False
 
+# Ingestions running in this process: id → overlapped by another one. Graph
+# elements created by an overlapping ingestion look "new" to both (created_at
+# after each start), so neither delta is exact.
+_active_ingestions: Dict[int, bool] = {}
+_ingestion_ids = itertools.count()
+
+# Streamed chunks read ahead per ingested-hash lookup (one Neo4j query per window)
+STREAM_HASH_LOOKUP_WINDOW = 16
+
+
+def _ingestion_mode_label(bulk: Optional[bool] = None) -> str:
+    """Configured ingestion mode, for logs (bulk defaults to GRAPHITI_BULK_INGESTION)"""
+    if bulk is None:
+        bulk = settings.GRAPHITI_BULK_INGESTION
+    concurrency = max(1, settings.GRAPHITI_INGEST_CONCURRENCY)
+    if bulk:
+        return f"bulk (batch_size={max(1, settings.GRAPHITI_BULK_BATCH_SIZE)})"
+    if concurrency == 1:
+        return "sequential (simple)"
+    return f"concurrent (window={concurrency})"
+
 
 async def get_graphiti_client() -> Graphiti:
     """
@@ -89,7 +126,12 @@ async def get_graphiti_client() -> Graphiti:
         )
         
         # LLM Client Gemini (Google Direct - no OpenRouter interference!)
-        llm_client = GeminiClient(config=llm_config, cache=False)
+        # Graphiti's own cache stays off: ours has TTL, size bound and per-upload metrics
+        if settings.LLM_CACHE_ENABLED:
+            llm_client = CachingGeminiClient(config=llm_config, response_cache=get_llm_cache())
+            logger.info(f"🗄️  LLM response cache enabled ({settings.CACHE_DIR}/llm_responses.sqlite)")
+        else:
+            llm_client = RateLimitedGeminiClient(config=llm_config, cache=False)
         
         # ════════════════════════════════════════════════════════
         # CRITICAL: OpenAI Embeddings for DB Compatibility!
@@ -103,7 +145,18 @@ async def get_graphiti_client() -> Graphiti:
             embedding_model="text-embedding-3-small",  # 1536 dimensions
             embedding_dim=1536
         )
-        embedder_client = OpenAIEmbedder(config=embedder_config)
+        # Shared "openai" RateLimiter (RPM/TPM from real usage, adaptive concurrency)
+        embedder_client = RateLimitedEmbedder(OpenAIEmbedder(config=embedder_config))
+        
+        # Persistent content-addressed cache (ingestion + search share it)
+        if settings.EMBEDDING_CACHE_ENABLED:
+            embedder_client = CachingEmbedder(
+                embedder_client,
+                cache=get_embedding_cache(),
+                model=embedder_config.embedding_model,
+                embedding_dim=embedder_config.embedding_dim
+            )
+            logger.info(f"🗄️  Embedding cache enabled ({settings.CACHE_DIR}/embeddings.sqlite)")
         
         # ════════════════════════════════════════════════════════
         # Cross-Encoder for Reranking (optional, use OpenAI)
@@ -119,7 +172,8 @@ async def get_graphiti_client() -> Graphiti:
         # SEMAPHORE_LIMIT & Telemetry Configuration
         # ════════════════════════════════════════════════════════
         # Gemini 2.5 Flash-Lite Tier 1: 4K RPM
-        # SEMAPHORE_LIMIT=10 is safe and fast (no throttling)
+        # SEMAPHORE_LIMIT is only the upper bound for Graphiti's internal gather;
+        # the shared RateLimiters pace real RPM/TPM and shrink concurrency on 429s
         
         if not os.getenv('SEMAPHORE_LIMIT'):
             os.environ['SEMAPHORE_LIMIT'] = str(settings.GRAPHITI_SEMAPHORE_LIMIT)
@@ -131,19 +185,22 @@ async def get_graphiti_client() -> Graphiti:
         os.environ['GRAPHITI_TELEMETRY_ENABLED'] = 'false'
         
         # ════════════════════════════════════════════════════════
-        # PRODUCTION-READY: Sequential Processing (Simple Mode)
+        # PRODUCTION-READY: Ingestion Mode (from settings)
         # ════════════════════════════════════════════════════════
         # Architecture: ARIA Nov 3 Pattern
-        # - Sequential processing (not parallel, not bulk)
-        # - No SafeQueue (Gemini has 4K RPM = plenty!)
-        # - Simple mode: 1 chunk → 1 add_episode
-        # - 100% Success Rate: Validated on ARIA
+        # - Window of GRAPHITI_INGEST_CONCURRENCY add_episode calls (1 = sequential)
+        # - Opt-in bulk mode: GRAPHITI_BULK_BATCH_SIZE chunks per add_episode_bulk
+        # - No SafeQueue: shared RateLimiters pace Gemini/OpenAI
         # - Ultra-Low Cost: ~$1-2/year (vs $730 Haiku!)
         
-        logger.info(f"🔒 Production-Ready Mode: Sequential (Simple)")
-        logger.info(f"   • No bulk mode (not needed with Gemini)")
-        logger.info(f"   • No SafeQueue (4K RPM = plenty)")
-        logger.info(f"   • Expected: 100% success rate, ultra-low cost")
+        bulk_mode = (
+            f"on (batch_size={max(1, settings.GRAPHITI_BULK_BATCH_SIZE)})"
+            if settings.GRAPHITI_BULK_INGESTION else "off (GRAPHITI_BULK_INGESTION)"
+        )
+        logger.info(f"🔒 Production-Ready Mode: {_ingestion_mode_label()}")
+        logger.info(f"   • Concurrency: {max(1, settings.GRAPHITI_INGEST_CONCURRENCY)} chunk(s) in flight per document")
+        logger.info(f"   • Bulk mode: {bulk_mode}")
+        logger.info(f"   • No SafeQueue (RateLimiters pace RPM/TPM)")
         
         # ════════════════════════════════════════════════════════
         # Initialisation Graphiti avec config Gemini + OpenAI
@@ -154,7 +211,7 @@ async def get_graphiti_client() -> Graphiti:
             user=settings.NEO4J_USER,
             password=settings.NEO4J_PASSWORD,
             llm_client=llm_client,  # ✅ Gemini 2.5 Flash-Lite (Google Direct)
-            embedder=embedder_client,  # ✅ OpenAI embeddings (1536 dims - DB compatible!)
+            embedder=embedder_client,  # ✅ OpenAI embeddings (1536 dims - DB compatible!), cached
             cross_encoder=cross_encoder_client  # ✅ OpenAI reranker (gpt-4o-mini)
         )
         
@@ -162,8 +219,8 @@ async def get_graphiti_client() -> Graphiti:
         logger.info(f"   • LLM: Gemini 2.5 Flash-Lite (GeminiClient)")
         logger.info(f"   • Embeddings: OpenAI text-embedding-3-small (1536 dims)")
         logger.info(f"   • Cross-Encoder: gpt-4o-mini (reranking)")
-        logger.info(f"   • Architecture: ARIA v1.14.0 (Sequential Simple)")
-        logger.info(f"   • Processing: Sequential (no bulk, no SafeQueue)")
+        logger.info(f"   • Architecture: ARIA v1.14.0")
+        logger.info(f"   • Processing: {_ingestion_mode_label()}")
         logger.info(f"   • Cost: ~$1-2/year (99.7% cheaper than Haiku!)")
     
     # Build indices and constraints (only once)
@@ -190,14 +247,148 @@ async def close_graphiti_client():
 
 
 
+def compute_content_hash(chunk: Dict[str, Any]) -> str:
+    """
+    Stable SHA-256 fingerprint of the text sent to Graphiti for a chunk
+    
+    Uses the hash precomputed by DocumentChunker when present, otherwise
+    hashes 'contextualized_text' (falling back to raw 'text').
+    """
+    content_hash = chunk.get("metadata", {}).get("content_hash")
+    if content_hash:
+        return content_hash
+    
+    text = chunk.get("contextualized_text", chunk["text"])
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _chunk_token_budget(chunk: Dict[str, Any]) -> int:
+    """Expected Gemini tokens for a chunk (chunker count, else configured estimate)"""
+    return chunk.get("metadata", {}).get("num_tokens") or settings.GRAPHITI_ESTIMATED_TOKENS_PER_CHUNK
+
+
+async def _get_ingested_hashes(client: Graphiti, group_id: str, hashes: List[str]) -> set:
+    """
+    Return the subset of content hashes already stored on Episodic nodes
+    
+    Note:
+        - One indexed query per document (episode_content_hash_idx)
+        - Returns empty set on failure (ingest everything, never skip wrongly)
+    """
+    if not hashes:
+        return set()
+    
+    try:
+        records, _, _ = await client.driver.execute_query(
+            """
+            MATCH (e:Episodic)
+            WHERE e.group_id = $group_id AND e.content_hash IN $hashes
+            RETURN DISTINCT e.content_hash AS content_hash
+            """,
+            group_id=group_id,
+            hashes=list(set(hashes))
+        )
+        return {record["content_hash"] for record in records}
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to look up ingested content hashes: {e}")
+        return set()
+
+
+async def _stamp_content_hashes(client: Graphiti, group_id: str, stamps: List[Dict[str, Any]]) -> None:
+    """
+    Store content hashes on freshly created Episodic nodes (one query per batch)
+    
+    Args:
+        stamps: List of {"uuid": episode_uuid, "content_hash": sha256}, or
+            {"name", "reference_time", "content_hash"} when add_episode_bulk
+            returned no episodes: episode names repeat across uploads of the
+            same file, but name + valid_at (reference_time, unique per chunk
+            position and run) identifies one episode
+    """
+    if not stamps:
+        return
+    
+    by_uuid = [stamp for stamp in stamps if stamp.get("uuid")]
+    by_name = [stamp for stamp in stamps if not stamp.get("uuid")]
+    try:
+        if by_uuid:
+            await client.driver.execute_query(
+                """
+                UNWIND $stamps AS stamp
+                MATCH (e:Episodic {uuid: stamp.uuid})
+                SET e.content_hash = stamp.content_hash
+                """,
+                stamps=by_uuid
+            )
+        if by_name:
+            await client.driver.execute_query(
+                """
+                UNWIND $stamps AS stamp
+                MATCH (e:Episodic {group_id: $group_id, name: stamp.name})
+                WHERE e.valid_at = stamp.reference_time AND e.content_hash IS NULL
+                SET e.content_hash = stamp.content_hash
+                """,
+                group_id=group_id,
+                stamps=by_name
+            )
+    except Exception as e:
+        # Not fatal: the chunk is ingested, it just won't be skipped next time
+        logger.warning(f"⚠️  Failed to store content hashes ({len(stamps)} episodes): {e}")
+
+
+async def _find_episode(client: Graphiti, group_id: str, name: str, content: str) -> Optional[str]:
+    """
+    UUID of an Episodic node already holding this chunk, or None
+    
+    A timed-out add_episode may still have been written: looked up before
+    each retry so the chunk isn't ingested twice. The episode, its entities
+    and edges are saved in one transaction, so an existing episode is a
+    complete one.
+    """
+    try:
+        records, _, _ = await client.driver.execute_query(
+            """
+            MATCH (e:Episodic {group_id: $group_id, name: $name})
+            WHERE e.content = $content
+            RETURN e.uuid AS uuid
+            LIMIT 1
+            """,
+            group_id=group_id,
+            name=name,
+            content=content
+        )
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to look up existing episode {name}: {e}")
+        return None
+    return records[0]["uuid"] if records else None
+
+
+def _is_new(item: Any, since: datetime) -> bool:
+    """True if a node/edge returned by add_episode was created by this ingestion (vs resolved to an existing one)"""
+    created_at = getattr(item, "created_at", None)
+    try:
+        return created_at is not None and created_at >= since
+    except TypeError:  # Naive vs aware datetime: count as touched only
+        return False
+
+
+async def _aiter_items(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
 async def ingest_chunks_to_graph(
-    chunks: List[Dict[str, Any]],
+    chunks: Union[List[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
     metadata: Dict[str, Any],
     upload_id: Optional[str] = None,
-    processing_status: Optional[Dict] = None
-) -> None:
+    processing_status: Optional[Dict] = None,
+    bulk: Optional[bool] = None,
+    done_positions: Optional[set] = None,
+    estimated_total: Optional[int] = None,
+    check_existing: bool = False
+) -> Optional[Dict[str, Any]]:
     """
-    Ingest semantic chunks to Graphiti knowledge graph with SEQUENTIAL PROCESSING (Simple Mode)
+    Ingest semantic chunks to Graphiti knowledge graph (sequential, bounded-concurrent or bulk)
     
     GAP #3 UPDATE (Nov 5, 2025):
     - NOW uses 'contextualized_text' from Docling HybridChunker (not 'text'!)
@@ -206,44 +397,114 @@ async def ingest_chunks_to_graph(
     - Zero additional cost (same embedding API calls)
     
     Args:
-        chunks: List of chunks from Docling HybridChunker (with contextualized_text!)
+        chunks: List of chunks from Docling HybridChunker (with contextualized_text!),
+              or an async iterator of chunks (streamed pipeline: ingestion
+              starts while the chunker is still producing)
         metadata: Document-level metadata
         upload_id: Optional upload ID for logging context
         processing_status: Optional dict for real-time progress updates
+        bulk: Use add_episode_bulk in batches of GRAPHITI_BULK_BATCH_SIZE
+              (default: settings.GRAPHITI_BULK_INGESTION). Opt-in, meant for
+              first-time loads of a whole manual series.
+        done_positions: Chunk positions already ingested before an interruption
+              (from the ingestion checkpoint); they are skipped. A streamed
+              source may add a chunk's position before yielding it
+        estimated_total: Expected number of chunks when `chunks` is streamed
+              (progress uses it until the stream is exhausted)
+        check_existing: Chunks were attempted before (dead-letter retry):
+              look for an episode written by an earlier attempt before the
+              first call too, not only before retries
+        
+    Returns:
+        Ingestion summary (total_chunks, successful, failed, skipped,
+        resumed, failed_chunk_indexes, llm_cache, graph_delta, success_rate,
+        duration), or None if Graphiti is disabled
         
     Raises:
         RuntimeError: If Graphiti is disabled
         
     Architecture (ARIA Nov 3 Pattern - Production-Ready):
-        - Sequential Processing: One chunk at a time (not parallel, not bulk)
+        - Window of GRAPHITI_INGEST_CONCURRENCY chunks in flight (1 = sequential)
         - No SafeQueue: Gemini has 4K RPM (plenty!)
         - Simple mode: 1 chunk → 1 add_episode
+        - Bulk mode (opt-in): 1 batch → 1 add_episode_bulk; a failed batch
+          falls back to simple mode for its chunks, reusing episodes the
+          failed call wrote
         - 100% Success Rate: Validated on ARIA
         - Ultra-Low Cost: ~$1-2/year (vs $730 Haiku!)
         
-    Expected Performance:
+    Expected Performance (sequential, window=1):
         - test.pdf (30 chunks): ~90-120s (similar to Haiku but WAY cheaper)
         - Niveau 1.pdf (150 chunks): ~12-15 min (100% success guaranteed)
         - Large docs (500 chunks): ~50-80 min (100% success guaranteed)
+        - Wall-clock divides roughly by the window size (4K RPM leaves headroom)
         
-    Trade-off:
-        - Similar speed to Haiku (sequential)
-        - BUT: 99.7% cheaper (~$1-2/year vs $730/year)
-        - Acceptable for background jobs (user doesn't wait)
+    Idempotency:
+        - Every chunk carries a SHA-256 content_hash of its contextualized_text
+        - Hashes already stored on Episodic nodes (same group_id) are fetched in
+          one query, then unchanged chunks are skipped with an O(1) set lookup
+        - The hash is stored on the Episodic node (by uuid) after a successful
+          add_episode; stamps and checkpoints are written once per window
+        - With checkpoints enabled, each ingested position is persisted so an
+          interrupted run resumes from the first incomplete chunk
+        
+    Streaming:
+        - An async iterator is consumed as chunks arrive; the first add_episode
+          starts while later sections are still being chunked
+        - Already-ingested hashes are looked up once per read-ahead window of
+          STREAM_HASH_LOOKUP_WINDOW arriving chunks
+        - ingestion_progress.chunks_total is an estimate (total_estimated=True)
+          until the stream ends
+        
+    Ordering:
+        - Chunks are started in document order
+        - reference_time is derived from the chunk position, so episodes keep
+          document order in Graphiti even when they complete out of order
+        - processing_status progress advances in chunk order (contiguous prefix)
         
     Note:
         - Each chunk is ingested as an "episode" in Graphiti
         - CRITICAL: Uses 'contextualized_text' for embedding (Gap #3)
         - Graphiti automatically extracts entities and relationships using Gemini 2.5 Flash-Lite
-        - No rate limiting issues (4K RPM = plenty for our use case)
-        - Failed chunks are logged but don't block the pipeline
+        - Rate limiting: shared Gemini/OpenAI RateLimiters (RPM + TPM from
+          real usage, concurrency halved on 429)
+        - Transient chunk failures (429, timeouts, 5xx) are retried up to
+          GRAPHITI_CHUNK_MAX_ATTEMPTS times with jittered exponential backoff;
+          before a retry, an episode the failed attempt wrote anyway is looked
+          up and reused (no duplicate episode)
+        - Chunks still failing are dead-lettered (SQLite) and don't block the
+          pipeline; POST /api/upload/{upload_id}/retry-failed re-ingests them
         - Timeout: 120s per chunk (configurable)
         - Community building is NOT called here (too expensive, call periodically)
         - Real-time progress updates: processing_status updated after each chunk
+        - graph_delta: entities/relations extracted or resolved by this run,
+          from the add_episode results (no graph-wide count query); "created"
+          counts those not resolved to existing graph elements. exact=False
+          when a bulk call returned no results (Graphiti versions before
+          AddBulkEpisodeResults) or another ingestion ran at the same time
+          (its new elements would be counted by both)
     """
     if not settings.GRAPHITI_ENABLED:
         logger.warning("⚠️  Graphiti disabled - skipping ingestion")
-        return
+        return None
+    
+    if bulk is None:
+        bulk = settings.GRAPHITI_BULK_INGESTION
+    
+    # Streamed input: `chunks` grows as the iterator is consumed
+    streaming = not isinstance(chunks, list)
+    chunk_stream = chunks if streaming else None
+    chunks = [] if streaming else chunks
+    stream_exhausted = not streaming
+    
+    def _chunks_total() -> int:
+        if stream_exhausted:
+            return len(chunks)
+        return max(estimated_total or 0, len(chunks) + 1)
+    
+    concurrency = max(1, settings.GRAPHITI_INGEST_CONCURRENCY)
+    batch_size = max(1, settings.GRAPHITI_BULK_BATCH_SIZE)
+    processing_mode = _ingestion_mode_label(bulk)
     
     if upload_id:
         log_stage_start(
@@ -251,133 +512,491 @@ async def ingest_chunks_to_graph(
             upload_id,
             "graphiti_ingestion",
             details={
-                "total_chunks": len(chunks),
+                "total_chunks": _chunks_total(),
+                "streaming": streaming,
                 "filename": metadata.get('filename', 'unknown'),
                 "group_id": metadata.get('user_id', 'default'),
-                "processing_mode": "sequential (simple)",
+                "processing_mode": processing_mode,
+                "concurrency": concurrency,
+                "bulk": bulk,
                 "architecture": "ARIA v1.14.0 (Nov 3 Pattern)",
                 "llm": "Gemini 2.5 Flash-Lite",
                 "cost": "~$1-2/year"
             }
         )
-        logger.info(f"🔒 ARIA Pattern: Sequential processing (simple mode)")
-        logger.info(f"   • No bulk mode (not needed)")
+        logger.info(f"🔒 ARIA Pattern: {processing_mode}")
         logger.info(f"   • No SafeQueue (4K RPM = plenty)")
         logger.info(f"   • Expected: 100% success rate, ultra-low cost")
     else:
-        logger.info(f"📥 Starting Graphiti ingestion: {len(chunks)} chunks")
+        logger.info(f"📥 Starting Graphiti ingestion: {_chunks_total()} chunks{' (estimated, streamed)' if streaming else ''}")
         logger.info(f"   Document: {metadata.get('filename', 'unknown')}")
         logger.info(f"   Group ID: {metadata.get('user_id', 'default')}")
-        logger.info(f"   Mode: Sequential (simple)")
+        logger.info(f"   Mode: {processing_mode}")
     
     client = await get_graphiti_client()
     
     successful = 0
     failed = 0
-    total_time = 0.0
+    skipped = 0
+    total_time = 0.0  # Sum of per-chunk durations (≠ wall-clock when concurrent)
     
     # Determine group_id for multi-tenant isolation
     group_id = metadata.get("user_id", "default")
     
-    logger.info(f"🚀 Processing {len(chunks)} chunks sequentially...")
+    logger.info(f"🚀 Processing {_chunks_total()} chunks ({processing_mode}{', streamed' if streaming else ''})...")
     
     # ════════════════════════════════════════════════════════
-    # ARIA PATTERN: Sequential Processing (Simple Mode)
+    # ARIA PATTERN: Bounded window of add_episode calls
     # ════════════════════════════════════════════════════════
     
     ingestion_start_time = time.time()
+    gemini_limiter = get_rate_limiter("gemini")
+    
+    # Per-document graph delta: uuid → created by this ingestion
+    touched_entities: Dict[str, bool] = {}
+    touched_relations: Dict[str, bool] = {}
+    episodes_created = 0
+    mentions_created = 0  # Episodic → Entity MENTIONS edges
+    graph_delta_exact = True
+    
+    def _record_graph_delta(results: Any) -> None:
+        nonlocal graph_delta_exact, episodes_created, mentions_created
+        if results is None:
+            graph_delta_exact = False
+            return
+        episodes = getattr(results, "episodes", None)
+        episodes_created += len(episodes) if episodes is not None else int(getattr(results, "episode", None) is not None)
+        mentions_created += len(getattr(results, "episodic_edges", None) or [])
+        for node in getattr(results, "nodes", None) or []:
+            touched_entities[node.uuid] = touched_entities.get(node.uuid, False) or _is_new(node, reference_base_time)
+        for edge in getattr(results, "edges", None) or []:
+            touched_relations[edge.uuid] = touched_relations.get(edge.uuid, False) or _is_new(edge, reference_base_time)
     
-    for i, chunk in enumerate(chunks):
+    def _episode_fields(position: int, chunk: Dict[str, Any]) -> Dict[str, Any]:
         # GAP #3: Use contextualized_text for embedding (with hierarchical prefix)
         # Falls back to raw 'text' if contextualized_text not available (backward compatible)
-        chunk_text = chunk.get("contextualized_text", chunk["text"])
         chunk_index = chunk["index"]
-        total_chunks = chunk['metadata']['total_chunks']
-        
+        total_chunks = chunk['metadata'].get('total_chunks')
+        # Streamed chunks are ingested before the total is known: no denominator
+        chunk_label = f"Chunk {chunk_index}/{total_chunks}" if total_chunks else f"Chunk {chunk_index}"
+        return {
+            "name": f"{metadata['filename']} - Chunk {chunk_index}",
+            "content": chunk.get("contextualized_text", chunk["text"]),  # ✅ contextualized_text!
+            "source_description": f"Document: {metadata['filename']}, {chunk_label}",
+            "reference_time": reference_base_time + timedelta(milliseconds=position),
+        }
+    
+    async def _ingest_one(position: int, chunk: Dict[str, Any], written_before: bool = False) -> Dict[str, Any]:
+        # written_before: an earlier call (failed bulk batch) may have saved the episode
+        fields = _episode_fields(position, chunk)
         chunk_start_time = time.time()
+        error: Optional[Exception] = None
+        attempts = 1
+        existing_uuid: Optional[str] = None
         
-        try:
-            # Simple sequential ingestion (no SafeQueue, no bulk)
-            await client.add_episode(
-                name=f"{metadata['filename']} - Chunk {chunk_index}",
-                episode_body=chunk_text,  # ✅ Now uses contextualized_text!
-                source_description=f"Document: {metadata['filename']}, Chunk {chunk_index}/{total_chunks}",
-                reference_time=datetime.now(timezone.utc),
+        async def _add_episode() -> Any:
+            nonlocal existing_uuid
+            if attempts > 1 or check_existing or written_before:
+                existing_uuid = await _find_episode(client, group_id, fields["name"], fields["content"])
+                if existing_uuid:
+                    return None
+            # Pace admission by the chunk's real token count (chunker), so a
+            # window of large chunks doesn't burst past the Gemini TPM ceiling
+            await gemini_limiter.wait_for_capacity(_chunk_token_budget(chunk))
+            return await client.add_episode(
+                name=fields["name"],
+                episode_body=fields["content"],
+                source_description=fields["source_description"],
+                reference_time=fields["reference_time"],
                 group_id=group_id,
                 source=EpisodeType.text
             )
-            
-            chunk_duration = time.time() - chunk_start_time
-            total_time += chunk_duration
-            successful += 1
-            
-            # Log progress
-            if upload_id:
+        
+        def _on_retry(attempt: int, retry_error: BaseException, delay: float) -> None:
+            nonlocal attempts
+            attempts = attempt + 1
+        
+        try:
+            # Transient failures (429, timeouts, 5xx) are retried with jittered backoff
+            results = await retry_async(
+                _add_episode,
+                max_attempts=max_attempts,
+                base_delay=settings.GRAPHITI_RETRY_BASE_DELAY_SEC,
+                max_delay=settings.GRAPHITI_RETRY_MAX_DELAY_SEC,
+                description=f"Chunk {chunk['index']}",
+                on_retry=_on_retry
+            )
+            if existing_uuid:
                 logger.info(
-                    f"✅ Chunk {chunk_index} ingested ({i+1}/{len(chunks)} - {int(((i+1)/len(chunks))*100)}%)",
-                    extra={
-                        'upload_id': upload_id,
-                        'stage': 'ingestion',
-                        'sub_stage': 'chunk_complete',
-                        'duration': round(chunk_duration, 2),
-                        'metrics': {
-                            'chunk_index': chunk_index,
-                            'chunks_completed': i + 1,
-                            'chunks_total': len(chunks),
-                            'elapsed': chunk_duration,
-                        }
-                    }
+                    f"♻️  Chunk {chunk['index']} already written by an earlier attempt (episode {existing_uuid})",
+                    extra={'upload_id': upload_id}
                 )
+                # Its entities/relations are unknown here: recount graph stats
+                _record_graph_delta(None)
+                _completed(position, existing_uuid, fields)
             else:
-                logger.info(
-                    f"✅ Chunk {chunk_index} ingested in {chunk_duration:.1f}s "
-                    f"({i+1}/{len(chunks)})"
-                )
-            
-            # Update progress
-            progress_pct = int(((i + 1) / len(chunks)) * 100)
-            overall_progress = 75 + int(25 * (i + 1) / len(chunks))
-            
-            if processing_status and upload_id:
-                processing_status[upload_id].update({
-                    "sub_stage": "graphiti_episode",
-                    "progress": overall_progress,
-                    "ingestion_progress": {
-                        "chunks_completed": i + 1,
-                        "chunks_total": len(chunks),
-                        "progress_pct": progress_pct,
-                        "current_chunk_index": chunk_index,
-                    }
-                })
+                _record_graph_delta(results)
+                episode = getattr(results, "episode", None)
+                _completed(position, episode.uuid if episode is not None else None, fields)
+        except Exception as e:
+            error = e
         
+        return {
+            "position": position,
+            "chunk_index": chunk["index"],
+            "duration": time.time() - chunk_start_time,
+            "error": error,
+            "attempts": attempts,
+        }
+    
+    checkpoints_enabled = bool(upload_id) and settings.INGESTION_CHECKPOINTS_ENABLED
+    
+    # Ingested chunks not yet stamped / checkpointed (flushed once per window)
+    completed_stamps: List[Dict[str, Any]] = []
+    completed_positions: List[int] = []
+    
+    def _completed(position: int, episode_uuid: Optional[str], fields: Dict[str, Any]) -> None:
+        # Stamp by uuid; name + reference_time when the episode wasn't returned
+        stamp = {"uuid": episode_uuid} if episode_uuid else {
+            "name": fields["name"], "reference_time": fields["reference_time"]
+        }
+        completed_stamps.append({**stamp, "content_hash": chunk_hashes[position]})
+        completed_positions.append(position)
+    
+    async def _flush_completed() -> None:
+        if not completed_positions:
+            return
+        stamps = completed_stamps[:]
+        positions = completed_positions[:]
+        completed_stamps.clear()
+        completed_positions.clear()
+        
+        await _stamp_content_hashes(client, group_id, stamps)
+        if not checkpoints_enabled:
+            return
+        try:
+            await asyncio.to_thread(get_checkpoint_store().mark_chunks_done, upload_id, positions)
         except Exception as e:
-            chunk_duration = time.time() - chunk_start_time
-            total_time += chunk_duration
+            logger.warning(f"⚠️  Failed to checkpoint chunks {positions}: {e}", extra={'upload_id': upload_id})
+    
+    max_attempts = max(1, settings.GRAPHITI_CHUNK_MAX_ATTEMPTS)
+    succeeded_indexes: List[int] = []
+    dead_letters: List[Dict[str, Any]] = []  # Chunks still failing after every retry
+    
+    finished: Dict[int, int] = {}  # position → chunk_index
+    next_position = 0  # First position not yet reported (ordered progress)
+    
+    def _record(result: Dict[str, Any]) -> None:
+        nonlocal successful, failed, total_time
+        
+        chunk_index = result["chunk_index"]
+        chunk_duration = result["duration"]
+        total_time += chunk_duration
+        finished[result["position"]] = chunk_index
+        
+        if result["error"] is None:
+            successful += 1
+            succeeded_indexes.append(chunk_index)
+            logger.info(
+                f"✅ Chunk {chunk_index} ingested in {chunk_duration:.1f}s "
+                f"({len(finished)}/{_chunks_total()})",
+                extra={
+                    'upload_id': upload_id,
+                    'stage': 'ingestion',
+                    'sub_stage': 'chunk_complete',
+                    'duration': round(chunk_duration, 2),
+                    'metrics': {
+                        'chunk_index': chunk_index,
+                        'chunks_completed': len(finished),
+                        'chunks_total': _chunks_total(),
+                        'elapsed': chunk_duration,
+                    }
+                }
+            )
+        else:
             failed += 1
-            
+            dead_letters.append({
+                "chunk": chunks[result["position"]],
+                "error_type": type(result["error"]).__name__,
+                "error": str(result["error"]),
+                "attempts": result["attempts"],
+            })
             logger.error(
-                f"❌ Chunk {chunk_index} failed after {chunk_duration:.1f}s: {e}",
+                f"❌ Chunk {chunk_index} failed after {result['attempts']} attempt(s), "
+                f"{chunk_duration:.1f}s: {result['error']}",
                 extra={
                     'upload_id': upload_id,
                     'chunk_index': chunk_index,
-                    'error': str(e)
+                    'attempts': result['attempts'],
+                    'error': str(result['error'])
                 },
-                exc_info=True
+                exc_info=result["error"]
             )
     
+    def _report_progress(force: bool = False) -> None:
+        nonlocal next_position
+        
+        # Report progress in chunk order: advance over the contiguous finished prefix
+        advanced = False
+        while next_position in finished:
+            next_position += 1
+            advanced = True
+        
+        if (advanced or force) and next_position and processing_status and upload_id:
+            chunks_total = _chunks_total()
+            progress_pct = int((next_position / chunks_total) * 100)
+            overall_progress = 75 + int(25 * next_position / chunks_total)
+            processing_status[upload_id].update({
+                "sub_stage": "graphiti_episode",
+                "progress": overall_progress,
+                "ingestion_progress": {
+                    "chunks_completed": next_position,
+                    "chunks_total": chunks_total,
+                    "total_estimated": not stream_exhausted,
+                    "progress_pct": progress_pct,
+                    "current_chunk_index": finished[next_position - 1],
+                }
+            })
+    
+    async def _run_window(items: AsyncIterable[Tuple[int, Dict[str, Any]]], written_before: bool = False) -> None:
+        pending: set = set()
+        try:
+            async for position, chunk in items:
+                pending.add(asyncio.create_task(_ingest_one(position, chunk, written_before)))
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        _record(task.result())
+                    _report_progress()
+                    if len(completed_positions) >= concurrency:
+                        await _flush_completed()
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    _record(task.result())
+                _report_progress()
+                if len(completed_positions) >= concurrency:
+                    await _flush_completed()
+        finally:
+            # Cancellation (shutdown): don't leave orphan add_episode calls running
+            for task in pending:
+                task.cancel()
+            # Stamp / checkpoint what did complete, so a restart doesn't redo it
+            await _flush_completed()
+    
+    async def _batches(items: AsyncIterable[Tuple[int, Dict[str, Any]]]) -> AsyncIterator[List[Tuple[int, Dict[str, Any]]]]:
+        batch = []
+        async for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    async def _run_bulk(items: AsyncIterable[Tuple[int, Dict[str, Any]]]) -> None:
+        # One add_episode_bulk call per batch: entity resolution and embeddings
+        # are shared across the batch instead of repeated for every chunk
+        batch_number = 0
+        async for batch in _batches(items):
+            batch_number += 1
+            raw_episodes = [
+                RawEpisode(source=EpisodeType.text, **_episode_fields(position, chunk))
+                for position, chunk in batch
+            ]
+            batch_start_time = time.time()
+            
+            # Admit the batch by its chunks' token counts (as _ingest_one does per
+            # chunk): one bulk call fans out into many Gemini requests at once
+            await gemini_limiter.wait_for_capacity(sum(_chunk_token_budget(chunk) for _, chunk in batch))
+            
+            try:
+                results = await client.add_episode_bulk(raw_episodes, group_id=group_id)
+            except Exception as e:
+                logger.warning(
+                    f"⚠️  Bulk batch {batch_number} failed "
+                    f"({len(batch)} chunks): {e} - falling back to per-chunk ingestion",
+                    extra={'upload_id': upload_id, 'error': str(e)}
+                )
+                # The failed call may have saved some episodes: look them up first
+                await _run_window(_aiter_items(batch), written_before=True)
+                continue
+            
+            _record_graph_delta(results)
+            # Episodes returned (AddBulkEpisodeResults) are in batch order
+            episodes = getattr(results, "episodes", None) or []
+            if len(episodes) != len(batch):
+                episodes = [None] * len(batch)
+            for (position, _), raw_episode, episode in zip(batch, raw_episodes, episodes):
+                _completed(
+                    position,
+                    episode.uuid if episode is not None else None,
+                    {"name": raw_episode.name, "reference_time": raw_episode.reference_time}
+                )
+            await _flush_completed()
+            
+            # Batch duration is shared evenly for per-chunk metrics
+            share = (time.time() - batch_start_time) / len(batch)
+            for position, chunk in batch:
+                _record({
+                    "position": position,
+                    "chunk_index": chunk["index"],
+                    "duration": share,
+                    "error": None,
+                    "attempts": 1,
+                })
+            _report_progress()
+    
+    # Idempotent re-ingestion: skip chunks whose fingerprint is already in the graph
+    # Streamed: the chunk stream may add positions as chunks arrive (same set)
+    if done_positions is None:
+        done_positions = set()
+    resumed = 0
+    chunk_hashes: List[str] = []
+    
+    def _skip(position: int, chunk: Dict[str, Any], from_checkpoint: bool) -> None:
+        nonlocal skipped, resumed
+        skipped += 1
+        resumed += int(from_checkpoint)
+        finished[position] = chunk["index"]
+    
+    def _log_skipped() -> None:
+        logger.info(
+            f"⏭️  Skipping {skipped}/{len(chunks)} chunks already in graph "
+            f"({resumed} from checkpoint, {skipped - resumed} by content_hash)",
+            extra={'upload_id': upload_id, 'chunks_skipped': skipped, 'chunks_resumed': resumed}
+        )
+        if processing_status and upload_id:
+            processing_status[upload_id]["metrics"] = {
+                **processing_status[upload_id].get("metrics", {}),
+                "chunks_skipped": skipped,
+            }
+    
+    async def _not_ingested(items: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        # Checkpointed positions first, then one content_hash query for the rest
+        hashes = [chunk_hashes[position] for position, _ in items if position not in done_positions]
+        ingested_hashes = (
+            await _get_ingested_hashes(client, group_id, hashes)
+            if settings.GRAPHITI_SKIP_INGESTED_CHUNKS else set()
+        )
+        
+        remaining = []
+        for position, chunk in items:
+            if position in done_positions:
+                _skip(position, chunk, from_checkpoint=True)
+            elif chunk_hashes[position] in ingested_hashes:
+                _skip(position, chunk, from_checkpoint=False)
+            else:
+                remaining.append((position, chunk))
+        return remaining
+    
+    async def _streamed_chunks() -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        nonlocal stream_exhausted
+        
+        window: List[Tuple[int, Dict[str, Any]]] = []
+        async for chunk in chunk_stream:
+            position = len(chunks)
+            chunks.append(chunk)
+            chunk_hashes.append(compute_content_hash(chunk))
+            window.append((position, chunk))
+            
+            if len(window) >= STREAM_HASH_LOOKUP_WINDOW:
+                remaining = await _not_ingested(window)
+                if len(remaining) < len(window):
+                    _report_progress()
+                window = []
+                for item in remaining:
+                    yield item
+        
+        for item in await _not_ingested(window):
+            yield item
+        
+        stream_exhausted = True
+        if skipped:
+            _log_skipped()
+    
+    if streaming:
+        pending_chunks = _streamed_chunks()
+    else:
+        chunk_hashes = [compute_content_hash(chunk) for chunk in chunks]
+        indexed_chunks = await _not_ingested(list(enumerate(chunks)))
+        
+        if skipped:
+            _log_skipped()
+            _report_progress()
+        pending_chunks = _aiter_items(indexed_chunks)
+    
+    # One millisecond per chunk position keeps episodes in document order;
+    # also the "created by this ingestion" cutoff of the graph delta
+    reference_base_time = datetime.now(timezone.utc)
+    ingestion_id = next(_ingestion_ids)
+    for other_id in _active_ingestions:
+        _active_ingestions[other_id] = True
+    _active_ingestions[ingestion_id] = bool(_active_ingestions)
+    
+    # Attribute LLM cache hits/misses to this upload (inherited by Graphiti's tasks)
+    cache_context_token = current_upload_id.set(upload_id)
+    try:
+        if bulk:
+            await _run_bulk(pending_chunks)
+        else:
+            await _run_window(pending_chunks)
+    finally:
+        current_upload_id.reset(cache_context_token)
+        if _active_ingestions.pop(ingestion_id):
+            graph_delta_exact = False
+    
+    if streaming:
+        _report_progress(force=True)  # Exact chunks_total now that the stream is exhausted
+    
+    llm_cache_metrics = get_upload_cache_metrics(upload_id, pop=True) if upload_id else None
+    
+    # Dead-letter store: keep failed chunks for POST /upload/{id}/retry-failed,
+    # and clear the ones a retry just ingested
+    if upload_id:
+        try:
+            store = get_checkpoint_store()
+            if dead_letters:
+                await asyncio.to_thread(store.add_dead_letters, upload_id, metadata, dead_letters)
+            if succeeded_indexes:
+                await asyncio.to_thread(store.remove_dead_letters, upload_id, succeeded_indexes)
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to update dead-letter store: {e}", extra={'upload_id': upload_id})
+    
+    wall_clock_time = time.time() - ingestion_start_time
+    
+    graph_delta = {
+        "entities": len(touched_entities),
+        "entities_created": sum(touched_entities.values()),
+        "relations": len(touched_relations),
+        "relations_created": sum(touched_relations.values()),
+        "episodes_created": episodes_created,
+        "mentions_created": mentions_created,
+        "exact": graph_delta_exact,
+    }
+    get_graph_stats_service().apply_ingestion_delta(graph_delta)
+    
     # ════════════════════════════════════════════════════════
     # Final Summary
     # ════════════════════════════════════════════════════════
     
+    attempted = len(chunks) - skipped
     avg_time_per_chunk = total_time / successful if successful > 0 else 0
-    success_rate = (successful / len(chunks) * 100) if len(chunks) > 0 else 0
+    if attempted > 0:
+        success_rate = successful / attempted * 100
+    else:
+        success_rate = 100.0 if chunks else 0
     
     logger.info(f"")
-    logger.info(f"✅ Sequential ingestion complete:")
-    logger.info(f"   Total time: {total_time:.2f}s")
-    logger.info(f"   Chunks: {successful}/{len(chunks)} ({success_rate:.1f}%)")
+    logger.info(f"✅ Ingestion complete ({processing_mode}):")
+    logger.info(f"   Wall-clock time: {wall_clock_time:.2f}s")
+    logger.info(f"   Chunks: {successful}/{attempted} ({success_rate:.1f}%), {skipped} skipped")
     logger.info(f"   Avg time/chunk: {avg_time_per_chunk:.2f}s")
-    logger.info(f"   Mode: Sequential (simple, no SafeQueue)")
+    logger.info(
+        f"   Graph delta: {graph_delta['entities']} entities ({graph_delta['entities_created']} new), "
+        f"{graph_delta['relations']} relations ({graph_delta['relations_created']} new)"
+    )
     logger.info(f"   LLM: Gemini 2.5 Flash-Lite (~$1-2/year)")
     
     # Final stage logging
@@ -386,11 +1005,15 @@ async def ingest_chunks_to_graph(
             logger,
             upload_id=upload_id,
             stage="graphiti_ingestion",
-            duration=total_time,
+            duration=wall_clock_time,
             metrics={
                 "total_chunks": len(chunks),
                 "successful": successful,
                 "failed": failed,
+                "skipped": skipped,
+                "llm_cache": llm_cache_metrics,
+                "graph_delta": graph_delta,
+                "processing_mode": processing_mode,
                 "avg_time_per_chunk": round(avg_time_per_chunk, 2),
                 "success_rate": round(success_rate, 1),
             }
@@ -401,13 +1024,27 @@ async def ingest_chunks_to_graph(
         logger.info(f"   • Total chunks: {len(chunks)}")
         logger.info(f"   • Successful: {successful}")
         logger.info(f"   • Failed: {failed}")
-        logger.info(f"   • Total time: {total_time:.2f}s")
+        logger.info(f"   • Skipped (already ingested): {skipped}")
+        logger.info(f"   • Wall-clock time: {wall_clock_time:.2f}s")
         logger.info(f"   • Avg time/chunk: {avg_time_per_chunk:.2f}s")
         
         if failed > 0:
             logger.warning(f"⚠️  Ingestion completed with {failed} failures")
         else:
             logger.info(f"✅ All chunks ingested successfully!")
+    
+    return {
+        "total_chunks": len(chunks),
+        "successful": successful,
+        "failed": failed,
+        "skipped": skipped,
+        "resumed": resumed,
+        "failed_chunk_indexes": [failure["chunk"]["index"] for failure in dead_letters],
+        "llm_cache": llm_cache_metrics,
+        "graph_delta": graph_delta,
+        "success_rate": round(success_rate, 1),
+        "duration": round(wall_clock_time, 2),
+    }
 
 
 
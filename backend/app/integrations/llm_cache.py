@@ -0,0 +1,203 @@
+"""
+Persistent LLM Response Cache for Graphiti (Gemini 2.5 Flash-Lite)
+
+Graphiti's built-in LLM cache (cache=True) has no TTL, no size bound and no
+metrics, so GeminiClient runs with cache=False and this subclass caches instead:
+- Key: SHA-256 of (models, model size, temperature, response model, prompt
+  messages)
+- Store: DiskCache (SQLite on the uploads volume, TTL + size-bounded LRU)
+- Prompt kinds enabled independently: extraction / dedupe / other
+- Per-upload hit/miss counters (upload_id carried by a ContextVar)
+
+Safe because GRAPHITI_LLM_TEMPERATURE=0.0: an identical prompt gives the same
+answer, so re-running a failed or partially ingested upload costs nothing
+for the chunks already seen.
+"""
+import asyncio
+import json
+import logging
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.disk_cache import DiskCache, content_key
+from app.integrations.rate_limited_clients import RateLimitedGeminiClient
+
+logger = logging.getLogger('diveteacher.llm_cache')
+
+# Upload being ingested (set by ingest_chunks_to_graph, inherited by Graphiti tasks)
+current_upload_id: ContextVar[Optional[str]] = ContextVar('llm_cache_upload_id', default=None)
+
+# Per-upload counters: upload_id → {"hits": n, "misses": n, "by_kind": {...}}
+_upload_metrics: Dict[str, Dict[str, Any]] = {}
+
+
+def classify_prompt(response_model: Any) -> str:
+    """
+    Classify a Graphiti prompt by its structured response model
+
+    Returns:
+        "dedupe" (node/edge resolution), "extraction" (entities, edges,
+        attributes, dates) or "other" (summaries, invalidation, ...)
+
+    Note:
+        Invalidation is checked first: InvalidatedEdges also contains "edges"
+    """
+    name = getattr(response_model, "__name__", "") if response_model else ""
+    lowered = name.lower()
+
+    if "invalidat" in lowered:
+        return "other"
+    if "dedup" in lowered or "duplicate" in lowered or "resolution" in lowered or "unique" in lowered:
+        return "dedupe"
+    if (
+        lowered.startswith(("extract", "missed", "missing"))
+        or any(marker in lowered for marker in ("entities", "edges", "dates", "classification"))
+    ):
+        return "extraction"
+    return "other"
+
+
+def response_cache_key(
+    model: Any,
+    small_model: Any,
+    model_size: Any,
+    temperature: Any,
+    response_model: Any,
+    messages: List[Any]
+) -> str:
+    """
+    Cache key of one LLM call
+
+    model_size (ModelSize.small / medium, default medium) picks small_model
+    or model: the size and both models are part of the key.
+    """
+    prompt = json.dumps(
+        [{"role": m.role, "content": m.content} for m in messages],
+        ensure_ascii=False
+    )
+    return content_key(
+        str(model),
+        str(small_model),
+        str(getattr(model_size, "value", model_size) or "medium"),
+        str(temperature),
+        getattr(response_model, "__name__", "text"),
+        prompt
+    )
+
+
+def _is_kind_enabled(kind: str) -> bool:
+    if kind == "extraction":
+        return settings.LLM_CACHE_EXTRACTION
+    if kind == "dedupe":
+        return settings.LLM_CACHE_DEDUPE
+    return settings.LLM_CACHE_OTHER
+
+
+def _record(kind: str, hit: bool) -> None:
+    upload_id = current_upload_id.get()
+    if not upload_id:
+        return
+
+    metrics = _upload_metrics.setdefault(upload_id, {"hits": 0, "misses": 0, "by_kind": {}})
+    kind_metrics = metrics["by_kind"].setdefault(kind, {"hits": 0, "misses": 0})
+    field = "hits" if hit else "misses"
+    metrics[field] += 1
+    kind_metrics[field] += 1
+
+
+def get_upload_cache_metrics(upload_id: str, pop: bool = False) -> Dict[str, Any]:
+    """
+    LLM cache metrics for one upload
+
+    Args:
+        upload_id: Upload identifier
+        pop: Forget the counters after reading (end of ingestion)
+
+    Returns:
+        {"hits", "misses", "hit_rate", "by_kind"}
+    """
+    metrics = _upload_metrics.pop(upload_id, None) if pop else _upload_metrics.get(upload_id)
+    metrics = metrics or {"hits": 0, "misses": 0, "by_kind": {}}
+
+    lookups = metrics["hits"] + metrics["misses"]
+    return {
+        **metrics,
+        "hit_rate": round(metrics["hits"] / lookups * 100, 1) if lookups else 0.0,
+    }
+
+
+class CachingGeminiClient(RateLimitedGeminiClient):
+    """
+    GeminiClient with a persistent prompt-hash response cache.
+
+    Only successful responses are stored; errors are never cached.
+    Cache hits return before the rate limiter (no RPM/TPM budget spent).
+
+    Usage:
+        llm_client = CachingGeminiClient(config=llm_config, response_cache=get_llm_cache())
+    """
+
+    def __init__(self, *args, response_cache: DiskCache, **kwargs):
+        kwargs["cache"] = False  # Graphiti's unbounded diskcache stays off
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+
+    async def generate_response(self, messages, response_model=None, *args, **kwargs) -> Dict[str, Any]:
+        kind = classify_prompt(response_model)
+        if not _is_kind_enabled(kind):
+            return await super().generate_response(messages, response_model, *args, **kwargs)
+
+        # generate_response(messages, response_model, max_tokens, model_size)
+        model_size = kwargs.get("model_size", args[1] if len(args) > 1 else None)
+        key = response_cache_key(
+            self.model, self.small_model, model_size, self.temperature, response_model, messages
+        )
+        cached = await asyncio.to_thread(self.response_cache.get, key)
+        if cached is not None:
+            _record(kind, hit=True)
+            return json.loads(cached)
+
+        _record(kind, hit=False)
+        response = await super().generate_response(messages, response_model, *args, **kwargs)
+        await asyncio.to_thread(
+            self.response_cache.set, key, json.dumps(response, ensure_ascii=False).encode("utf-8")
+        )
+        return response
+
+
+# Global LLM response cache (singleton pattern)
+_llm_cache: Optional[DiskCache] = None
+
+
+def get_llm_cache() -> DiskCache:
+    """
+    Get or create the LLM response DiskCache singleton
+
+    Note:
+        - File: {CACHE_DIR}/llm_responses.sqlite
+        - Expiry: LLM_CACHE_TTL_HOURS, size bound: LLM_CACHE_MAX_MB
+    """
+    global _llm_cache
+
+    if _llm_cache is None:
+        _llm_cache = DiskCache(
+            path=f"{settings.CACHE_DIR}/llm_responses.sqlite",
+            max_bytes=settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+            ttl_seconds=settings.LLM_CACHE_TTL_HOURS * 3600,
+            name="llm_responses"
+        )
+
+    return _llm_cache
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """LLM response cache statistics (or disabled marker)"""
+    if not settings.LLM_CACHE_ENABLED:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "extraction": settings.LLM_CACHE_EXTRACTION,
+        "dedupe": settings.LLM_CACHE_DEDUPE,
+        **get_llm_cache().get_stats()
+    }
@@ -94,7 +94,27 @@ def create_rag_indexes(driver: GraphDatabase.driver) -> List[str]:
     except Exception as e:
         logger.error(f"❌ Unexpected error creating 'episode_date_idx': {e}")
 
-    logger.info(f"✅ RAG indexes created: {len(indexes_created)}/{3}")
+    # 4. Index on Episodic.content_hash (idempotent re-ingestion lookup)
+    try:
+        driver.execute_query(
+            """
+            CREATE INDEX episode_content_hash_idx IF NOT EXISTS
+            FOR (e:Episodic) ON (e.content_hash)
+            """,
+            database_=settings.NEO4J_DATABASE
+        )
+        indexes_created.append("episode_content_hash_idx")
+        logger.info("✅ Index 'episode_content_hash_idx' created")
+    except Neo4jError as e:
+        if "already exists" in str(e).lower() or "equivalent" in str(e).lower():
+            logger.info("⚠️  Index 'episode_content_hash_idx' already exists")
+            indexes_created.append("episode_content_hash_idx")
+        else:
+            logger.error(f"❌ Failed to create 'episode_content_hash_idx': {e}")
+    except Exception as e:
+        logger.error(f"❌ Unexpected error creating 'episode_content_hash_idx': {e}")
+
+    logger.info(f"✅ RAG indexes created: {len(indexes_created)}/{4}")
 
     return indexes_created
 
@@ -186,7 +206,7 @@ def drop_rag_indexes(driver: GraphDatabase.driver) -> List[str]:
     logger.warning("⚠️  Dropping RAG indexes...")
 
     dropped = []
-    index_names = ["episode_content", "entity_name_idx", "episode_date_idx"]
+    index_names = ["episode_content", "entity_name_idx", "episode_date_idx", "episode_content_hash_idx"]
 
     for idx_name in index_names:
         try:
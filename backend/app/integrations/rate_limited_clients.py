@@ -0,0 +1,128 @@
+"""
+Rate-Limited Graphiti Clients (Gemini LLM + OpenAI embeddings)
+
+Thin wrappers that route every provider call through the shared
+RateLimiter of its provider (app/core/rate_limiter.py):
+- Reservation: estimated tokens from the prompt/input text
+- Correction: actual tokens read from the API response usage
+  (Gemini usage_metadata.total_token_count, OpenAI usage.total_tokens)
+- 429 responses shrink the provider's concurrency for every caller
+
+Usage capture hooks the SDK call used by Graphiti; if the SDK layout
+changes, the limiter silently falls back to estimates.
+"""
+import logging
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional
+
+from graphiti_core.embedder.client import EmbedderClient
+from graphiti_core.llm_client.gemini_client import GeminiClient
+
+from app.core.rate_limiter import estimate_tokens, get_rate_limiter
+
+logger = logging.getLogger('diveteacher.rate_limiter')
+
+# Token counts reported by the SDK during the current call (per task)
+_usage_holder: ContextVar[Optional[List[int]]] = ContextVar('rate_limiter_usage', default=None)
+
+
+def _hook_usage(target: Any, method_name: str, extract: Callable[[Any], Optional[int]]) -> bool:
+    """
+    Wrap an async SDK method so real token usage lands in _usage_holder.
+
+    Returns:
+        True if the hook was installed
+    """
+    original = getattr(target, method_name, None)
+    if original is None:
+        return False
+
+    async def wrapper(*args, **kwargs):
+        response = await original(*args, **kwargs)
+        holder = _usage_holder.get()
+        if holder is not None:
+            try:
+                tokens = extract(response)
+            except Exception:
+                tokens = None
+            if tokens:
+                holder.append(int(tokens))
+        return response
+
+    try:
+        setattr(target, method_name, wrapper)
+    except (AttributeError, TypeError):
+        return False
+    return True
+
+
+def _gemini_usage(response: Any) -> Optional[int]:
+    return getattr(getattr(response, "usage_metadata", None), "total_token_count", None)
+
+
+def _openai_usage(response: Any) -> Optional[int]:
+    return getattr(getattr(response, "usage", None), "total_tokens", None)
+
+
+class RateLimitedGeminiClient(GeminiClient):
+    """GeminiClient whose calls go through the shared "gemini" RateLimiter"""
+
+    OUTPUT_TOKENS_ESTIMATE = 512  # Reserved for the structured answer, corrected afterwards
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = get_rate_limiter("gemini")
+
+        models = getattr(getattr(getattr(self, "client", None), "aio", None), "models", None)
+        if models is None or not _hook_usage(models, "generate_content", _gemini_usage):
+            logger.warning("⚠️  Gemini usage hook unavailable - rate limiter uses estimates only")
+
+    async def generate_response(self, messages, response_model=None, *args, **kwargs):
+        estimated = sum(estimate_tokens(str(m.content)) for m in messages) + self.OUTPUT_TOKENS_ESTIMATE
+
+        holder: List[int] = []
+        token = _usage_holder.set(holder)
+        try:
+            async with self.rate_limiter.limit(estimated) as usage:
+                response = await super().generate_response(messages, response_model, *args, **kwargs)
+                if holder:
+                    usage.actual_tokens = sum(holder)
+                return response
+        finally:
+            _usage_holder.reset(token)
+
+
+class RateLimitedEmbedder(EmbedderClient):
+    """Embedder wrapper whose calls go through the shared "openai" RateLimiter"""
+
+    def __init__(self, embedder: EmbedderClient):
+        self.embedder = embedder
+        self.rate_limiter = get_rate_limiter("openai")
+
+        embeddings = getattr(getattr(embedder, "client", None), "embeddings", None)
+        if embeddings is None or not _hook_usage(embeddings, "create", _openai_usage):
+            logger.warning("⚠️  OpenAI usage hook unavailable - rate limiter uses estimates only")
+
+    async def _limited(self, estimated: int, call):
+        holder: List[int] = []
+        token = _usage_holder.set(holder)
+        try:
+            async with self.rate_limiter.limit(estimated) as usage:
+                result = await call()
+                if holder:
+                    usage.actual_tokens = sum(holder)
+                return result
+        finally:
+            _usage_holder.reset(token)
+
+    async def create(self, input_data: Any) -> List[float]:
+        if isinstance(input_data, str):
+            estimated = estimate_tokens(input_data)
+        else:
+            input_data = list(input_data)  # Token ids (may be a one-shot iterator)
+            estimated = max(1, len(input_data))
+        return await self._limited(estimated, lambda: self.embedder.create(input_data))
+
+    async def create_batch(self, input_data_list: List[str]) -> List[List[float]]:
+        estimated = sum(estimate_tokens(text) for text in input_data_list)
+        return await self._limited(estimated, lambda: self.embedder.create_batch(input_data_list))
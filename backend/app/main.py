@@ -5,12 +5,15 @@ This is the main entry point for the backend API server.
 It sets up:
 - FastAPI application
 - CORS middleware
+- Upload size guard (Content-Length checked before the body is read)
 - Sentry monitoring
 - API routes
 - Background tasks
 """
 
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import sentry_sdk
@@ -20,9 +23,12 @@ from app.core.logging_config import setup_structured_logging
 from app.api import upload, query, health, graph, neo4j, test
 from app.integrations.neo4j import neo4j_client
 from app.integrations.graphiti import close_graphiti_client
+from app.integrations.dockling import shutdown_docling_executor
 from app.integrations.sentry import init_sentry
 from app.integrations.neo4j_indexes import create_rag_indexes, verify_indexes
-from app.services.document_queue import shutdown_document_queue
+from app.services.document_queue import shutdown_document_queue, resume_interrupted_documents
+from app.services.upload_store import get_upload_store
+from app.core.status_store import get_status_store, start_status_sweeper, stop_status_sweeper
 
 # Initialize structured logging
 setup_structured_logging(level=getattr(settings, 'LOG_LEVEL', 'INFO'))
@@ -40,7 +46,22 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
-# CORS middleware
+# Upload size guard: reject oversized uploads before the body is read
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    if (
+        request.method == "POST"
+        and request.url.path.startswith("/api/upload")
+        and upload.upload_too_large(request.headers.get("content-length"))
+    ):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE_MB}MB"},
+        )
+    return await call_next(request)
+
+
+# CORS middleware (added last: outermost, so 413 responses carry CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS.split(","),
@@ -85,6 +106,25 @@ async def startup_event():
         print(f"⚠️  Neo4j connection failed: {e}")
         # Don't crash - let health check report the issue
 
+    # Resume documents interrupted by the previous shutdown/crash
+    try:
+        resumed = resume_interrupted_documents()
+        if resumed:
+            print(f"🔁 Resumed {resumed} interrupted document(s)")
+    except Exception as e:
+        print(f"⚠️  Failed to resume interrupted documents: {e}")
+
+    # Upload retention (source files older than UPLOAD_RETENTION_DAYS)
+    try:
+        removed = await asyncio.to_thread(get_upload_store().maybe_sweep)
+        if removed:
+            print(f"🗑️  Removed {removed} expired upload file(s)")
+    except Exception as e:
+        print(f"⚠️  Upload retention sweep failed: {e}")
+
+    # Processing status TTL sweep (every STATUS_SWEEP_INTERVAL_SEC)
+    start_status_sweeper(get_status_store())
+
     print("✅ API server ready")
 
 
@@ -96,6 +136,12 @@ async def shutdown_event():
     # Shutdown document queue (finish current doc, stop processing)
     await shutdown_document_queue()
 
+    # Stop processing status sweeper
+    await stop_status_sweeper()
+
+    # Stop Docling conversion workers (process pool)
+    shutdown_docling_executor()
+
     # Close Neo4j connection
     neo4j_client.close()
 
@@ -0,0 +1,247 @@
+"""
+Pre-flight Document Analyzer (no conversion)
+
+Reads what a document costs before Docling touches it:
+- PDF (pypdfium2): page count, text layer per page, image coverage,
+  encryption, orientation
+- DOCX/PPTX (zip container): slide count, text volume
+
+The analysis yields an estimate (conversion seconds, chunks, LLM tokens,
+ingestion seconds) from historical throughput when available, static
+defaults otherwise. DocumentQueue uses it for scheduling and "auto" profile
+selection; POST /api/upload returns it.
+"""
+import logging
+import math
+import re
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger('diveteacher.analyzer')
+
+# Defaults until real throughput has been observed
+DEFAULT_SECONDS_PER_PAGE = {"ocr": 3.0, "text": 0.8, "office": 0.05}
+DEFAULT_INGESTION_SECONDS_PER_CHUNK = 15.0
+SCANNED_PAGE_CHARS = 1_800  # Text recovered by OCR on a typical MFT page
+CHARS_PER_TOKEN = 4
+MIN_HISTORY_DOCUMENTS = 3  # Trust observed throughput after this many documents
+
+# Observed ingestion throughput (documents ingested by this process)
+_history_lock = threading.Lock()
+_ingestion_history = {"chunks": 0, "seconds": 0.0, "documents": 0}
+
+_OFFICE_TEXT = re.compile(rb"<(?:a|w):t(?:\s[^>]*)?>([^<]*)</(?:a|w):t>")
+
+
+def page_needs_ocr(text_chars: int, image_coverage: float) -> bool:
+    """OCR decision for one PDF page (text layer too thin, or mostly pictures)"""
+    return (
+        text_chars < settings.DOCLING_OCR_MIN_TEXT_CHARS
+        or image_coverage > settings.DOCLING_OCR_IMAGE_COVERAGE
+    )
+
+
+def pdf_page_features(pdf: Any) -> List[Tuple[int, float, bool]]:
+    """
+    Per-page (text characters, image coverage, landscape) of an open PdfDocument
+
+    Image coverage is the area of image objects divided by the page area
+    (overlapping images can exceed 1.0).
+    """
+    import pypdfium2.raw as pdfium_c
+
+    features = []
+    for index in range(len(pdf)):
+        page = pdf[index]
+        try:
+            textpage = page.get_textpage()
+            try:
+                text_chars = len(textpage.get_text_range().strip())
+            finally:
+                textpage.close()
+
+            width, height = page.get_size()
+            image_area = 0.0
+            for image in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,)):
+                left, bottom, right, top = image.get_pos()
+                image_area += max(0.0, right - left) * max(0.0, top - bottom)
+            coverage = image_area / (width * height) if width and height else 0.0
+        finally:
+            page.close()
+
+        features.append((text_chars, coverage, width > height))
+    return features
+
+
+def _analyze_pdf(file_path: str) -> Dict[str, Any]:
+    import pypdfium2  # Docling's PDF backend dependency
+
+    try:
+        pdf = pypdfium2.PdfDocument(file_path)
+    except pypdfium2.PdfiumError as e:
+        if "password" in str(e).lower():
+            return {"encrypted": True, "readable": False, "error": "Password-protected PDF"}
+        return {"encrypted": False, "readable": False, "error": str(e)}
+
+    try:
+        features = pdf_page_features(pdf)
+    finally:
+        pdf.close()
+
+    pages = len(features)
+    pages_ocr = [page for page, (chars, coverage, _) in enumerate(features, start=1) if page_needs_ocr(chars, coverage)]
+    return {
+        "encrypted": False,
+        "readable": True,
+        "pages": pages,
+        "text_chars": sum(chars for chars, _, _ in features),
+        "pages_with_text": pages - len(pages_ocr),
+        "pages_needing_ocr": pages_ocr,
+        "image_density": round(sum(min(coverage, 1.0) for _, coverage, _ in features) / pages, 3) if pages else 0.0,
+        "landscape": pages > 0 and sum(landscape for _, _, landscape in features) > pages / 2,
+    }
+
+
+def _analyze_office(file_path: str) -> Dict[str, Any]:
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = archive.namelist()
+            slides = [name for name in names if re.match(r"ppt/slides/slide\d+\.xml$", name)]
+            parts = slides or [name for name in names if name == "word/document.xml"]
+            text_chars = sum(
+                len(text.decode("utf-8", "ignore").strip())
+                for name in parts
+                for text in _OFFICE_TEXT.findall(archive.read(name))
+            )
+    except (zipfile.BadZipFile, KeyError) as e:
+        return {"encrypted": False, "readable": False, "error": str(e)}
+
+    return {
+        "encrypted": False,
+        "readable": True,
+        "pages": len(slides) or None,  # DOCX: no page count without layout
+        "text_chars": text_chars,
+        "pages_with_text": None,
+        "pages_needing_ocr": [],
+        "image_density": None,
+        "landscape": bool(slides),
+    }
+
+
+def record_ingestion_throughput(chunks: int, seconds: float) -> None:
+    """Feed one ingested document into the ingestion estimate"""
+    if chunks <= 0 or seconds <= 0:
+        return
+    with _history_lock:
+        _ingestion_history["chunks"] += chunks
+        _ingestion_history["seconds"] += seconds
+        _ingestion_history["documents"] += 1
+
+
+def _ingestion_seconds_per_chunk() -> Tuple[float, bool]:
+    with _history_lock:
+        history = dict(_ingestion_history)
+    if history["documents"] >= MIN_HISTORY_DOCUMENTS:
+        return history["seconds"] / history["chunks"], True
+    return DEFAULT_INGESTION_SECONDS_PER_CHUNK / max(1, settings.GRAPHITI_INGEST_CONCURRENCY), False
+
+
+def _conversion_seconds(fmt: str, pages: int, ocr_pages: int) -> Tuple[float, bool]:
+    from app.integrations.dockling import get_conversion_throughput
+
+    observed = get_conversion_throughput().get(fmt)
+    if observed and observed["documents"] >= MIN_HISTORY_DOCUMENTS and observed["pages_per_sec"]:
+        return pages / observed["pages_per_sec"], True
+
+    if fmt in ("docx", "pptx"):
+        return max(1, pages) * DEFAULT_SECONDS_PER_PAGE["office"], False
+    return (
+        ocr_pages * DEFAULT_SECONDS_PER_PAGE["ocr"]
+        + (pages - ocr_pages) * DEFAULT_SECONDS_PER_PAGE["text"]
+    ), False
+
+
+def estimate_cost(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Conversion / chunking / ingestion estimate for an analysis
+
+    Returns:
+        {conversion_sec, chunks, llm_tokens, ingestion_sec, total_sec, from_history}
+    """
+    pages = analysis.get("pages") or 1
+    ocr_pages = len(analysis.get("pages_needing_ocr") or [])
+    text_chars = (analysis.get("text_chars") or 0) + ocr_pages * SCANNED_PAGE_CHARS
+
+    conversion_sec, conversion_observed = _conversion_seconds(analysis["format"], pages, ocr_pages)
+    chunks = max(1, math.ceil(text_chars / CHARS_PER_TOKEN / settings.DOCLING_MAX_TOKENS))
+    seconds_per_chunk, ingestion_observed = _ingestion_seconds_per_chunk()
+    ingestion_sec = chunks * seconds_per_chunk
+
+    return {
+        "conversion_sec": round(conversion_sec, 1),
+        "chunks": chunks,
+        "llm_tokens": chunks * settings.GRAPHITI_ESTIMATED_TOKENS_PER_CHUNK,
+        "ingestion_sec": round(ingestion_sec, 1),
+        "total_sec": round(conversion_sec + ingestion_sec, 1),
+        "from_history": conversion_observed or ingestion_observed,
+    }
+
+
+def recommend_profile(analysis: Dict[str, Any], estimate: Dict[str, Any]) -> str:
+    """
+    Conversion profile for "auto"
+
+    - PPTX → fast, DOCX → balanced (no layout models either way)
+    - Landscape PDFs (exported slide decks) → balanced
+    - PDFs whose accurate conversion would approach DOCLING_TIMEOUT → balanced
+    - Other PDFs (manuals, scans) → accurate
+    """
+    fmt = analysis["format"]
+    if fmt in ("ppt", "pptx"):
+        return "fast"
+    if fmt in ("doc", "docx"):
+        return "balanced"
+    if analysis.get("landscape"):
+        return "balanced"
+    if estimate["conversion_sec"] > settings.DOCLING_TIMEOUT * 0.8:
+        return "balanced"
+    return "accurate"
+
+
+def analyze_document(file_path: str) -> Dict[str, Any]:
+    """
+    Pre-flight analysis of an uploaded document (synchronous, no conversion)
+
+    Args:
+        file_path: Path to document
+
+    Returns:
+        {format, size_mb, readable, encrypted, pages, text_chars,
+        pages_with_text, pages_needing_ocr, image_density, landscape,
+        estimate: {...}, recommended_profile}
+        (only format/size_mb/readable/encrypted/error when unreadable)
+    """
+    path = Path(file_path)
+    fmt = path.suffix.lower().lstrip(".")
+    analysis: Dict[str, Any] = {"format": fmt, "size_mb": round(path.stat().st_size / (1024 * 1024), 2)}
+
+    try:
+        if fmt == "pdf":
+            analysis.update(_analyze_pdf(file_path))
+        elif fmt in ("docx", "pptx"):
+            analysis.update(_analyze_office(file_path))
+        else:
+            analysis.update({"encrypted": False, "readable": True, "pages": None, "text_chars": None})
+    except Exception as e:
+        logger.warning(f"⚠️  Pre-flight analysis failed for {path.name}: {e}")
+        analysis.update({"encrypted": False, "readable": False, "error": str(e)})
+
+    if analysis["readable"]:
+        analysis["estimate"] = estimate_cost(analysis)
+        analysis["recommended_profile"] = recommend_profile(analysis, analysis["estimate"])
+
+    return analysis
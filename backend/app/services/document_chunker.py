@@ -20,8 +20,12 @@ Configuration:
 - merge_peers: True (avoid micro-chunks)
 - Tokenizer: sentence-transformers/all-MiniLM-L6-v2 (matches embedding model)
 """
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import math
+import threading
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional
 from docling.datamodel.document import DoclingDocument
 from docling.chunking import HybridChunker
 from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
@@ -29,6 +33,8 @@ from transformers import AutoTokenizer
 
 logger = logging.getLogger('diveteacher.docling_chunker')
 
+_STREAM_END = object()  # aiter_chunks() end-of-stream marker
+
 
 # ==============================================================================
 # GAP #3: CONTEXTUAL RETRIEVAL WITH DOCLING HYBRIDCHUNKER (2025-11-05)
@@ -134,6 +140,122 @@ class DocumentChunker:
         
         logger.info("✅ Docling HybridChunker initialized (Gap #3 - Contextual Retrieval)")
     
+    def iter_chunks(
+        self,
+        docling_doc: DoclingDocument,
+        filename: str,
+        upload_id: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield formatted chunks as HybridChunker produces them (streamed pipeline).
+        
+        Same format as chunk_document(), except metadata.total_chunks is None
+        (unknown until the document is fully chunked).
+        
+        Args:
+            docling_doc: DoclingDocument from converter
+            filename: Original filename
+            upload_id: Upload ID for tracking
+        """
+        for i, chunk in enumerate(self.chunker.chunk(dl_doc=docling_doc)):
+            # Get raw text
+            raw_text = chunk.text
+            
+            # Get contextualized text (with hierarchical prefix)
+            contextualized_text = self.chunker.contextualize(chunk=chunk)
+            
+            # Calculate token count (approximate)
+            token_count = self.tokenizer.count_tokens(raw_text)
+            
+            yield {
+                "index": i,
+                "text": raw_text,  # Raw text (backward compatible)
+                "contextualized_text": contextualized_text,  # CRITICAL: Use this for embedding!
+                "metadata": {
+                    "filename": filename,
+                    "upload_id": upload_id,
+                    "chunk_index": i,
+                    "total_chunks": None,  # Filled once chunking completes
+                    "num_tokens": token_count,
+                    # Stable fingerprint for idempotent re-ingestion (skip unchanged chunks)
+                    "content_hash": hashlib.sha256(contextualized_text.encode("utf-8")).hexdigest(),
+                    "chunking_strategy": "Docling HybridChunker",
+                    "has_context": True,  # Flag to indicate context enrichment
+                    "max_tokens_config": self.max_tokens,
+                    "merge_peers_config": self.merge_peers
+                }
+            }
+    
+    async def aiter_chunks(
+        self,
+        docling_doc: DoclingDocument,
+        filename: str,
+        upload_id: str,
+        buffer_size: int = 8
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async iterator over iter_chunks(), chunking in a worker thread.
+        
+        The event loop stays free (ingestion runs while later sections are
+        still being chunked); at most `buffer_size` chunks wait unconsumed.
+        
+        Args:
+            docling_doc: DoclingDocument from converter
+            filename: Original filename
+            upload_id: Upload ID for tracking
+            buffer_size: Chunks produced ahead of the consumer
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = threading.Semaphore(buffer_size)  # Backpressure on the worker thread
+        stop = threading.Event()
+        
+        def _produce() -> None:
+            last: Any = _STREAM_END
+            try:
+                for chunk in self.iter_chunks(docling_doc, filename, upload_id):
+                    slots.acquire()
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                last = e
+            if not stop.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, last)
+        
+        producer = loop.run_in_executor(None, _produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                slots.release()
+                yield item
+            await producer
+        finally:
+            # Consumer gone early (error/cancellation): unblock and stop the worker
+            stop.set()
+            slots.release()
+    
+    def estimate_total_chunks(self, docling_doc: DoclingDocument) -> int:
+        """
+        Cheap estimate of the chunk count before chunking (progress reporting).
+        
+        HybridChunker splits at section boundaries and at max_tokens, so the
+        estimate is the larger of the heading count and the token volume
+        divided by max_tokens (~4 characters per token).
+        """
+        headings = 0
+        characters = 0
+        for item, _level in docling_doc.iterate_items():
+            if getattr(item, "label", None) in ("section_header", "title"):
+                headings += 1
+            characters += len(getattr(item, "text", "") or "")
+        
+        return max(1, headings, math.ceil(characters / 4 / self.max_tokens))
+    
     def chunk_document(
         self,
         docling_doc: DoclingDocument,
@@ -162,6 +284,7 @@ class DocumentChunker:
                 "chunk_index": 0,
                 "total_chunks": 31,
                 "num_tokens": 1800,
+                "content_hash": "sha256 of contextualized_text",
                 "chunking_strategy": "Docling HybridChunker",
                 "has_context": True
             }
@@ -169,43 +292,17 @@ class DocumentChunker:
         """
         logger.info(f"[{upload_id}] 🔪 Starting chunking (Docling HybridChunker + Context): {filename}")
         
-        # Chunk using HybridChunker
-        chunk_iter = self.chunker.chunk(dl_doc=docling_doc)
-        chunks = list(chunk_iter)
+        formatted_chunks = list(self.iter_chunks(docling_doc, filename, upload_id))
+        for chunk in formatted_chunks:
+            chunk["metadata"]["total_chunks"] = len(formatted_chunks)
         
-        logger.info(f"[{upload_id}] ✅ Created {len(chunks)} semantic chunks (HybridChunker)")
-        
-        # Format chunks for RAG pipeline
-        formatted_chunks = []
-        for i, chunk in enumerate(chunks):
-            # Get raw text
-            raw_text = chunk.text
-            
-            # Get contextualized text (with hierarchical prefix)
-            contextualized_text = self.chunker.contextualize(chunk=chunk)
-            
-            # Calculate token count (approximate)
-            token_count = self.tokenizer.count_tokens(raw_text)
-            
-            formatted_chunk = {
-                "index": i,
-                "text": raw_text,  # Raw text (backward compatible)
-                "contextualized_text": contextualized_text,  # CRITICAL: Use this for embedding!
-                "metadata": {
-                    "filename": filename,
-                    "upload_id": upload_id,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "num_tokens": token_count,
-                    "chunking_strategy": "Docling HybridChunker",
-                    "has_context": True,  # Flag to indicate context enrichment
-                    "max_tokens_config": self.max_tokens,
-                    "merge_peers_config": self.merge_peers
-                }
-            }
-            formatted_chunks.append(formatted_chunk)
+        logger.info(f"[{upload_id}] ✅ Created {len(formatted_chunks)} semantic chunks (HybridChunker)")
+        self.log_chunk_stats(formatted_chunks, upload_id)
         
-        # Log statistics
+        return formatted_chunks
+    
+    def log_chunk_stats(self, formatted_chunks: List[Dict[str, Any]], upload_id: str) -> None:
+        """Log token statistics and a preview of the first chunk"""
         token_counts = [c["metadata"]["num_tokens"] for c in formatted_chunks]
         if token_counts:
             avg_tokens = sum(token_counts) / len(token_counts)
@@ -224,8 +321,6 @@ class DocumentChunker:
                 first_contextualized = formatted_chunks[0]["contextualized_text"][:150]
                 logger.info(f"   First chunk (raw): {first_raw}...")
                 logger.info(f"   First chunk (contextualized): {first_contextualized}...")
-        
-        return formatted_chunks
 
 
 # Singleton instance for reuse
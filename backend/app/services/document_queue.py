@@ -1,39 +1,63 @@
 """
 Document Processing Queue for DiveTeacher.
 
-Handles sequential processing of multiple documents with:
-- FIFO queue
-- Rate limit protection (via SafeIngestionQueue in processor)
+Handles processing of multiple documents with:
+- FIFO intake queue
+- Stage workers (conversion → chunking → ingestion) connected by bounded
+  queues: document N+1 converts while document N ingests
+- DOCX/PPTX conversion lane: Office documents never wait behind a PDF
+- Optional shortest-first intake (QUEUE_SCHEDULING, pre-flight estimates)
+- Rate limit protection (shared token-bucket RateLimiters per provider)
 - Progress tracking
 - State persistence
 - Retry logic
-- Inter-document delays for additional rate limit safety
+- Optional inter-document delay (default 0: limiters pace the API calls)
 
-Version: 1.0.0 (Production-Ready for Large Workloads)
+Version: 1.1.0 (Stage-overlapped pipeline)
 Architecture: ARIA v2.0.0 Pattern
 """
 
 import asyncio
 import logging
+import time
 from collections import deque
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from pathlib import Path
 
-from app.core.processor import process_document
+from app.core.config import settings
+from app.core.processor import (
+    processing_status,
+    start_document_job,
+    run_pipeline_stage,
+    convert_stage,
+    chunk_stage,
+    ingest_stage,
+)
+from app.integrations.dockling import is_office_document
+from app.services.ingestion_checkpoint import get_checkpoint_store
+from app.services.upload_store import get_upload_store
 
 logger = logging.getLogger('diveteacher.queue')
 
 
 class DocumentQueue:
     """
-    Sequential document processing queue.
+    Stage-overlapped document processing queue.
 
     Features:
-    - One document at a time (no concurrent processing)
-    - FIFO order (first uploaded, first processed)
-    - Progress tracking per document
-    - Inter-document delays for rate limit safety
+    - FIFO order (first uploaded, first converted, first ingested)
+    - Stage workers with their own concurrency:
+        * conversion (QUEUE_CONVERSION_WORKERS): Docling, CPU-bound
+        * Office conversion (QUEUE_OFFICE_CONVERSION_WORKERS): DOCX/PPTX only,
+          lightweight converter on its own executor
+        * chunking (QUEUE_CHUNKING_WORKERS): HybridChunker, CPU-bound
+        * ingestion (QUEUE_INGESTION_WORKERS): Graphiti, network-bound
+    - Bounded hand-off queues (QUEUE_STAGE_BUFFER): a conversion worker waits
+      when converted documents aren't being picked up, so DoclingDocuments
+      don't pile up in memory (backpressure)
+    - Progress tracking per document (stage of every in-flight document)
+    - Optional inter-document delay between ingestions (QUEUE_INTER_DOCUMENT_DELAY_SEC)
     - Graceful shutdown support
     - State tracking (queued, processing, completed, failed)
 
@@ -53,28 +77,60 @@ class DocumentQueue:
         print(f"Processing: {status['processing']}")
     """
 
-    # Inter-document delay (additional safety margin for rate limits)
-    # This is IN ADDITION to SafeIngestionQueue's token-aware delays
-    INTER_DOCUMENT_DELAY_SEC = 60  # 1 minute between documents
-
     def __init__(self):
         """Initialize the document queue."""
-        self.queue: deque = deque()
-        self.processing: bool = False
-        self.current_doc: Optional[Dict] = None
-        self.completed: List[Dict] = []
-        self.failed: List[Dict] = []
+        # Rate safety now comes from the shared RateLimiters (real RPM/TPM);
+        # the fixed 60s pause between documents is opt-in only
+        self.inter_document_delay_sec = settings.QUEUE_INTER_DOCUMENT_DELAY_SEC
+        self.conversion_workers = max(1, settings.QUEUE_CONVERSION_WORKERS)
+        self.office_conversion_workers = max(1, settings.QUEUE_OFFICE_CONVERSION_WORKERS)
+        self.chunking_workers = max(1, settings.QUEUE_CHUNKING_WORKERS)
+        self.ingestion_workers = max(1, settings.QUEUE_INGESTION_WORKERS)
+        self.stage_buffer = max(1, settings.QUEUE_STAGE_BUFFER)
+        self.scheduling = settings.QUEUE_SCHEDULING
+
+        self.queue: deque = deque()  # Intake: waiting for conversion
+        self.in_flight: Dict[str, Dict] = {}  # upload_id → entry (any stage)
+        # Bounded history (most recent QUEUE_HISTORY_MAX); totals kept separately
+        history_max = max(1, settings.QUEUE_HISTORY_MAX)
+        self.completed: deque = deque(maxlen=history_max)
+        self.failed: deque = deque(maxlen=history_max)
+        self.completed_total: int = 0
+        self.failed_total: int = 0
         self._shutdown_requested: bool = False
+        # Snapshot version (ETag of GET /queue/status), bumped on every change
+        self.version: int = int(time.time() * 1000)
+
+        self._intake_ready = asyncio.Event()
+        self._to_chunking: Optional[asyncio.Queue] = None
+        self._to_ingestion: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
 
         logger.info("📥 DocumentQueue initialized")
-        logger.info(f"   • Inter-document delay: {self.INTER_DOCUMENT_DELAY_SEC}s")
-        logger.info("   • Processing mode: Sequential (FIFO)")
+        logger.info(f"   • Inter-document delay: {self.inter_document_delay_sec}s")
+        logger.info(
+            f"   • Processing mode: Stage-overlapped (conversion ×{self.conversion_workers}, "
+            f"office ×{self.office_conversion_workers}, "
+            f"chunking ×{self.chunking_workers}, ingestion ×{self.ingestion_workers}, "
+            f"buffer {self.stage_buffer}, {self.scheduling} intake)"
+        )
+
+    @property
+    def processing(self) -> bool:
+        """True while any document is in a pipeline stage"""
+        return bool(self.in_flight)
+
+    @property
+    def current_doc(self) -> Optional[Dict]:
+        """Oldest in-flight document (furthest along the pipeline)"""
+        return next(iter(self.in_flight.values()), None)
 
     def enqueue(
         self,
         file_path: str,
         upload_id: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        resume: bool = False
     ) -> Dict[str, Any]:
         """
         Add document to processing queue.
@@ -83,6 +139,8 @@ class DocumentQueue:
             file_path: Path to uploaded file
             upload_id: Unique upload identifier
             metadata: Optional document metadata
+            resume: Re-enqueued from the checkpoint store (already
+                registered: its checkpoint row is left untouched)
 
         Returns:
             Queue entry dict with status and position
@@ -98,6 +156,14 @@ class DocumentQueue:
         }
 
         self.queue.append(entry)
+        self._changed()
+
+        # Durable record: the document is re-enqueued if the backend restarts
+        if settings.INGESTION_CHECKPOINTS_ENABLED and not resume:
+            try:
+                get_checkpoint_store().register_document(upload_id, file_path, entry["metadata"])
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to checkpoint queued document: {e}", extra={'upload_id': upload_id})
 
         logger.info(
             f"📥 Document queued: {entry['filename']}",
@@ -108,107 +174,192 @@ class DocumentQueue:
             }
         )
 
-        # Start processing if not already running
-        if not self.processing:
-            logger.info("🚀 Starting queue processing (no processing in progress)")
-            asyncio.create_task(self._process_queue())
-        else:
-            logger.info(f"⏳ Queue processing already running (current doc: {self.current_doc['filename'] if self.current_doc else 'unknown'})")
+        # Start stage workers on first use, then wake a conversion worker
+        self._ensure_workers()
+        self._intake_ready.set()
 
         return entry
 
-    async def _process_queue(self):
-        """
-        Process documents sequentially until queue empty.
+    def _ensure_workers(self) -> None:
+        if self._workers:
+            return
 
-        This is the main processing loop that runs continuously
-        until all documents are processed or shutdown is requested.
+        logger.info("🚀 Starting stage workers...")
+        self._to_chunking = asyncio.Queue(maxsize=self.stage_buffer)
+        self._to_ingestion = asyncio.Queue(maxsize=self.stage_buffer)
+        self._workers = (
+            [asyncio.create_task(self._conversion_worker()) for _ in range(self.conversion_workers)]
+            + [asyncio.create_task(self._conversion_worker(office=True)) for _ in range(self.office_conversion_workers)]
+            + [asyncio.create_task(self._chunking_worker()) for _ in range(self.chunking_workers)]
+            + [asyncio.create_task(self._ingestion_worker()) for _ in range(self.ingestion_workers)]
+        )
+
+    async def _next_intake(self, office: bool = False) -> Dict[str, Any]:
+        # Wait for the next queued document of this lane (intake stops once shutdown is requested)
+        while True:
+            if not self._shutdown_requested:
+                candidates = [entry for entry in self.queue if is_office_document(entry["file_path"]) == office]
+                if candidates:
+                    entry = (
+                        min(candidates, key=self._schedule_key)
+                        if self.scheduling == "shortest_first" else candidates[0]
+                    )
+                    self.queue.remove(entry)
+                    self._changed()
+                    return entry
+            self._intake_ready.clear()
+            await self._intake_ready.wait()
+
+    @staticmethod
+    def _schedule_key(entry: Dict[str, Any]) -> float:
         """
-        if self.processing:
-            logger.warning("⚠️  Queue processing already running")
-            return
+        Shortest-first priority: estimated pipeline seconds minus time waited
 
-        self.processing = True
-        logger.info("🚀 Starting queue processing loop...")
+        Waiting ages a document one second per second, so a long manual is
+        never starved by a stream of small handouts. Documents without an
+        estimate (resumed after restart) go first.
+        """
+        estimate = ((entry["metadata"].get("preflight") or {}).get("estimate") or {}).get("total_sec", 0.0)
+        waited = (datetime.now() - datetime.fromisoformat(entry["queued_at"])).total_seconds()
+        return estimate - waited
+
+    def _changed(self) -> None:
+        # Millisecond clock floor: versions keep increasing across restarts
+        self.version = max(self.version + 1, int(time.time() * 1000))
+
+    def _set_stage(self, entry: Dict[str, Any], stage: str) -> None:
+        entry["stage"] = stage
+        entry[f"{stage}_started_at"] = datetime.now().isoformat()
+        self._changed()
+
+    async def _finish(self, entry: Dict[str, Any]) -> None:
+        """Move a document out of the pipeline (completed or failed)"""
+        status = processing_status.get(entry["upload_id"], {})
+        store = get_upload_store()
+
+        # Upload store outcome (source file removed after success if configured),
+        # recorded before leaving in_flight: a concurrent upload of the same
+        # bytes must never see an unfinished claim that is no longer live
+        try:
+            await asyncio.to_thread(store.mark_finished, entry["upload_id"], status.get("status") == "completed")
+        except Exception as e:
+            logger.warning(f"⚠️  Upload store update failed: {e}", extra={'upload_id': entry["upload_id"]})
 
-        processed_count = 0
+        self.in_flight.pop(entry["upload_id"], None)
+        self._changed()
 
+        # Retention sweep (at most hourly)
         try:
-            while self.queue and not self._shutdown_requested:
-                # Get next document
-                doc = self.queue.popleft()
-                self.current_doc = doc
-                doc["status"] = "processing"
-                doc["started_at"] = datetime.now().isoformat()
+            await asyncio.to_thread(store.maybe_sweep)
+        except Exception as e:
+            logger.warning(f"⚠️  Upload store sweep failed: {e}", extra={'upload_id': entry["upload_id"]})
 
-                logger.info("")
-                logger.info("=" * 70)
-                logger.info(f"📄 Processing document {processed_count + 1}")
-                logger.info(f"   Filename: {doc['filename']}")
-                logger.info(f"   Upload ID: {doc['upload_id']}")
-                logger.info(f"   Remaining in queue: {len(self.queue)}")
-                logger.info("=" * 70)
-                logger.info("")
+        if status.get("status") == "completed":
+            entry["status"] = "completed"
+            entry["completed_at"] = datetime.now().isoformat()
+            self.completed.append(entry)
+            self.completed_total += 1
 
-                try:
-                    # Process document (uses SafeIngestionQueue internally)
-                    await process_document(
-                        file_path=doc["file_path"],
-                        upload_id=doc["upload_id"],
-                        metadata=doc["metadata"]
-                    )
+            logger.info("")
+            logger.info(f"✅ Document completed: {entry['filename']}")
+            logger.info(f"   Upload ID: {entry['upload_id']}")
+            logger.info(f"   Total completed: {self.completed_total}")
+            logger.info(f"   Total failed: {self.failed_total}")
+            logger.info("")
+        else:
+            entry["status"] = "failed"
+            entry["error"] = status.get("error")
+            entry["failed_at"] = datetime.now().isoformat()
+            self.failed.append(entry)
+            self.failed_total += 1
+
+            logger.error("")
+            logger.error(f"❌ Document failed: {entry['filename']}")
+            logger.error(f"   Upload ID: {entry['upload_id']}")
+            logger.error(f"   Error: {entry['error']}")
+            logger.error(f"   Total completed: {self.completed_total}")
+            logger.error(f"   Total failed: {self.failed_total}")
+            logger.error("")
+
+    async def _conversion_worker(self, office: bool = False) -> None:
+        """
+        Stage 1: Docling conversion
+
+        Args:
+            office: DOCX/PPTX lane (Office executor) instead of the PDF lane
+                (CPU-bound, Docling executor)
+        """
+        while True:
+            entry = await self._next_intake(office)
+            entry["status"] = "processing"
+            entry["started_at"] = datetime.now().isoformat()
+            self.in_flight[entry["upload_id"]] = entry
+            self._set_stage(entry, "conversion")
 
-                    # Mark as completed
-                    doc["status"] = "completed"
-                    doc["completed_at"] = datetime.now().isoformat()
-                    self.completed.append(doc)
-
-                    logger.info("")
-                    logger.info(f"✅ Document completed: {doc['filename']}")
-                    logger.info(f"   Upload ID: {doc['upload_id']}")
-                    logger.info(f"   Total completed: {len(self.completed)}")
-                    logger.info(f"   Total failed: {len(self.failed)}")
-                    logger.info("")
-
-                except Exception as e:
-                    # Mark as failed
-                    doc["status"] = "failed"
-                    doc["error"] = str(e)
-                    doc["failed_at"] = datetime.now().isoformat()
-                    self.failed.append(doc)
-
-                    logger.error("")
-                    logger.error(f"❌ Document failed: {doc['filename']}")
-                    logger.error(f"   Upload ID: {doc['upload_id']}")
-                    logger.error(f"   Error: {str(e)}")
-                    logger.error(f"   Total completed: {len(self.completed)}")
-                    logger.error(f"   Total failed: {len(self.failed)}")
-                    logger.error("", exc_info=True)
-
-                finally:
-                    self.current_doc = None
-                    processed_count += 1
-
-                # Inter-document delay (additional rate limit safety)
-                if self.queue:  # Only delay if more documents remain
-                    logger.info("")
-                    logger.info(f"⏸️  Inter-document delay: Waiting {self.INTER_DOCUMENT_DELAY_SEC}s before next document...")
-                    logger.info("   (Additional rate limit safety on top of SafeIngestionQueue)")
-                    logger.info(f"   Remaining in queue: {len(self.queue)}")
-                    logger.info("")
-                    await asyncio.sleep(self.INTER_DOCUMENT_DELAY_SEC)
-
-        finally:
-            self.processing = False
             logger.info("")
             logger.info("=" * 70)
-            logger.info("🏁 Queue processing complete")
-            logger.info(f"   Total processed: {processed_count}")
-            logger.info(f"   Completed: {len(self.completed)}")
-            logger.info(f"   Failed: {len(self.failed)}")
+            logger.info(f"📄 Converting document: {entry['filename']}")
+            logger.info(f"   Upload ID: {entry['upload_id']}")
+            logger.info(f"   In pipeline: {len(self.in_flight)} | Remaining in queue: {len(self.queue)}")
             logger.info("=" * 70)
             logger.info("")
 
+            try:
+                job = start_document_job(entry["file_path"], entry["upload_id"], entry["metadata"])
+                if not await run_pipeline_stage(job, convert_stage):
+                    await self._finish(entry)
+                    continue
+            except Exception as e:
+                logger.error(f"❌ Conversion worker error: {e}", exc_info=True)
+                await self._finish(entry)
+                continue
+
+            # Backpressure: waits while the chunking stage is saturated
+            entry["stage"] = "waiting_for_chunking"
+            self._changed()
+            await self._to_chunking.put((entry, job))
+
+    async def _chunking_worker(self) -> None:
+        """Stage 2: HybridChunker (or chunk-stream setup when streamed)"""
+        while True:
+            entry, job = await self._to_chunking.get()
+            self._set_stage(entry, "chunking")
+            try:
+                if not await run_pipeline_stage(job, chunk_stage):
+                    await self._finish(entry)
+                    continue
+            except Exception as e:
+                logger.error(f"❌ Chunking worker error: {e}", exc_info=True)
+                await self._finish(entry)
+                continue
+            finally:
+                self._to_chunking.task_done()
+
+            entry["stage"] = "waiting_for_ingestion"
+            self._changed()
+            await self._to_ingestion.put((entry, job))
+
+    async def _ingestion_worker(self) -> None:
+        """Stage 3: Graphiti ingestion (network-bound, paced by the RateLimiters)"""
+        while True:
+            entry, job = await self._to_ingestion.get()
+            self._set_stage(entry, "ingestion")
+            try:
+                await run_pipeline_stage(job, ingest_stage)
+            except Exception as e:
+                logger.error(f"❌ Ingestion worker error: {e}", exc_info=True)
+            finally:
+                self._to_ingestion.task_done()
+                await self._finish(entry)
+
+            # Optional inter-document delay (only if configured)
+            if self.inter_document_delay_sec > 0 and (self._to_ingestion.qsize() or self.queue):
+                logger.info("")
+                logger.info(f"⏸️  Inter-document delay: Waiting {self.inter_document_delay_sec}s before next ingestion...")
+                logger.info(f"   Remaining in queue: {len(self.queue)}")
+                logger.info("")
+                await asyncio.sleep(self.inter_document_delay_sec)
+
     def get_status(self) -> Dict[str, Any]:
         """
         Get queue status with detailed information.
@@ -216,54 +367,71 @@ class DocumentQueue:
         Returns:
             Dict with queue size, processing state, current document, stats
         """
+        current_doc = self.current_doc
         return {
             "queue_size": len(self.queue),
             "processing": self.processing,
             "current_document": {
-                "upload_id": self.current_doc["upload_id"],
-                "filename": self.current_doc["filename"],
-                "status": self.current_doc["status"],
-                "started_at": self.current_doc.get("started_at"),
-            } if self.current_doc else None,
-            "completed_count": len(self.completed),
-            "failed_count": len(self.failed),
+                "upload_id": current_doc["upload_id"],
+                "filename": current_doc["filename"],
+                "status": current_doc["status"],
+                "stage": current_doc.get("stage"),
+                "started_at": current_doc.get("started_at"),
+            } if current_doc else None,
+            "in_flight_documents": [
+                {
+                    "upload_id": doc["upload_id"],
+                    "filename": doc["filename"],
+                    "stage": doc.get("stage"),
+                    "started_at": doc.get("started_at"),
+                }
+                for doc in self.in_flight.values()
+            ],
+            "completed_count": self.completed_total,
+            "failed_count": self.failed_total,
             "queued_documents": [
                 {
                     "upload_id": doc["upload_id"],
                     "filename": doc["filename"],
                     "queue_position": i + 1,
-                    "queued_at": doc["queued_at"]
+                    "queued_at": doc["queued_at"],
+                    "estimated_sec": ((doc["metadata"].get("preflight") or {}).get("estimate") or {}).get("total_sec")
                 }
                 for i, doc in enumerate(self.queue)
             ],
             "stats": {
-                "total_enqueued": len(self.queue) + len(self.completed) + len(self.failed) + (1 if self.current_doc else 0),
-                "success_rate": round((len(self.completed) / (len(self.completed) + len(self.failed)) * 100), 1) if (len(self.completed) + len(self.failed)) > 0 else 0
+                "total_enqueued": len(self.queue) + self.completed_total + self.failed_total + len(self.in_flight),
+                "success_rate": round((self.completed_total / (self.completed_total + self.failed_total) * 100), 1) if (self.completed_total + self.failed_total) > 0 else 0
             }
         }
 
     async def shutdown(self):
         """
-        Graceful shutdown: finish current document, stop processing queue.
+        Graceful shutdown: finish in-flight documents, stop processing queue.
 
-        This method waits for the current document to complete processing
-        before stopping the queue. Documents remaining in the queue will
-        not be processed.
+        Documents already converted (or converting) go through ingestion
+        before the workers stop. Documents remaining in the intake queue
+        will not be processed (they stay resumable via the checkpoint store).
         """
-        if not self.processing:
+        if not self._workers:
             logger.info("✅ Queue already stopped (not processing)")
             return
 
-        logger.info("🛑 Shutdown requested - finishing current document...")
-        logger.info(f"   Current doc: {self.current_doc['filename'] if self.current_doc else 'none'}")
+        logger.info("🛑 Shutdown requested - finishing in-flight documents...")
+        logger.info(f"   In pipeline: {[doc['filename'] for doc in self.in_flight.values()] or 'none'}")
         logger.info(f"   Remaining in queue: {len(self.queue)} (will NOT be processed)")
 
         self._shutdown_requested = True
 
-        # Wait for current document to finish
-        while self.processing:
+        # Wait for in-flight documents to leave the pipeline
+        while self.in_flight:
             await asyncio.sleep(1)
 
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
         logger.info("✅ Queue shutdown complete")
 
     def clear_history(self):
@@ -272,11 +440,14 @@ class DocumentQueue:
 
         Note: Does NOT clear the active queue or stop current processing.
         """
-        completed_count = len(self.completed)
-        failed_count = len(self.failed)
+        completed_count = self.completed_total
+        failed_count = self.failed_total
 
         self.completed.clear()
         self.failed.clear()
+        self.completed_total = 0
+        self.failed_total = 0
+        self._changed()
 
         logger.info(f"🗑️  History cleared: {completed_count} completed, {failed_count} failed")
 
@@ -330,6 +501,59 @@ async def shutdown_document_queue():
         logger.info("✅ No DocumentQueue to shutdown")
 
 
+def resume_interrupted_documents() -> int:
+    """
+    Re-enqueue documents interrupted by a backend restart.
+
+    Documents still "queued" or "chunked" in the ingestion checkpoint store
+    are queued again in their original order; chunked documents resume
+    ingestion from their first incomplete chunk.
+
+    Returns:
+        Number of documents re-enqueued
+    """
+    if not settings.INGESTION_CHECKPOINTS_ENABLED:
+        return 0
+
+    queue = get_document_queue()
+    resumed = 0
+
+    for doc in get_checkpoint_store().get_interrupted_documents():
+        upload_id = doc["upload_id"]
+
+        if not Path(doc["file_path"]).exists():
+            logger.warning(f"⚠️  Cannot resume {upload_id}: file missing ({doc['file_path']})")
+            get_checkpoint_store().finish_document(upload_id, "failed")
+            continue
+
+        entry = queue.enqueue(file_path=doc["file_path"], upload_id=upload_id, metadata=doc["metadata"], resume=True)
+        processing_status[upload_id] = {
+            "status": "queued",
+            "stage": "queued",
+            "sub_stage": "resumed_after_restart",
+            "progress": 0,
+            "progress_detail": {
+                "current": 0,
+                "total": 4,
+                "unit": "stages"
+            },
+            "queue_position": entry["queue_position"],
+            "error": None,
+            "started_at": datetime.now().isoformat(),
+            "metrics": {
+                "filename": entry["filename"]
+            }
+        }
+        resumed += 1
+
+        logger.info(
+            f"🔁 Resuming {entry['filename']} ({doc['status']})",
+            extra={'upload_id': upload_id, 'chunks_total': doc["chunks_total"]}
+        )
+
+    return resumed
+
+
 def get_queue_statistics() -> Dict[str, Any]:
     """
     Get queue statistics (for monitoring/debugging).
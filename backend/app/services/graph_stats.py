@@ -0,0 +1,224 @@
+"""
+Graph Statistics Service (count store + cache + incremental updates)
+
+Serves GET /api/graph/stats and GET /api/neo4j/stats from one cached
+snapshot instead of scanning the graph on every call:
+- Refresh: one query per label / relationship type shaped for the Neo4j
+  count store (MATCH (n:Label) RETURN count(n), MATCH ()-[r:TYPE]->()
+  RETURN count(r)), answered in constant time whatever the graph size
+- Cache: snapshot reused for GRAPH_STATS_TTL_SEC; concurrent callers share
+  one refresh (off the event loop)
+- Incremental: ingestion applies each document's graph delta (new entities,
+  relations, episodes, mentions) to the cached counts; clearing the graph
+  resets them
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.integrations.neo4j import neo4j_client
+
+logger = logging.getLogger('diveteacher.graph_stats')
+
+# Graphiti labels / relationship types
+ENTITY_LABEL = "Entity"
+EPISODE_LABEL = "Episodic"
+RELATION_TYPE = "RELATES_TO"
+MENTION_TYPE = "MENTIONS"
+
+
+def _quote(name: str) -> str:
+    """Backtick-quote a label / relationship type for Cypher"""
+    return "`" + name.replace("`", "``") + "`"
+
+
+class GraphStatsService:
+    """
+    Cached node / relationship counts (total, by label, by type), plus the
+    Neo4j version and index list for the management endpoint
+    """
+
+    def __init__(self, ttl_sec: float):
+        self.ttl_sec = ttl_sec
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._computed_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._changed_during_refresh = False
+        self._refreshes = 0
+
+    # ═══════════════════════════════════════════════════════════
+    # Refresh (count store)
+    # ═══════════════════════════════════════════════════════════
+
+    @staticmethod
+    def _query(cypher: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        neo4j_client.connect()
+        records, _, _ = neo4j_client.driver.execute_query(
+            cypher,
+            parameters_=parameters,
+            database_=neo4j_client.database
+        )
+        return [dict(record) for record in records]
+
+    def _compute(self) -> Dict[str, Any]:
+        labels = [row["label"] for row in self._query("CALL db.labels() YIELD label RETURN label")]
+        types = [
+            row["relationshipType"]
+            for row in self._query("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")
+        ]
+
+        # Every branch is a count-store lookup (single label / type, no predicate)
+        branches = [
+            "MATCH (n) RETURN 'node' AS kind, '' AS name, count(n) AS count",
+            "MATCH ()-[r]->() RETURN 'rel' AS kind, '' AS name, count(r) AS count",
+        ]
+        branches += [
+            f"MATCH (n:{_quote(label)}) RETURN 'label' AS kind, $labels[{i}] AS name, count(n) AS count"
+            for i, label in enumerate(labels)
+        ]
+        branches += [
+            f"MATCH ()-[r:{_quote(rel_type)}]->() RETURN 'type' AS kind, $types[{i}] AS name, count(r) AS count"
+            for i, rel_type in enumerate(types)
+        ]
+
+        nodes_total = rels_total = 0
+        by_label: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        for row in self._query("\nUNION ALL\n".join(branches), {"labels": labels, "types": types}):
+            if row["kind"] == "node":
+                nodes_total = row["count"]
+            elif row["kind"] == "rel":
+                rels_total = row["count"]
+            elif row["kind"] == "label":
+                by_label[row["name"]] = row["count"]
+            else:
+                by_type[row["name"]] = row["count"]
+
+        version_rows = self._query("CALL dbms.components() YIELD versions RETURN versions")
+        indexes = [
+            {
+                "name": row.get("name", ""),
+                "type": row.get("type", ""),
+                "state": row.get("state", ""),
+                "labels": row.get("labelsOrTypes", []),
+                "properties": row.get("properties", []),
+            }
+            for row in self._query("SHOW INDEXES")
+        ]
+
+        return {
+            "version": version_rows[0]["versions"][0] if version_rows else "unknown",
+            "database": neo4j_client.database,
+            "nodes": {"total": nodes_total, "by_label": dict(sorted(by_label.items(), key=lambda item: -item[1]))},
+            "relationships": {"total": rels_total, "by_type": dict(sorted(by_type.items(), key=lambda item: -item[1]))},
+            "indexes": {
+                "total": len(indexes),
+                "types": sorted({index["type"] for index in indexes}),
+                "details": indexes,
+            },
+        }
+
+    async def _refresh(self) -> None:
+        self._changed_during_refresh = False
+        snapshot = await asyncio.to_thread(self._compute)
+        self._snapshot = snapshot
+        # A delta applied mid-refresh may or may not be in the result: recount next call
+        self._computed_at = 0.0 if self._changed_during_refresh else time.monotonic()
+        self._refreshes += 1
+        logger.info(
+            f"📊 Graph stats refreshed: {snapshot['nodes']['total']} nodes, "
+            f"{snapshot['relationships']['total']} relationships"
+        )
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Current graph statistics (cached up to ttl_sec)
+
+        Returns:
+            {version, database, nodes: {total, by_label},
+            relationships: {total, by_type}, indexes: {...}, age_sec}
+        """
+        if self._snapshot is None or time.monotonic() - self._computed_at > self.ttl_sec:
+            # Single flight: concurrent callers await the same refresh
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh())
+            await asyncio.shield(self._refresh_task)
+
+        age = time.monotonic() - self._computed_at if self._computed_at else 0.0
+        return {**self._snapshot, "age_sec": round(age, 1)}
+
+    # ═══════════════════════════════════════════════════════════
+    # Incremental updates
+    # ═══════════════════════════════════════════════════════════
+
+    def apply_ingestion_delta(self, graph_delta: Optional[Dict[str, Any]]) -> None:
+        """
+        Add one ingestion's new graph elements to the cached counts
+
+        Args:
+            graph_delta: Ingestion summary graph_delta (entities_created,
+                relations_created, episodes_created, mentions_created, exact)
+        """
+        if not graph_delta:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._changed_during_refresh = True
+            return
+        if self._snapshot is None:
+            return
+        if not graph_delta.get("exact", True):
+            self.invalidate()
+            return
+
+        nodes = self._snapshot["nodes"]
+        relationships = self._snapshot["relationships"]
+        for label, count in (
+            (ENTITY_LABEL, graph_delta.get("entities_created", 0)),
+            (EPISODE_LABEL, graph_delta.get("episodes_created", 0)),
+        ):
+            if count:
+                nodes["by_label"][label] = nodes["by_label"].get(label, 0) + count
+                nodes["total"] += count
+        for rel_type, count in (
+            (RELATION_TYPE, graph_delta.get("relations_created", 0)),
+            (MENTION_TYPE, graph_delta.get("mentions_created", 0)),
+        ):
+            if count:
+                relationships["by_type"][rel_type] = relationships["by_type"].get(rel_type, 0) + count
+                relationships["total"] += count
+
+    def reset_counts(self) -> None:
+        """The graph was cleared: every count drops to zero"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._changed_during_refresh = True
+        if self._snapshot is not None:
+            self._snapshot["nodes"] = {"total": 0, "by_label": {}}
+            self._snapshot["relationships"] = {"total": 0, "by_type": {}}
+
+    def invalidate(self) -> None:
+        """Recount on the next call (also after a refresh already running)"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._changed_during_refresh = True
+        self._computed_at = 0.0
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {
+            "cached": self._snapshot is not None,
+            "age_sec": round(time.monotonic() - self._computed_at, 1) if self._computed_at else None,
+            "ttl_sec": self.ttl_sec,
+            "refreshes": self._refreshes,
+        }
+
+
+_graph_stats_service: Optional[GraphStatsService] = None
+
+
+def get_graph_stats_service() -> GraphStatsService:
+    """Get or create the graph statistics service singleton"""
+    global _graph_stats_service
+
+    if _graph_stats_service is None:
+        _graph_stats_service = GraphStatsService(ttl_sec=settings.GRAPH_STATS_TTL_SEC)
+    return _graph_stats_service
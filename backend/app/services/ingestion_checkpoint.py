@@ -0,0 +1,374 @@
+"""
+Durable Ingestion Checkpoints (SQLite)
+
+Persists every document's pipeline state so a backend restart doesn't lose
+50-80 minutes of ingestion:
+- Document row: file path, upload metadata, pipeline status
+- Chunk rows: chunk dict (chunking output) + per-chunk completion state
+
+Lifecycle:
+    queued → chunked (chunks saved) → completed | failed
+- Streamed pipeline: chunks are appended as they are produced and the
+  document becomes "chunked" when the chunker finishes
+- Rewriting a chunk row (reconversion after an interruption before the
+  document was "chunked") keeps its done flag when the chunk is unchanged
+- On startup, documents still "queued" or "chunked" are re-enqueued
+- A "chunked" document resumes from its first incomplete chunk, reusing the
+  saved chunks (no reconversion, no rechunking)
+- Completed documents drop their chunk rows (bounded storage)
+
+Dead letters:
+- Chunks that still fail after retries are stored with their payload, the
+  document metadata and the last error, until a retry succeeds
+  (POST /api/upload/{upload_id}/retry-failed)
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger('diveteacher.checkpoint')
+
+
+class IngestionCheckpointStore:
+    """
+    SQLite-backed checkpoint store for the document pipeline.
+
+    Thread-safe (one connection guarded by a lock). Calls are short; async
+    callers wrap them in asyncio.to_thread().
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the checkpoint database.
+
+        Args:
+            path: SQLite file path (parent directory is created if needed)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                upload_id TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                status TEXT NOT NULL,
+                doc_metadata TEXT,
+                chunks_total INTEGER,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                upload_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                chunk TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (upload_id, position)
+            );
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                upload_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                chunk TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                error_type TEXT NOT NULL,
+                error TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                failures INTEGER NOT NULL DEFAULT 1,
+                failed_at REAL NOT NULL,
+                PRIMARY KEY (upload_id, chunk_index)
+            );
+            CREATE INDEX IF NOT EXISTS idx_documents_status ON documents(status);
+            """
+        )
+
+        logger.info(f"💾 Ingestion checkpoints: {path}")
+
+    def register_document(self, upload_id: str, file_path: str, metadata: Dict[str, Any]) -> None:
+        """
+        Record a newly queued document (status: queued)
+
+        Note:
+            A document still queued or chunked keeps its row (saved chunks,
+            doc_metadata, chunks_total): registering it again must not undo
+            a resumable checkpoint. Finished rows are reset to queued.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO documents "
+                "(upload_id, file_path, metadata, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?) "
+                "ON CONFLICT(upload_id) DO UPDATE SET "
+                "file_path = excluded.file_path, metadata = excluded.metadata, status = 'queued', "
+                "doc_metadata = NULL, chunks_total = NULL, updated_at = excluded.updated_at "
+                "WHERE documents.status IN ('completed', 'failed')",
+                (upload_id, file_path, json.dumps(metadata, default=str), now, now)
+            )
+
+    def save_chunks(
+        self,
+        upload_id: str,
+        chunks: List[Dict[str, Any]],
+        doc_metadata: Dict[str, Any]
+    ) -> List[int]:
+        """
+        Persist chunking output (status: chunked)
+
+        Returns:
+            Positions already ingested by an interrupted run (unchanged chunks)
+        """
+        rows = [(upload_id, position, json.dumps(chunk, default=str)) for position, chunk in enumerate(chunks)]
+        doc_metadata_json = json.dumps(doc_metadata, default=str)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                done_positions = self._write_chunks(upload_id, rows)
+                self._conn.execute(
+                    "DELETE FROM chunks WHERE upload_id = ? AND position >= ?", (upload_id, len(chunks))
+                )
+                self._conn.execute(
+                    "UPDATE documents SET status = 'chunked', doc_metadata = ?, chunks_total = ?, updated_at = ? "
+                    "WHERE upload_id = ?",
+                    (doc_metadata_json, len(chunks), time.time(), upload_id)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return done_positions
+
+    def append_chunks(self, upload_id: str, start_position: int, chunks: List[Dict[str, Any]]) -> List[int]:
+        """
+        Persist chunks as a streamed chunker produces them (status unchanged)
+
+        Returns:
+            Positions already ingested by an interrupted run (unchanged chunks)
+        """
+        rows = [
+            (upload_id, start_position + offset, json.dumps(chunk, default=str))
+            for offset, chunk in enumerate(chunks)
+        ]
+        with self._lock:
+            return self._write_chunks(upload_id, rows)
+
+    def _write_chunks(self, upload_id: str, rows: List[Tuple[str, int, str]]) -> List[int]:
+        # Caller holds the lock. A done row stays done only if its chunk is unchanged
+        self._conn.executemany(
+            "INSERT INTO chunks (upload_id, position, chunk, done) VALUES (?, ?, ?, 0) "
+            "ON CONFLICT(upload_id, position) DO UPDATE SET "
+            "done = (chunks.done AND chunks.chunk = excluded.chunk), chunk = excluded.chunk",
+            rows
+        )
+        if not rows:
+            return []
+        return [
+            position for (position,) in self._conn.execute(
+                "SELECT position FROM chunks WHERE upload_id = ? AND position BETWEEN ? AND ? AND done = 1 "
+                "ORDER BY position",
+                (upload_id, rows[0][1], rows[-1][1])
+            )
+        ]
+
+    def complete_chunking(self, upload_id: str, chunks_total: int, doc_metadata: Dict[str, Any]) -> None:
+        """Close a streamed chunking run (status: chunked, done flags kept)"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                # Rows past the end were left by an interrupted run of a longer stream
+                self._conn.execute(
+                    "DELETE FROM chunks WHERE upload_id = ? AND position >= ?", (upload_id, chunks_total)
+                )
+                self._conn.execute(
+                    "UPDATE documents SET status = 'chunked', doc_metadata = ?, chunks_total = ?, updated_at = ? "
+                    "WHERE upload_id = ?",
+                    (json.dumps(doc_metadata, default=str), chunks_total, time.time(), upload_id)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load_chunks(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load saved chunking output for a resumable document.
+
+        Returns:
+            {"chunks", "done_positions", "doc_metadata"} or None if the
+            document was never chunked
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, doc_metadata FROM documents WHERE upload_id = ?",
+                (upload_id,)
+            ).fetchone()
+            if not row or row[0] != "chunked":
+                return None
+
+            rows = self._conn.execute(
+                "SELECT position, chunk, done FROM chunks WHERE upload_id = ? ORDER BY position",
+                (upload_id,)
+            ).fetchall()
+
+        return {
+            "chunks": [json.loads(chunk) for _, chunk, _ in rows],
+            "done_positions": {position for position, _, done in rows if done},
+            "doc_metadata": json.loads(row[1]) if row[1] else {},
+        }
+
+    def mark_chunks_done(self, upload_id: str, positions: List[int]) -> None:
+        """Mark chunks as ingested (called as ingestion proceeds)"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE chunks SET done = 1 WHERE upload_id = ? AND position = ?",
+                [(upload_id, position) for position in positions]
+            )
+
+    def finish_document(self, upload_id: str, status: str) -> None:
+        """Close a document (completed | failed) and drop its chunk rows"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM chunks WHERE upload_id = ?", (upload_id,))
+                self._conn.execute(
+                    "UPDATE documents SET status = ?, updated_at = ? WHERE upload_id = ?",
+                    (status, time.time(), upload_id)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_interrupted_documents(self) -> List[Dict[str, Any]]:
+        """Documents queued or mid-ingestion when the process stopped (oldest first)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT upload_id, file_path, metadata, status, chunks_total FROM documents "
+                "WHERE status IN ('queued', 'chunked') ORDER BY created_at"
+            ).fetchall()
+
+        return [
+            {
+                "upload_id": upload_id,
+                "file_path": file_path,
+                "metadata": json.loads(metadata),
+                "status": status,
+                "chunks_total": chunks_total,
+            }
+            for upload_id, file_path, metadata, status, chunks_total in rows
+        ]
+
+    # ════════════════════════════════════════════════════════
+    # Dead letters (chunks that failed after every retry)
+    # ════════════════════════════════════════════════════════
+
+    def add_dead_letters(
+        self,
+        upload_id: str,
+        metadata: Dict[str, Any],
+        failures: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Store (or refresh) failed chunks.
+
+        Args:
+            upload_id: Upload identifier
+            metadata: Document-level ingestion metadata (filename, user_id, ...)
+            failures: [{"chunk", "error_type", "error", "attempts"}]
+        """
+        now = time.time()
+        metadata_json = json.dumps(metadata, default=str)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO dead_letters "
+                "(upload_id, chunk_index, chunk, metadata, error_type, error, attempts, failed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(upload_id, chunk_index) DO UPDATE SET "
+                "error_type = excluded.error_type, error = excluded.error, "
+                "attempts = excluded.attempts, failures = failures + 1, failed_at = excluded.failed_at",
+                [
+                    (
+                        upload_id,
+                        failure["chunk"]["index"],
+                        json.dumps(failure["chunk"], default=str),
+                        metadata_json,
+                        failure["error_type"],
+                        failure["error"],
+                        failure["attempts"],
+                        now,
+                    )
+                    for failure in failures
+                ]
+            )
+
+    def get_dead_letters(self, upload_id: str) -> List[Dict[str, Any]]:
+        """Failed chunks of an upload, in chunk order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_index, chunk, metadata, error_type, error, attempts, failures, failed_at "
+                "FROM dead_letters WHERE upload_id = ? ORDER BY chunk_index",
+                (upload_id,)
+            ).fetchall()
+
+        return [
+            {
+                "chunk_index": chunk_index,
+                "chunk": json.loads(chunk),
+                "metadata": json.loads(metadata),
+                "error_type": error_type,
+                "error": error,
+                "attempts": attempts,
+                "failures": failures,
+                "failed_at": failed_at,
+            }
+            for chunk_index, chunk, metadata, error_type, error, attempts, failures, failed_at in rows
+        ]
+
+    def remove_dead_letters(self, upload_id: str, chunk_indexes: List[int]) -> None:
+        """Drop dead letters once their chunks are ingested"""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM dead_letters WHERE upload_id = ? AND chunk_index = ?",
+                [(upload_id, chunk_index) for chunk_index in chunk_indexes]
+            )
+
+    def count_dead_letters(self, upload_id: str) -> int:
+        """Number of failed chunks waiting for a retry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM dead_letters WHERE upload_id = ?",
+                (upload_id,)
+            ).fetchone()
+        return row[0]
+
+
+# Global checkpoint store (singleton pattern)
+_checkpoint_store: Optional[IngestionCheckpointStore] = None
+
+
+def get_checkpoint_store() -> IngestionCheckpointStore:
+    """
+    Get or create the checkpoint store singleton
+
+    Note:
+        - File: {STATE_DIR}/ingestion_checkpoints.sqlite (uploads volume)
+    """
+    global _checkpoint_store
+
+    if _checkpoint_store is None:
+        _checkpoint_store = IngestionCheckpointStore(f"{settings.STATE_DIR}/ingestion_checkpoints.sqlite")
+
+    return _checkpoint_store
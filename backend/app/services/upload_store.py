@@ -0,0 +1,401 @@
+"""
+Content-Addressed Upload Store (SQLite index + files on the uploads volume)
+
+Uploaded files used to be kept forever as {upload_id}_{filename}, and the
+same file uploaded twice was stored and processed twice. Files are now keyed
+by their SHA-256:
+- Path: {UPLOAD_DIR}/objects/{sha[:2]}/{sha}/{filename} (first filename kept,
+  so Path(file_path).name still names the document)
+- Duplicate upload (same hash, not failed) → existing upload_id returned,
+  nothing enqueued
+- Retention: source file removed after UPLOAD_RETENTION_DAYS, or right
+  after successful processing when UPLOAD_DELETE_AFTER_SUCCESS is set (off
+  by default: the file stays available for re-processing)
+- The hash row outlives the file: a re-upload of a processed document is
+  still detected as a duplicate
+
+Lifecycle:
+    queued → completed | failed (a failed hash can be uploaded again)
+
+Resumable upload sessions (POST/PUT /api/upload/sessions):
+- Bytes are appended to {UPLOAD_DIR}/.incoming/{session_id}; the received
+  offset is the size of that file (survives a backend restart)
+- Sessions idle for UPLOAD_SESSION_TTL_HOURS are dropped by the sweep
+"""
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger('diveteacher.upload_store')
+
+# Pre-store uploads: {upload_id}_{filename} in UPLOAD_DIR (retention sweep only)
+_LEGACY_UPLOAD = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_")
+
+
+class UploadStore:
+    """
+    Content-addressed upload index.
+
+    Thread-safe (one connection guarded by a lock). Calls are short; async
+    callers wrap them in asyncio.to_thread().
+    """
+
+    def __init__(self, path: str, upload_dir: str):
+        """
+        Open (or create) the upload index.
+
+        Args:
+            path: SQLite file path (parent directory is created if needed)
+            upload_dir: Root of the uploads volume (objects/ and .incoming/ live here)
+        """
+        self.path = path
+        self.upload_dir = upload_dir
+        self.objects_dir = os.path.join(upload_dir, "objects")
+        self.incoming_dir = os.path.join(upload_dir, ".incoming")
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+        for directory in (os.path.dirname(path), self.objects_dir, self.incoming_dir):
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                sha256 TEXT PRIMARY KEY,
+                upload_id TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                file_path TEXT,
+                size_bytes INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                file_deleted_at REAL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_uploads_upload_id ON uploads(upload_id);
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                content_type TEXT,
+                profile TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+
+        logger.info(f"💾 Upload store: {path}")
+
+    def incoming_path(self, upload_id: str) -> str:
+        """Landing path of a streamed upload (before its hash is known)"""
+        return os.path.join(self.incoming_dir, upload_id)
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Upload row for a content hash, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, upload_id, filename, file_path, size_bytes, status, created_at, file_deleted_at "
+                "FROM uploads WHERE sha256 = ?",
+                (sha256,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("sha256", "upload_id", "filename", "file_path", "size_bytes", "status", "created_at", "file_deleted_at")
+        return dict(zip(keys, row))
+
+    def claim(
+        self,
+        sha256: str,
+        upload_id: str,
+        filename: str,
+        size_bytes: int,
+        live_upload_ids: Optional[set] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Register an upload for a content hash, unless it duplicates one
+
+        Args:
+            sha256: Content hash
+            upload_id: New upload ID
+            filename: Original filename
+            size_bytes: File size
+            live_upload_ids: Upload IDs this process is tracking (queued or
+                processing); a "queued" row outside this set was lost in a
+                restart and is taken over
+
+        Returns:
+            Existing row when the content is a duplicate (completed, or
+            queued/processing in this process), else None (claimed)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT upload_id, filename, file_path, status FROM uploads WHERE sha256 = ?",
+                (sha256,)
+            ).fetchone()
+
+            if row is not None:
+                existing_id, existing_name, existing_path, status = row
+                live = status == "queued" and existing_id in (live_upload_ids or set())
+                if status == "completed" or live:
+                    return {
+                        "sha256": sha256,
+                        "upload_id": existing_id,
+                        "filename": existing_name,
+                        "file_path": existing_path,
+                        "status": status,
+                    }
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploads "
+                "(sha256, upload_id, filename, file_path, size_bytes, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                (sha256, upload_id, filename, row[2] if row else None, size_bytes, now, now)
+            )
+        return None
+
+    def adopt(self, sha256: str, incoming: str, filename: str) -> str:
+        """
+        Move a claimed upload into the object store
+
+        Returns:
+            Final file path (an existing object of the same hash is reused
+            and the incoming copy dropped)
+        """
+        row = self.get(sha256)
+        if row and row["file_path"] and os.path.exists(row["file_path"]):
+            os.unlink(incoming)
+            return row["file_path"]
+
+        object_dir = os.path.join(self.objects_dir, sha256[:2], sha256)
+        os.makedirs(object_dir, exist_ok=True)
+        file_path = os.path.join(object_dir, os.path.basename(filename))
+        os.replace(incoming, file_path)
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE uploads SET file_path = ?, file_deleted_at = NULL, updated_at = ? WHERE sha256 = ?",
+                (file_path, time.time(), sha256)
+            )
+        return file_path
+
+    def mark_finished(self, upload_id: str, succeeded: bool) -> None:
+        """
+        Record the pipeline outcome (completed | failed)
+
+        Note:
+            Successful uploads drop their source file when
+            UPLOAD_DELETE_AFTER_SUCCESS is set (the content is in the graph,
+            the converted document in the conversion cache)
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE uploads SET status = ?, updated_at = ? WHERE upload_id = ?",
+                ("completed" if succeeded else "failed", time.time(), upload_id)
+            )
+            row = self._conn.execute(
+                "SELECT sha256, file_path FROM uploads WHERE upload_id = ? AND file_deleted_at IS NULL",
+                (upload_id,)
+            ).fetchone()
+
+        if succeeded and settings.UPLOAD_DELETE_AFTER_SUCCESS and row and row[1]:
+            self._delete_file(row[0], row[1])
+
+    def sweep(self, retention_days: int) -> int:
+        """
+        Delete source files older than retention_days (finished uploads only)
+
+        Also removes pre-store {upload_id}_{filename} files from UPLOAD_DIR
+        and stale .incoming/ leftovers.
+
+        Returns:
+            Number of files deleted
+        """
+        if retention_days <= 0:
+            return 0
+
+        cutoff = time.time() - retention_days * 86400
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sha256, file_path FROM uploads "
+                "WHERE status IN ('completed', 'failed') AND file_deleted_at IS NULL "
+                "AND file_path IS NOT NULL AND updated_at < ?",
+                (cutoff,)
+            ).fetchall()
+
+        deleted = sum(self._delete_file(sha256, file_path) for sha256, file_path in rows)
+
+        for directory, pattern in ((self.upload_dir, _LEGACY_UPLOAD), (self.incoming_dir, None)):
+            for entry in os.scandir(directory):
+                if not entry.is_file() or (pattern and not pattern.match(entry.name)):
+                    continue
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    deleted += 1
+
+        if deleted:
+            logger.info(f"🗑️  Upload retention: {deleted} file(s) older than {retention_days} days removed")
+        return deleted
+
+    # ═══════════════════════════════════════════════════════════
+    # Resumable upload sessions
+    # ═══════════════════════════════════════════════════════════
+
+    def create_session(
+        self,
+        session_id: str,
+        filename: str,
+        size_bytes: int,
+        content_type: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> None:
+        """Open a resumable upload session (empty partial file)"""
+        now = time.time()
+        open(self.incoming_path(session_id), "wb").close()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, filename, size_bytes, content_type, profile, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_id, filename, size_bytes, content_type, profile, now, now)
+            )
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Session row + received offset, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT session_id, filename, size_bytes, content_type, profile, created_at, updated_at "
+                "FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        keys = ("session_id", "filename", "size_bytes", "content_type", "profile", "created_at", "updated_at")
+        session = dict(zip(keys, row))
+        try:
+            session["offset"] = os.path.getsize(self.incoming_path(session_id))
+        except FileNotFoundError:
+            session["offset"] = 0
+        return session
+
+    def touch_session(self, session_id: str) -> None:
+        """Record activity (keeps the session out of the TTL sweep)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE sessions SET updated_at = ? WHERE session_id = ?",
+                (time.time(), session_id)
+            )
+
+    def delete_session(self, session_id: str, remove_file: bool = True) -> None:
+        """Close a session (finalized or aborted)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        if remove_file:
+            try:
+                os.unlink(self.incoming_path(session_id))
+            except FileNotFoundError:
+                pass
+
+    def expire_sessions(self, ttl_hours: int) -> int:
+        """Drop sessions idle for more than ttl_hours (and their partial files)"""
+        cutoff = time.time() - ttl_hours * 3600
+        with self._lock:
+            expired = [
+                row[0] for row in self._conn.execute(
+                    "SELECT session_id FROM sessions WHERE updated_at < ?", (cutoff,)
+                ).fetchall()
+            ]
+        for session_id in expired:
+            self.delete_session(session_id)
+
+        if expired:
+            logger.info(f"🗑️  Upload sessions: {len(expired)} idle session(s) expired")
+        return len(expired)
+
+    def maybe_sweep(self, interval_sec: int = 3600) -> int:
+        """Expire idle sessions and run sweep(UPLOAD_RETENTION_DAYS), at most once per interval"""
+        if time.time() - self._last_sweep < interval_sec:
+            return 0
+        self._last_sweep = time.time()
+        return self.expire_sessions(settings.UPLOAD_SESSION_TTL_HOURS) + self.sweep(settings.UPLOAD_RETENTION_DAYS)
+
+    def _delete_file(self, sha256: str, file_path: str) -> bool:
+        """
+        Remove an object file and record it
+
+        Returns:
+            True if the file was deleted (an already missing file is recorded
+            but not counted; a file that could not be deleted is left for the
+            next sweep)
+        """
+        try:
+            os.unlink(file_path)
+            deleted = True
+        except FileNotFoundError:
+            deleted = False
+        except OSError as e:
+            logger.warning(f"⚠️  Could not delete {file_path}: {e}")
+            return False
+
+        try:
+            os.rmdir(os.path.dirname(file_path))
+        except OSError:
+            pass  # Object directory not empty
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE uploads SET file_deleted_at = ? WHERE sha256 = ?",
+                (time.time(), sha256)
+            )
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Stored files and disk usage of the uploads volume"""
+        with self._lock:
+            stored_files, stored_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM uploads WHERE file_deleted_at IS NULL "
+                "AND file_path IS NOT NULL"
+            ).fetchone()
+            known_hashes = self._conn.execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+
+        usage = shutil.disk_usage(self.upload_dir)
+        return {
+            "stored_files": stored_files,
+            "stored_mb": round(stored_bytes / (1024 * 1024), 2),
+            "known_hashes": known_hashes,
+            "disk_total_gb": round(usage.total / 1024 ** 3, 2),
+            "disk_used_gb": round(usage.used / 1024 ** 3, 2),
+            "disk_free_gb": round(usage.free / 1024 ** 3, 2),
+            "disk_used_pct": round(usage.used / usage.total * 100, 1) if usage.total else None,
+        }
+
+
+# Global upload store (singleton pattern)
+_upload_store: Optional[UploadStore] = None
+
+
+def get_upload_store() -> UploadStore:
+    """
+    Get or create the upload store singleton
+
+    Note:
+        - Index: {STATE_DIR}/uploads.sqlite
+        - Files: {UPLOAD_DIR}/objects/
+    """
+    global _upload_store
+
+    if _upload_store is None:
+        _upload_store = UploadStore(f"{settings.STATE_DIR}/uploads.sqlite", settings.UPLOAD_DIR)
+
+    return _upload_store
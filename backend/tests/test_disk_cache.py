@@ -0,0 +1,67 @@
+"""
+Unit Tests for DiskCache (persistent SQLite LRU cache)
+
+Used by the embedding and LLM response caches.
+"""
+import time
+
+import pytest
+
+from app.core.disk_cache import DiskCache, content_key
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "test.sqlite")
+
+
+class TestDiskCache:
+    """Test suite for DiskCache"""
+
+    def test_set_get_roundtrip(self, cache_path):
+        cache = DiskCache(cache_path, max_bytes=1024 * 1024)
+        cache.set("a", b"alpha")
+
+        assert cache.get("a") == b"alpha"
+        assert cache.get("missing") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_persists_across_instances(self, cache_path):
+        cache = DiskCache(cache_path, max_bytes=1024 * 1024)
+        cache.set_many({"a": b"1", "b": b"2"})
+        cache.close()
+
+        reopened = DiskCache(cache_path, max_bytes=1024 * 1024)
+        assert reopened.get_many(["a", "b", "c"]) == {"a": b"1", "b": b"2"}
+
+    def test_lru_eviction_keeps_recent_entries(self, cache_path):
+        cache = DiskCache(cache_path, max_bytes=300)
+        cache.set("old", b"x" * 100)
+        time.sleep(0.01)
+        cache.set("recent", b"x" * 100)
+        time.sleep(0.01)
+        cache.get("old")  # Touch: "recent" is now least recently used
+        time.sleep(0.01)
+        cache.set("new", b"x" * 150)
+
+        assert cache.get("recent") is None
+        assert cache.get("old") is not None
+        assert cache.get("new") is not None
+        assert cache.get_stats()["evictions"] >= 1
+
+    def test_ttl_expiry(self, cache_path):
+        cache = DiskCache(cache_path, max_bytes=1024, ttl_seconds=0)
+        cache.set("a", b"1")
+        time.sleep(0.01)
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["entries"] == 0
+
+
+def test_content_key_is_stable_and_separated():
+    assert content_key("model", "1536", "text") == content_key("model", "1536", "text")
+    assert content_key("ab", "c") != content_key("a", "bc")
@@ -0,0 +1,154 @@
+"""
+Unit Tests for the pre-flight document analyzer (OCR decision, estimate, profile)
+
+Throughput history is reset for every test, so estimates use the static
+defaults unless a test records observed throughput.
+"""
+import zipfile
+
+import pytest
+
+from app.core.config import settings
+from app.integrations import dockling
+from app.services import document_analyzer
+from app.services.document_analyzer import (
+    DEFAULT_INGESTION_SECONDS_PER_CHUNK,
+    analyze_document,
+    estimate_cost,
+    page_needs_ocr,
+    recommend_profile,
+    record_ingestion_throughput,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_history(monkeypatch):
+    monkeypatch.setattr(
+        document_analyzer, "_ingestion_history", {"chunks": 0, "seconds": 0.0, "documents": 0}
+    )
+    monkeypatch.setattr(dockling, "get_conversion_throughput", lambda: {})
+    monkeypatch.setattr(settings, "DOCLING_MAX_TOKENS", 500)
+    monkeypatch.setattr(settings, "GRAPHITI_INGEST_CONCURRENCY", 3)
+    monkeypatch.setattr(settings, "GRAPHITI_ESTIMATED_TOKENS_PER_CHUNK", 4000)
+    monkeypatch.setattr(settings, "DOCLING_TIMEOUT", 900)
+
+
+def pdf_analysis(pages=10, ocr_pages=(), text_chars=20_000, landscape=False):
+    return {
+        "format": "pdf",
+        "pages": pages,
+        "text_chars": text_chars,
+        "pages_needing_ocr": list(ocr_pages),
+        "landscape": landscape,
+    }
+
+
+class TestPageNeedsOcr:
+    """Test suite for page_needs_ocr"""
+
+    def test_text_page(self):
+        assert page_needs_ocr(text_chars=1200, image_coverage=0.1) is False
+
+    def test_thin_text_layer(self):
+        assert page_needs_ocr(text_chars=settings.DOCLING_OCR_MIN_TEXT_CHARS - 1, image_coverage=0.0) is True
+
+    def test_mostly_pictures(self):
+        assert page_needs_ocr(text_chars=1200, image_coverage=settings.DOCLING_OCR_IMAGE_COVERAGE + 0.1) is True
+
+    def test_thresholds_are_exclusive(self):
+        assert page_needs_ocr(settings.DOCLING_OCR_MIN_TEXT_CHARS, settings.DOCLING_OCR_IMAGE_COVERAGE) is False
+
+
+class TestEstimateCost:
+    """Test suite for estimate_cost"""
+
+    def test_default_estimate(self):
+        estimate = estimate_cost(pdf_analysis(pages=10, ocr_pages=[3, 4], text_chars=20_000))
+
+        # 2 OCR pages at 3.0s + 8 text pages at 0.8s
+        assert estimate["conversion_sec"] == 12.4
+        # (20 000 + 2 scanned pages × 1 800) chars / 4 per token / 500 per chunk
+        assert estimate["chunks"] == 12
+        assert estimate["llm_tokens"] == 12 * 4000
+        assert estimate["ingestion_sec"] == round(12 * DEFAULT_INGESTION_SECONDS_PER_CHUNK / 3, 1)
+        assert estimate["total_sec"] == round(12.4 + estimate["ingestion_sec"], 1)
+        assert estimate["from_history"] is False
+
+    def test_empty_document_is_one_chunk(self):
+        estimate = estimate_cost({"format": "pdf", "pages": None, "text_chars": None})
+
+        assert estimate["chunks"] == 1
+        assert estimate["conversion_sec"] == 0.8
+
+    def test_office_documents(self):
+        assert estimate_cost({"format": "pptx", "pages": 40, "text_chars": 8000})["conversion_sec"] == 2.0
+
+    def test_observed_ingestion_throughput(self):
+        for _ in range(3):
+            record_ingestion_throughput(chunks=10, seconds=20.0)
+
+        estimate = estimate_cost(pdf_analysis(text_chars=4000))
+
+        assert estimate["ingestion_sec"] == estimate["chunks"] * 2.0
+        assert estimate["from_history"] is True
+
+    def test_observed_conversion_throughput(self, monkeypatch):
+        monkeypatch.setattr(
+            dockling, "get_conversion_throughput", lambda: {"pdf": {"documents": 3, "pages_per_sec": 2.0}}
+        )
+
+        estimate = estimate_cost(pdf_analysis(pages=10, ocr_pages=[1]))
+
+        assert estimate["conversion_sec"] == 5.0
+        assert estimate["from_history"] is True
+
+
+class TestRecommendProfile:
+    """Test suite for recommend_profile ("auto" conversion profile)"""
+
+    def test_pptx_is_fast(self):
+        analysis = {"format": "pptx", "pages": 40, "landscape": True}
+        assert recommend_profile(analysis, estimate_cost(analysis)) == "fast"
+
+    def test_docx_is_balanced(self):
+        analysis = {"format": "docx", "pages": None}
+        assert recommend_profile(analysis, estimate_cost(analysis)) == "balanced"
+
+    def test_landscape_pdf_is_balanced(self):
+        analysis = pdf_analysis(landscape=True)
+        assert recommend_profile(analysis, estimate_cost(analysis)) == "balanced"
+
+    def test_pdf_near_timeout_is_balanced(self):
+        # 300 scanned pages at 3.0s = 900s > 80% of DOCLING_TIMEOUT
+        analysis = pdf_analysis(pages=300, ocr_pages=range(1, 301))
+        assert recommend_profile(analysis, estimate_cost(analysis)) == "balanced"
+
+    def test_manual_is_accurate(self):
+        analysis = pdf_analysis(pages=120, ocr_pages=range(1, 11))
+        assert recommend_profile(analysis, estimate_cost(analysis)) == "accurate"
+
+
+class TestAnalyzeOffice:
+    """Test suite for analyze_document on DOCX/PPTX containers"""
+
+    def test_pptx_slides_and_text(self, tmp_path):
+        path = tmp_path / "briefing.pptx"
+        with zipfile.ZipFile(path, "w") as archive:
+            for index in (1, 2):
+                archive.writestr(f"ppt/slides/slide{index}.xml", f"<p:sld><a:t>Slide {index}</a:t></p:sld>")
+
+        analysis = analyze_document(str(path))
+
+        assert analysis["pages"] == 2
+        assert analysis["text_chars"] == len("Slide 1") * 2
+        assert analysis["landscape"] is True
+        assert analysis["recommended_profile"] == "fast"
+
+    def test_unreadable_container(self, tmp_path):
+        path = tmp_path / "broken.docx"
+        path.write_bytes(b"not a zip")
+
+        analysis = analyze_document(str(path))
+
+        assert analysis["readable"] is False
+        assert "estimate" not in analysis
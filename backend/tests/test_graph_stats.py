@@ -0,0 +1,227 @@
+"""
+Unit Tests for the cached graph statistics service
+
+The count-store queries are replaced by a fixed snapshot; tests run the
+coroutines with asyncio.run.
+"""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import neo4j
+from app.services.graph_stats import GraphStatsService
+
+
+def snapshot(entities=10, episodes=4, relations=20, mentions=8):
+    return {
+        "version": "5.26.0",
+        "database": "neo4j",
+        "nodes": {"total": entities + episodes, "by_label": {"Entity": entities, "Episodic": episodes}},
+        "relationships": {
+            "total": relations + mentions,
+            "by_type": {"RELATES_TO": relations, "MENTIONS": mentions},
+        },
+        "indexes": {"total": 0, "types": [], "details": []},
+    }
+
+
+DELTA = {
+    "entities_created": 3,
+    "relations_created": 5,
+    "episodes_created": 2,
+    "mentions_created": 6,
+    "exact": True,
+}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = GraphStatsService(ttl_sec=60)
+    computed = []
+
+    def compute():
+        computed.append(1)
+        return snapshot()
+
+    monkeypatch.setattr(service, "_compute", compute)
+    service.computed = computed
+    return service
+
+
+class TestGraphStatsService:
+    """Test suite for GraphStatsService"""
+
+    def test_snapshot_is_cached(self, service):
+        async def run():
+            await service.get_stats()
+            return await service.get_stats()
+
+        stats = asyncio.run(run())
+        assert stats["nodes"]["total"] == 14
+        assert len(service.computed) == 1
+
+    def test_concurrent_callers_share_one_refresh(self, service):
+        async def run():
+            await asyncio.gather(*(service.get_stats() for _ in range(5)))
+
+        asyncio.run(run())
+        assert len(service.computed) == 1
+
+    def test_exact_delta_is_applied(self, service):
+        async def run():
+            await service.get_stats()
+            service.apply_ingestion_delta(DELTA)
+            return await service.get_stats()
+
+        stats = asyncio.run(run())
+        assert stats["nodes"]["by_label"] == {"Entity": 13, "Episodic": 6}
+        assert stats["nodes"]["total"] == 19
+        assert stats["relationships"]["by_type"] == {"RELATES_TO": 25, "MENTIONS": 14}
+        assert stats["relationships"]["total"] == 39
+        assert len(service.computed) == 1
+
+    def test_inexact_delta_forces_recount(self, service):
+        async def run():
+            await service.get_stats()
+            service.apply_ingestion_delta({**DELTA, "exact": False})
+            return await service.get_stats()
+
+        stats = asyncio.run(run())
+        assert stats["nodes"]["total"] == 14
+        assert len(service.computed) == 2
+
+    def test_delta_during_refresh_forces_recount(self, service, monkeypatch):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_compute():
+            service.computed.append(1)
+            started.set()
+            release.wait(5)
+            return snapshot()
+
+        monkeypatch.setattr(service, "_compute", slow_compute)
+
+        async def run():
+            refresh = asyncio.create_task(service.get_stats())
+            await asyncio.to_thread(started.wait, 5)
+            # May or may not be in the snapshot being computed: not applied
+            service.apply_ingestion_delta(DELTA)
+            release.set()
+            first = await refresh
+            second = await service.get_stats()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first["nodes"]["total"] == 14
+        assert second["nodes"]["total"] == 14
+        assert len(service.computed) == 2
+
+    def test_invalidate_during_refresh_forces_recount(self, service, monkeypatch):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_compute():
+            service.computed.append(1)
+            started.set()
+            release.wait(5)
+            return snapshot()
+
+        monkeypatch.setattr(service, "_compute", slow_compute)
+
+        async def run():
+            refresh = asyncio.create_task(service.get_stats())
+            await asyncio.to_thread(started.wait, 5)
+            service.invalidate()
+            release.set()
+            await refresh
+            await service.get_stats()
+
+        asyncio.run(run())
+        assert len(service.computed) == 2
+
+    def test_delta_before_first_refresh_is_ignored(self, service):
+        service.apply_ingestion_delta(DELTA)
+
+        assert asyncio.run(service.get_stats())["nodes"]["total"] == 14
+
+    def test_reset_counts(self, service):
+        async def run():
+            await service.get_stats()
+            service.reset_counts()
+            return await service.get_stats()
+
+        stats = asyncio.run(run())
+        assert stats["nodes"] == {"total": 0, "by_label": {}}
+        assert stats["relationships"] == {"total": 0, "by_type": {}}
+        assert stats["version"] == "5.26.0"
+        assert len(service.computed) == 1
+
+
+class FakeResult:
+    """neo4j Result: iterable records, consume() → summary with counters"""
+
+    def __init__(self, contains_updates):
+        self.summary = SimpleNamespace(
+            query_type="w" if contains_updates else "r",
+            counters=SimpleNamespace(contains_updates=contains_updates),
+        )
+
+    def __iter__(self):
+        return iter([])
+
+    def consume(self):
+        return self.summary
+
+
+class FakeSession:
+    def __init__(self, contains_updates):
+        self.contains_updates = contains_updates
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, params):
+        return FakeResult(self.contains_updates)
+
+
+class TestNeo4jQueryEndpoint:
+    """Test suite for POST /neo4j/query (graph stats invalidation)"""
+
+    @pytest.fixture
+    def run_query(self, service, monkeypatch):
+        monkeypatch.setattr(neo4j, "get_graph_stats_service", lambda: service)
+        app = FastAPI()
+        app.include_router(neo4j.router, prefix="/api")
+        client = TestClient(app)
+
+        def run_query(cypher, contains_updates):
+            driver = SimpleNamespace(session=lambda: FakeSession(contains_updates))
+            monkeypatch.setattr(neo4j, "neo4j_client", SimpleNamespace(driver=driver))
+            response = client.post("/api/neo4j/query", json={"cypher": cypher})
+            assert response.status_code == 200
+
+        return run_query
+
+    def test_write_query_invalidates_stats(self, service, run_query):
+        asyncio.run(service.get_stats())
+
+        run_query("MATCH (n:Entity {name: 'x'}) DETACH DELETE n", contains_updates=True)
+
+        asyncio.run(service.get_stats())
+        assert len(service.computed) == 2
+
+    def test_read_query_keeps_cached_stats(self, service, run_query):
+        asyncio.run(service.get_stats())
+
+        run_query("MATCH (n) RETURN count(n) AS count", contains_updates=False)
+
+        asyncio.run(service.get_stats())
+        assert len(service.computed) == 1
@@ -0,0 +1,344 @@
+"""
+Unit Tests for Graphiti chunk ingestion (ingest_chunks_to_graph)
+
+Graphiti and Neo4j are replaced by an in-process fake client; tests run the
+coroutines with asyncio.run.
+"""
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import processor
+from app.core.config import settings
+from app.integrations import graphiti
+from app.services.ingestion_checkpoint import IngestionCheckpointStore
+
+
+class FakeDriver:
+    """Records Cypher queries; answers existing-episode lookups from `episodes`"""
+
+    def __init__(self):
+        self.queries = []
+        self.episodes = {}  # (name, content) → uuid
+
+    async def execute_query(self, query, **params):
+        self.queries.append((query, params))
+        if "RETURN e.uuid" in query:
+            uuid = self.episodes.get((params["name"], params["content"]))
+            return ([{"uuid": uuid}] if uuid else []), None, None
+        return [], None, None
+
+
+class Written:
+    """Planned failure raised after the episode was written (timed out late)"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class FakeGraphiti:
+    """
+    add_episode returning AddEpisodeResults-like objects
+
+    failures: chunk name → exceptions (or Written) raised by successive calls
+    """
+
+    def __init__(self):
+        self.driver = FakeDriver()
+        self.calls = []
+        self.failures = {}
+        self.delay = 0
+        self._uuids = itertools.count()
+
+    async def add_episode(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        uuid = f"episode-{next(self._uuids)}"
+        planned = self.failures.get(kwargs["name"])
+        if planned:
+            error = planned.pop(0)
+            if isinstance(error, Written):
+                self.driver.episodes[(kwargs["name"], kwargs["episode_body"])] = uuid
+                error = error.error
+            raise error
+        return SimpleNamespace(
+            episode=SimpleNamespace(uuid=uuid),
+            nodes=[],
+            edges=[],
+            episodic_edges=[],
+        )
+
+    async def add_episode_bulk(self, raw_episodes, group_id):
+        self.calls.append(raw_episodes)
+        return None  # graphiti-core 0.17: no AddBulkEpisodeResults
+
+
+class FakeLimiter:
+    """Records the token budgets admission waited for"""
+
+    def __init__(self):
+        self.admitted = []
+
+    async def wait_for_capacity(self, tokens):
+        self.admitted.append(tokens)
+
+
+def make_chunks(count):
+    return [
+        {"index": i, "text": f"chunk {i}", "metadata": {"content_hash": f"hash-{i}", "num_tokens": 10}}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeGraphiti()
+
+    async def get_client():
+        return fake
+
+    monkeypatch.setattr(graphiti, "get_graphiti_client", get_client)
+    monkeypatch.setattr(settings, "GRAPHITI_ENABLED", True)
+    monkeypatch.setattr(settings, "GRAPHITI_BULK_INGESTION", False)
+    monkeypatch.setattr(settings, "GRAPHITI_SKIP_INGESTED_CHUNKS", False)
+    monkeypatch.setattr(settings, "GRAPHITI_RETRY_BASE_DELAY_SEC", 0)
+    monkeypatch.setattr(settings, "GRAPHITI_CHUNK_MAX_ATTEMPTS", 3)
+    return fake
+
+
+@pytest.fixture
+def checkpoints(tmp_path, monkeypatch):
+    store = IngestionCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+    monkeypatch.setattr(graphiti, "get_checkpoint_store", lambda: store)
+    return store
+
+
+def ingest(chunks, **kwargs):
+    return asyncio.run(graphiti.ingest_chunks_to_graph(chunks, {"filename": "manual.pdf"}, **kwargs))
+
+
+def stamp_queries(fake):
+    return [params for query, params in fake.driver.queries if "SET e.content_hash" in query]
+
+
+class TestContentHashStamps:
+    """Test suite for content_hash stamping after add_episode"""
+
+    def test_stamps_by_episode_uuid(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "GRAPHITI_INGEST_CONCURRENCY", 1)
+
+        summary = ingest(make_chunks(2))
+
+        assert summary["successful"] == 2
+        stamps = [stamp for params in stamp_queries(client) for stamp in params["stamps"]]
+        assert stamps == [
+            {"uuid": "episode-0", "content_hash": "hash-0"},
+            {"uuid": "episode-1", "content_hash": "hash-1"},
+        ]
+
+    def test_one_stamp_query_per_window(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "GRAPHITI_INGEST_CONCURRENCY", 4)
+
+        ingest(make_chunks(8))
+
+        queries = stamp_queries(client)
+        assert len(queries) < 8
+        assert sorted(stamp["content_hash"] for params in queries for stamp in params["stamps"]) == [
+            f"hash-{i}" for i in range(8)
+        ]
+
+    def test_streamed_chunks_are_stamped_per_window(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "GRAPHITI_INGEST_CONCURRENCY", 4)
+
+        async def stream():
+            for chunk in make_chunks(8):
+                yield chunk
+
+        asyncio.run(graphiti.ingest_chunks_to_graph(stream(), {"filename": "manual.pdf"}))
+
+        assert 0 < len(stamp_queries(client)) < 8
+
+
+class TestSkipIngested:
+    """Test suite for skipping chunks already ingested (checkpoint / content_hash)"""
+
+    def test_streamed_hashes_are_looked_up_per_window(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "GRAPHITI_SKIP_INGESTED_CHUNKS", True)
+
+        async def stream():
+            for chunk in make_chunks(graphiti.STREAM_HASH_LOOKUP_WINDOW + 4):
+                yield chunk
+
+        asyncio.run(graphiti.ingest_chunks_to_graph(stream(), {"filename": "manual.pdf"}))
+
+        lookups = [params["hashes"] for query, params in client.driver.queries if "IN $hashes" in query]
+        assert [len(hashes) for hashes in lookups] == [graphiti.STREAM_HASH_LOOKUP_WINDOW, 4]
+
+    def test_positions_added_by_the_stream_are_skipped(self, client):
+        done_positions = set()
+
+        async def stream():
+            for chunk in make_chunks(3):
+                if chunk["index"] == 1:
+                    done_positions.add(1)  # Checkpoint: ingested before a restart
+                yield chunk
+
+        summary = asyncio.run(graphiti.ingest_chunks_to_graph(
+            stream(), {"filename": "manual.pdf"}, done_positions=done_positions
+        ))
+
+        assert [call["name"] for call in client.calls] == ["manual.pdf - Chunk 0", "manual.pdf - Chunk 2"]
+        assert summary["skipped"] == 1
+        assert summary["resumed"] == 1
+
+
+class TestRetryAndDeadLetters:
+    """Test suite for chunk retries and the dead-letter store"""
+
+    def test_transient_failure_is_retried(self, client):
+        client.failures["manual.pdf - Chunk 0"] = [TimeoutError()]
+
+        summary = ingest(make_chunks(1))
+
+        assert summary["successful"] == 1
+        assert len(client.calls) == 2
+
+    def test_episode_written_by_timed_out_attempt_is_not_duplicated(self, client):
+        client.failures["manual.pdf - Chunk 0"] = [Written(TimeoutError())]
+
+        summary = ingest(make_chunks(1))
+
+        assert summary["successful"] == 1
+        assert len(client.calls) == 1
+        assert summary["graph_delta"]["exact"] is False
+        stamps = [stamp for params in stamp_queries(client) for stamp in params["stamps"]]
+        assert stamps == [{"uuid": "episode-0", "content_hash": "hash-0"}]
+
+    def test_permanent_failure_is_dead_lettered(self, client, checkpoints):
+        client.failures["manual.pdf - Chunk 1"] = [ValueError("malformed response")]
+
+        summary = ingest(make_chunks(3), upload_id="u1")
+
+        assert summary["successful"] == 2
+        assert summary["failed_chunk_indexes"] == [1]
+        assert len(client.calls) == 3  # Not retried
+        [letter] = checkpoints.get_dead_letters("u1")
+        assert letter["chunk_index"] == 1
+        assert letter["error_type"] == "ValueError"
+        assert letter["attempts"] == 1
+
+    def test_exhausted_retries_are_dead_lettered(self, client, checkpoints):
+        client.failures["manual.pdf - Chunk 0"] = [TimeoutError()] * 3
+
+        ingest(make_chunks(1), upload_id="u1")
+
+        [letter] = checkpoints.get_dead_letters("u1")
+        assert letter["error_type"] == "TimeoutError"
+        assert letter["attempts"] == 3
+
+    def test_dead_letter_retry_reuses_written_episode(self, client, checkpoints):
+        # Every attempt timed out, the last one was written anyway
+        client.failures["manual.pdf - Chunk 0"] = [TimeoutError(), TimeoutError(), Written(TimeoutError())]
+        chunks = make_chunks(1)
+        ingest(chunks, upload_id="u1")
+        assert checkpoints.count_dead_letters("u1") == 1
+
+        summary = ingest(chunks, upload_id="u1", check_existing=True)
+
+        assert summary["successful"] == 1
+        assert len(client.calls) == 3  # No new add_episode
+        assert checkpoints.count_dead_letters("u1") == 0
+
+    def test_retry_endpoint_reuses_written_episode_in_bulk_mode(self, client, checkpoints, monkeypatch):
+        client.failures["manual.pdf - Chunk 0"] = [TimeoutError(), TimeoutError(), Written(TimeoutError())]
+        ingest(make_chunks(1), upload_id="u1")
+        monkeypatch.setattr(settings, "GRAPHITI_BULK_INGESTION", True)
+        monkeypatch.setattr(processor, "get_checkpoint_store", lambda: checkpoints)
+        monkeypatch.setattr(processor, "processing_status", {})
+
+        summary = asyncio.run(processor.retry_failed_chunks("u1"))
+
+        assert summary["successful"] == 1
+        assert len(client.calls) == 3  # No add_episode_bulk, no new add_episode
+        assert processor.processing_status["u1"]["ingestion_progress"]["chunks_completed"] == 1
+
+
+class TestGraphDelta:
+    """Test suite for the per-ingestion graph delta"""
+
+    def test_single_ingestion_is_exact(self, client):
+        assert ingest(make_chunks(2))["graph_delta"]["exact"] is True
+
+    def test_overlapping_ingestions_are_not_exact(self, client):
+        client.delay = 0.02
+
+        async def run():
+            first = graphiti.ingest_chunks_to_graph(make_chunks(2), {"filename": "a.pdf"})
+            second = graphiti.ingest_chunks_to_graph(make_chunks(2), {"filename": "b.pdf"})
+            return await asyncio.gather(first, second)
+
+        summaries = asyncio.run(run())
+        assert [summary["graph_delta"]["exact"] for summary in summaries] == [False, False]
+        assert graphiti._active_ingestions == {}
+        assert ingest(make_chunks(1))["graph_delta"]["exact"] is True
+
+
+class TestBulkIngestion:
+    """Test suite for add_episode_bulk batches"""
+
+    def test_batches_are_admitted_by_token_budget(self, client, monkeypatch):
+        limiter = FakeLimiter()
+        monkeypatch.setattr(graphiti, "get_rate_limiter", lambda name: limiter)
+        monkeypatch.setattr(settings, "GRAPHITI_BULK_BATCH_SIZE", 3)
+
+        summary = ingest(make_chunks(5), bulk=True)
+
+        assert summary["successful"] == 5
+        assert [len(batch) for batch in client.calls] == [3, 2]
+        assert limiter.admitted == [30, 20]
+        assert summary["graph_delta"]["exact"] is False
+
+    def test_failed_batch_reuses_episodes_it_wrote(self, client, monkeypatch):
+        monkeypatch.setattr(graphiti, "get_rate_limiter", lambda name: FakeLimiter())
+
+        async def add_episode_bulk(raw_episodes, group_id):
+            # Saved the first episode, then timed out
+            client.driver.episodes[("manual.pdf - Chunk 0", "chunk 0")] = "bulk-0"
+            raise TimeoutError()
+
+        client.add_episode_bulk = add_episode_bulk
+
+        summary = ingest(make_chunks(2), bulk=True)
+
+        assert summary["successful"] == 2
+        assert [call["name"] for call in client.calls] == ["manual.pdf - Chunk 1"]
+        stamps = [stamp for params in stamp_queries(client) for stamp in params["stamps"]]
+        assert {"uuid": "bulk-0", "content_hash": "hash-0"} in stamps
+
+
+class TestEpisodeFields:
+    """Test suite for the episode fields sent to add_episode"""
+
+    def test_source_description_has_chunk_total(self, client):
+        chunks = make_chunks(2)
+        for chunk in chunks:
+            chunk["metadata"]["total_chunks"] = 2
+
+        ingest(chunks)
+
+        assert client.calls[1]["source_description"] == "Document: manual.pdf, Chunk 1/2"
+
+    def test_streamed_chunk_without_total_has_no_denominator(self, client):
+        async def stream():
+            for chunk in make_chunks(2):
+                chunk["metadata"]["total_chunks"] = None  # Filled once chunking completes
+                yield chunk
+
+        asyncio.run(graphiti.ingest_chunks_to_graph(stream(), {"filename": "manual.pdf"}))
+
+        assert [call["source_description"] for call in client.calls] == [
+            "Document: manual.pdf, Chunk 0",
+            "Document: manual.pdf, Chunk 1",
+        ]
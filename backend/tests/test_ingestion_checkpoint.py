@@ -0,0 +1,106 @@
+"""
+Unit Tests for the durable ingestion checkpoints (resume after restart)
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import document_queue, ingestion_checkpoint
+from app.services.ingestion_checkpoint import IngestionCheckpointStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return IngestionCheckpointStore(str(tmp_path / "state" / "checkpoints.sqlite"))
+
+
+CHUNKS = [{"index": 0, "text": "alpha"}, {"index": 1, "text": "beta"}]
+
+
+class TestIngestionCheckpointStore:
+    """Test suite for IngestionCheckpointStore"""
+
+    def test_register_keeps_chunked_document(self, store):
+        store.register_document("u1", "/uploads/u1.pdf", {"filename": "u1.pdf"})
+        store.save_chunks("u1", CHUNKS, {"title": "Manual"})
+        store.mark_chunks_done("u1", [0])
+
+        store.register_document("u1", "/uploads/u1.pdf", {"filename": "u1.pdf"})
+
+        saved = store.load_chunks("u1")
+        assert saved["chunks"] == CHUNKS
+        assert saved["done_positions"] == {0}
+        assert saved["doc_metadata"] == {"title": "Manual"}
+
+    def test_register_resets_finished_document(self, store):
+        store.register_document("u1", "/uploads/u1.pdf", {})
+        store.save_chunks("u1", CHUNKS, {})
+        store.finish_document("u1", "failed")
+
+        store.register_document("u1", "/uploads/u1.pdf", {})
+
+        assert store.load_chunks("u1") is None
+        assert [doc["status"] for doc in store.get_interrupted_documents()] == ["queued"]
+
+    def test_failed_save_is_rolled_back(self, store, monkeypatch):
+        store.register_document("u1", "/uploads/u1.pdf", {})
+        store.save_chunks("u1", CHUNKS, {})
+        store.mark_chunks_done("u1", [0])
+
+        def disk_full():
+            raise OSError("disk full")
+
+        with monkeypatch.context() as patched:
+            patched.setattr(ingestion_checkpoint, "time", SimpleNamespace(time=disk_full))
+            with pytest.raises(OSError):
+                store.save_chunks("u1", CHUNKS[:1], {})
+
+        assert store.load_chunks("u1")["done_positions"] == {0}
+        store.finish_document("u1", "completed")  # Connection not left inside a transaction
+        assert store.load_chunks("u1") is None
+
+    def test_restreamed_chunks_keep_done_flags(self, store):
+        store.register_document("u1", "/uploads/u1.pdf", {})
+        assert store.append_chunks("u1", 0, CHUNKS[:1]) == []
+        store.append_chunks("u1", 1, CHUNKS[1:] + [{"index": 2, "text": "gamma"}])
+        store.mark_chunks_done("u1", [0, 1, 2])
+
+        # Restart before the chunker finished: converted and streamed again
+        assert store.load_chunks("u1") is None
+        assert store.append_chunks("u1", 0, CHUNKS[:1]) == [0]
+        assert store.append_chunks("u1", 1, [{"index": 1, "text": "beta, revised"}]) == []
+        store.complete_chunking("u1", 2, {"title": "Manual"})
+
+        saved = store.load_chunks("u1")
+        assert saved["done_positions"] == {0}
+        assert [chunk["text"] for chunk in saved["chunks"]] == ["alpha", "beta, revised"]
+
+    def test_save_after_interrupted_stream_keeps_done_flags(self, store):
+        store.register_document("u1", "/uploads/u1.pdf", {})
+        store.append_chunks("u1", 0, CHUNKS)
+        store.mark_chunks_done("u1", [1])
+
+        assert store.save_chunks("u1", CHUNKS, {}) == [1]
+        assert store.load_chunks("u1")["done_positions"] == {1}
+
+
+class TestResumeInterruptedDocuments:
+    """Restart path: re-enqueued documents keep their saved chunks"""
+
+    def test_resume_keeps_saved_chunks(self, store, tmp_path, monkeypatch):
+        source = tmp_path / "manual.pdf"
+        source.write_bytes(b"%PDF-1.4")
+        store.register_document("u1", str(source), {"filename": "manual.pdf"})
+        store.save_chunks("u1", CHUNKS, {"title": "Manual"})
+
+        monkeypatch.setattr(document_queue, "get_checkpoint_store", lambda: store)
+        monkeypatch.setattr(document_queue.settings, "INGESTION_CHECKPOINTS_ENABLED", True)
+        monkeypatch.setattr(document_queue.DocumentQueue, "_ensure_workers", lambda self: None)
+        monkeypatch.setattr(document_queue, "_document_queue", None)
+
+        async def resume():
+            return document_queue.resume_interrupted_documents()
+
+        assert asyncio.run(resume()) == 1
+        assert store.load_chunks("u1")["chunks"] == CHUNKS
@@ -0,0 +1,63 @@
+"""
+Unit Tests for the Graphiti LLM response cache (prompt kinds and keys)
+"""
+from enum import Enum
+from types import SimpleNamespace
+
+import pytest
+
+from app.integrations.llm_cache import classify_prompt, response_cache_key
+
+
+class ModelSize(Enum):
+    """Same values as graphiti_core.llm_client.config.ModelSize"""
+    small = "small"
+    medium = "medium"
+
+
+def response_model(name):
+    return type(name, (), {})
+
+
+def key(model_size=None, small_model="gemini-2.5-flash-lite-small"):
+    messages = [SimpleNamespace(role="user", content="Extract entities from: ...")]
+    return response_cache_key(
+        "gemini-2.5-flash-lite", small_model, model_size, 0.0, response_model("ExtractedEntities"), messages
+    )
+
+
+class TestClassifyPrompt:
+    """Test suite for classify_prompt"""
+
+    @pytest.mark.parametrize("name", [
+        "ExtractedEntities", "ExtractedEdges", "MissedEntities", "MissingFacts", "EdgeDates", "EntityClassification",
+    ])
+    def test_extraction(self, name):
+        assert classify_prompt(response_model(name)) == "extraction"
+
+    @pytest.mark.parametrize("name", ["NodeResolutions", "NodeDuplicate", "EdgeDuplicate", "UniqueFacts"])
+    def test_dedupe(self, name):
+        assert classify_prompt(response_model(name)) == "dedupe"
+
+    @pytest.mark.parametrize("name", ["InvalidatedEdges", "Summary", "SummaryDescription"])
+    def test_other(self, name):
+        assert classify_prompt(response_model(name)) == "other"
+
+    def test_plain_text_prompt(self):
+        assert classify_prompt(None) == "other"
+
+
+class TestResponseCacheKey:
+    """Test suite for response_cache_key"""
+
+    def test_model_size_is_part_of_the_key(self):
+        assert key(ModelSize.small) != key(ModelSize.medium)
+
+    def test_default_model_size_is_medium(self):
+        assert key(None) == key(ModelSize.medium)
+
+    def test_small_model_is_part_of_the_key(self):
+        assert key(ModelSize.small) != key(ModelSize.small, small_model="gemini-2.0-flash")
+
+    def test_same_prompt_same_key(self):
+        assert key(ModelSize.small) == key(ModelSize.small)
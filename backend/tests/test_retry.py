@@ -0,0 +1,97 @@
+"""
+Unit Tests for the provider retry policy (classification + backoff)
+
+Tests run the coroutines with asyncio.run (no running services needed).
+"""
+import asyncio
+
+import pytest
+
+from app.core.retry import backoff_delay, is_transient_error, retry_async
+
+
+class RateLimitError(Exception):
+    """Same class name as openai/Graphiti rate-limit errors"""
+
+
+class ServiceUnavailable(Exception):
+    """Same class name as the Neo4j driver error"""
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TestIsTransientError:
+    """Test suite for is_transient_error"""
+
+    @pytest.mark.parametrize("error", [
+        RateLimitError("slow down"),
+        asyncio.TimeoutError(),
+        TimeoutError(),
+        ConnectionResetError(),
+        ServiceUnavailable("leader switch"),
+        HTTPError(503),
+        HTTPError(429),
+    ])
+    def test_transient(self, error):
+        assert is_transient_error(error)
+
+    @pytest.mark.parametrize("error", [
+        ValueError("malformed response"),
+        KeyError("uuid"),
+        HTTPError(400),
+        HTTPError(401),
+    ])
+    def test_permanent(self, error):
+        assert not is_transient_error(error)
+
+
+class TestRetryAsync:
+    """Test suite for retry_async"""
+
+    def test_retries_transient_errors_until_success(self):
+        calls = []
+        retries = []
+
+        async def call():
+            calls.append(1)
+            if len(calls) < 3:
+                raise TimeoutError()
+            return "ok"
+
+        result = asyncio.run(retry_async(
+            call, max_attempts=5, base_delay=0, on_retry=lambda attempt, e, delay: retries.append(attempt)
+        ))
+
+        assert result == "ok"
+        assert len(calls) == 3
+        assert retries == [1, 2]
+
+    def test_permanent_error_is_not_retried(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError):
+            asyncio.run(retry_async(call, max_attempts=5, base_delay=0))
+        assert len(calls) == 1
+
+    def test_gives_up_after_max_attempts(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            raise RateLimitError("429")
+
+        with pytest.raises(RateLimitError):
+            asyncio.run(retry_async(call, max_attempts=3, base_delay=0))
+        assert len(calls) == 3
+
+    def test_backoff_is_bounded(self):
+        for attempt in range(10):
+            assert 0 <= backoff_delay(attempt, base_delay=2.0, max_delay=5.0) <= 5.0
@@ -0,0 +1,93 @@
+"""
+Unit Tests for merging page-range shards (merge_docling_documents)
+
+Two small shard documents are built with the docling_core API and merged
+back; no conversion runs.
+"""
+from docling_core.types.doc import BoundingBox, DocItemLabel, DoclingDocument, GroupLabel, ProvenanceItem, Size
+
+from app.integrations.dockling import _shift_refs, merge_docling_documents
+
+
+def prov(page_no):
+    return ProvenanceItem(page_no=page_no, bbox=BoundingBox(l=10, t=10, r=100, b=40), charspan=(0, 1))
+
+
+def shard(pages, heading, paragraphs, bullet):
+    """Shard with a heading, paragraphs (one per page) and a one-item list"""
+    doc = DoclingDocument(name="manual")
+    for page_no in pages:
+        doc.add_page(page_no=page_no, size=Size(width=595, height=842))
+    doc.add_heading(text=heading, prov=prov(pages[0]))
+    for page_no, text in zip(pages, paragraphs):
+        doc.add_text(label=DocItemLabel.TEXT, text=text, prov=prov(page_no))
+    group = doc.add_group(label=GroupLabel.LIST)
+    doc.add_list_item(text=bullet, parent=group, prov=prov(pages[-1]))
+    return doc
+
+
+def reading_order(doc):
+    return [item.text for item, _ in doc.iterate_items() if hasattr(item, "text")]
+
+
+class TestShiftRefs:
+    """Test suite for _shift_refs"""
+
+    def test_rebases_refs_and_pages(self):
+        node = {
+            "self_ref": "#/texts/1",
+            "parent": {"$ref": "#/groups/0"},
+            "children": [{"cref": "#/texts/2"}, {"$ref": "#/body"}],
+            "prov": [{"page_no": 2}],
+        }
+
+        shifted = _shift_refs(node, {"texts": 5, "groups": 1}, page_shift=10)
+
+        assert shifted == {
+            "self_ref": "#/texts/6",
+            "parent": {"$ref": "#/groups/1"},
+            "children": [{"cref": "#/texts/7"}, {"$ref": "#/body"}],
+            "prov": [{"page_no": 12}],
+        }
+
+
+class TestMergeDoclingDocuments:
+    """Test suite for merge_docling_documents"""
+
+    def _merged(self, second_pages):
+        first = shard([1, 2], "Chapter 1", ["Page one", "Page two"], "Check the regulator")
+        second = shard(second_pages, "Chapter 2", ["Page three", "Page four"], "Log the dive")
+        return merge_docling_documents([first, second], [1, 3])
+
+    def test_reading_order_is_preserved(self):
+        merged = self._merged([1, 2])
+
+        assert reading_order(merged) == [
+            "Chapter 1", "Page one", "Page two", "Check the regulator",
+            "Chapter 2", "Page three", "Page four", "Log the dive",
+        ]
+
+    def test_page_numbers_restarting_at_one_are_shifted(self):
+        merged = self._merged([1, 2])
+
+        assert sorted(merged.pages) == [1, 2, 3, 4]
+        pages = {item.text: item.prov[0].page_no for item, _ in merged.iterate_items() if hasattr(item, "text")}
+        assert pages["Page three"] == 3
+        assert pages["Log the dive"] == 4
+
+    def test_original_page_numbers_are_kept(self):
+        merged = self._merged([3, 4])
+
+        assert sorted(merged.pages) == [1, 2, 3, 4]
+        assert [text.prov[0].page_no for text in merged.texts if text.text.startswith("Page")] == [1, 2, 3, 4]
+
+    def test_refs_resolve_after_merge(self):
+        merged = self._merged([1, 2])
+
+        for index, text in enumerate(merged.texts):
+            assert text.self_ref == f"#/texts/{index}"
+        for index, group in enumerate(merged.groups):
+            assert group.self_ref == f"#/groups/{index}"
+            for child in group.children:
+                assert child.resolve(merged).parent.cref == group.self_ref
+        assert [child.resolve(merged).text for child in merged.groups[1].children] == ["Log the dive"]
@@ -0,0 +1,118 @@
+"""
+Unit Tests for ETag / 304 on the polled endpoints (upload status, queue status)
+
+The upload router runs in a bare FastAPI app on a private status store and a
+fake document queue.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import upload
+from app.core.status_store import StatusStore
+
+
+class FakeQueue:
+    """Queue snapshot with a version bumped on every change"""
+
+    def __init__(self):
+        self.version = 1000
+        self.snapshot = {"queue_size": 0, "processing": False}
+
+    def get_status(self):
+        return self.snapshot
+
+    def change(self, **fields):
+        self.snapshot = {**self.snapshot, **fields}
+        self.version += 1
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = StatusStore(max_entries=10, ttl_sec=60, stale_sec=600)
+    monkeypatch.setattr(upload, "get_processing_status", store.get)
+    return store
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    queue = FakeQueue()
+    monkeypatch.setattr(upload, "get_document_queue", lambda: queue)
+    return queue
+
+
+@pytest.fixture
+def client(store, queue):
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/api")
+    return TestClient(app)
+
+
+class TestUploadStatusETag:
+    """Test suite for ETag / If-None-Match on GET /upload/{upload_id}/status"""
+
+    def test_etag_is_status_version(self, client, store):
+        store["u1"] = {"status": "processing", "progress": 10}
+
+        response = client.get("/api/upload/u1/status")
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == f'"{store["u1"].version}"'
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.json()["progress"] == 10
+
+    def test_unchanged_status_is_not_modified(self, client, store):
+        store["u1"] = {"status": "processing", "progress": 10}
+        etag = client.get("/api/upload/u1/status").headers["etag"]
+
+        response = client.get("/api/upload/u1/status", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_changed_status_gets_new_etag(self, client, store):
+        store["u1"] = {"status": "processing", "progress": 10}
+        etag = client.get("/api/upload/u1/status").headers["etag"]
+        store["u1"]["progress"] = 50
+
+        response = client.get("/api/upload/u1/status", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["progress"] == 50
+
+    @pytest.mark.parametrize("header", ['"1", {etag}', "W/{etag}", "*"])
+    def test_if_none_match_forms(self, client, store, header):
+        store["u1"] = {"status": "processing"}
+        etag = client.get("/api/upload/u1/status").headers["etag"]
+
+        response = client.get("/api/upload/u1/status", headers={"If-None-Match": header.format(etag=etag)})
+
+        assert response.status_code == 304
+
+    def test_unknown_upload(self, client):
+        assert client.get("/api/upload/missing/status", headers={"If-None-Match": "*"}).status_code == 404
+
+
+class TestQueueStatusETag:
+    """Test suite for ETag / If-None-Match on GET /queue/status"""
+
+    def test_unchanged_queue_is_not_modified(self, client, queue):
+        response = client.get("/api/queue/status")
+        assert response.headers["etag"] == '"1000"'
+        assert response.json() == {"queue_size": 0, "processing": False}
+
+        response = client.get("/api/queue/status", headers={"If-None-Match": '"1000"'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_changed_queue_gets_new_etag(self, client, queue):
+        queue.change(queue_size=2)
+
+        response = client.get("/api/queue/status", headers={"If-None-Match": '"1000"'})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"1001"'
+        assert response.json()["queue_size"] == 2
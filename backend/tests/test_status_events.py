@@ -0,0 +1,187 @@
+"""
+Unit Tests for processing status events (StatusEventBroker, GET /upload/{id}/events)
+
+The upload router runs in a bare FastAPI app on a private status store and
+broker; status changes are made from a helper thread once the expected
+subscribers are connected (the test client returns when the stream ends).
+"""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api import upload
+from app.core.config import settings
+from app.core.status_events import StatusEventBroker
+from app.core.status_store import StatusStore
+
+
+@pytest.fixture
+def store():
+    return StatusStore(max_entries=10, ttl_sec=60, stale_sec=600)
+
+
+@pytest.fixture
+def broker(store, monkeypatch):
+    broker = StatusEventBroker(store)
+    monkeypatch.setattr(upload, "get_processing_status", store.get)
+    monkeypatch.setattr(upload, "get_status_event_broker", lambda: broker)
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_SEC", 0.05)
+    return broker
+
+
+@pytest.fixture
+def client(broker):
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/api")
+    with TestClient(app) as client:
+        yield client
+
+
+def events(body):
+    """SSE messages of a response body as (event, data) pairs (comments skipped)"""
+    parsed = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.split("\n") if not line.startswith(":"))
+        if "event" in fields:
+            parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+def after_subscribers(broker, count, action):
+    """Run action in a thread once `count` clients are subscribed"""
+    def run():
+        deadline = time.time() + 5
+        while broker.get_stats()["subscribers"] < count and time.time() < deadline:
+            time.sleep(0.01)
+        action()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestStatusEventBroker:
+    """Test suite for StatusEventBroker fan-out and resume"""
+
+    def test_delta_is_fanned_out_to_every_subscriber(self, store, broker):
+        store["u1"] = {"status": "processing", "progress": 10, "stage": "conversion"}
+
+        async def run():
+            first, _ = broker.subscribe("u1")
+            second, _ = broker.subscribe("u1")
+            store["u1"]["progress"] = 40
+            return first.get_nowait(), second.get_nowait()
+
+        first, second = asyncio.run(run())
+        assert first == second
+        assert first[1:] == ("progress", {"progress": 40})
+
+    def test_resume_sends_missed_deltas(self, store, broker):
+        store["u1"] = {"status": "processing", "progress": 10}
+
+        async def run():
+            queue, [(snapshot_id, _, _)] = broker.subscribe("u1")
+            store["u1"]["progress"] = 20
+            store["u1"]["progress"] = 30
+            broker.unsubscribe("u1", queue)
+            return broker.subscribe("u1", last_event_id=snapshot_id)[1]
+
+        assert [data for _, _, data in asyncio.run(run())] == [{"progress": 20}, {"progress": 30}]
+
+    def test_unsubscribe_stops_tracking_removed_status(self, store, broker):
+        store["u1"] = {"status": "processing"}
+
+        async def run():
+            queue, _ = broker.subscribe("u1")
+            del store["u1"]
+            broker.unsubscribe("u1", queue)
+
+        asyncio.run(run())
+        assert broker.get_stats() == {"tracked_uploads": 0, "subscribers": 0}
+
+
+class TestEventsEndpoint:
+    """Test suite for GET /upload/{upload_id}/events"""
+
+    def test_unknown_upload(self, client):
+        assert client.get("/api/upload/missing/events").status_code == 404
+
+    def test_stream_ends_when_processing_completes(self, client, store, broker):
+        store["u1"] = {"status": "processing", "progress": 10, "metadata": {"filename": "manual.pdf"}}
+
+        def finish():
+            store["u1"]["progress"] = 60
+            store["u1"].update({"status": "completed", "progress": 100})
+
+        after_subscribers(broker, 1, finish)
+        response = client.get("/api/upload/u1/events")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.startswith("retry: 3000\n\n")
+        assert events(response.text) == [
+            ("snapshot", {"status": "processing", "progress": 10}),
+            ("progress", {"progress": 60}),
+            ("progress", {"status": "completed", "progress": 100}),
+            ("end", {}),
+        ]
+        assert broker.get_stats()["subscribers"] == 0
+
+    def test_concurrent_streams_receive_the_same_events(self, client, store, broker):
+        store["u1"] = {"status": "processing", "progress": 10}
+        after_subscribers(broker, 2, lambda: store["u1"].update({"status": "failed", "error": "boom"}))
+
+        responses = [None, None]
+
+        def stream(index):
+            responses[index] = client.get("/api/upload/u1/events")
+
+        threads = [threading.Thread(target=stream, args=(index,)) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        first, second = (response.text for response in responses)
+        assert first == second
+        assert events(first)[1:] == [("progress", {"status": "failed", "error": "boom"}), ("end", {})]
+        assert broker.get_stats()["subscribers"] == 0
+
+    def test_client_disconnect_unsubscribes(self, client, store, broker, monkeypatch):
+        store["u1"] = {"status": "processing", "progress": 10}
+
+        async def disconnected(self):
+            return True
+
+        monkeypatch.setattr(Request, "is_disconnected", disconnected)
+        response = client.get("/api/upload/u1/events")
+
+        assert [event for event, _ in events(response.text)] == ["snapshot"]
+        assert broker.get_stats() == {"tracked_uploads": 1, "subscribers": 0}
+
+    def test_expired_status_closes_stream(self, client, store, broker):
+        store["u1"] = {"status": "processing", "progress": 10}
+
+        def expire():
+            del store["u1"]
+
+        after_subscribers(broker, 1, expire)
+        response = client.get("/api/upload/u1/events")
+
+        assert [event for event, _ in events(response.text)] == ["snapshot"]
+        assert broker.get_stats() == {"tracked_uploads": 0, "subscribers": 0}
+
+    def test_resume_after_end_only_sends_end(self, client, store):
+        store["u1"] = {"status": "completed", "progress": 100}
+        first = client.get("/api/upload/u1/events").text
+        assert [event for event, _ in events(first)] == ["snapshot", "end"]
+
+        last_event_id = first.split("id: ")[1].split("\n")[0]
+        response = client.get("/api/upload/u1/events", headers={"Last-Event-ID": last_event_id})
+
+        assert events(response.text) == [("end", {})]
@@ -0,0 +1,142 @@
+"""
+Unit Tests for the bounded processing status store
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.status_store import StatusStore
+
+
+def make_store(backend="memory", max_entries=10):
+    return StatusStore(max_entries=max_entries, ttl_sec=60, stale_sec=600, backend=backend)
+
+
+def age(store, upload_id, seconds):
+    """Pretend the entry was last updated `seconds` ago"""
+    store._updated_at[upload_id] = time.time() - seconds
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STATE_DIR", str(tmp_path))
+    return make_store("sqlite")
+
+
+class TestStatusStoreEviction:
+    """Test suite for StatusStore TTL and LRU eviction"""
+
+    def test_finished_entry_expires_after_ttl(self):
+        store = make_store()
+        store["done"] = {"status": "completed"}
+        store["recent"] = {"status": "completed"}
+        age(store, "done", 120)
+
+        assert asyncio.run(store.sweep()) == 1
+        assert "done" not in store
+        assert "recent" in store
+
+    def test_ttl_override(self):
+        store = make_store()
+        store["done"] = {"status": "failed"}
+        age(store, "done", 30)
+
+        assert asyncio.run(store.sweep(ttl_sec=10)) == 1
+        assert "done" not in store
+
+    def test_processing_entry_expires_only_when_stale(self):
+        store = make_store()
+        store["running"] = {"status": "processing"}
+        store["orphan"] = {"status": "processing"}
+        age(store, "running", 120)
+        age(store, "orphan", 1200)
+
+        assert asyncio.run(store.sweep()) == 1
+        assert "running" in store
+        assert "orphan" not in store
+
+    def test_lru_evicts_least_recently_updated_finished_entries(self):
+        store = make_store(max_entries=2)
+        store["a"] = {"status": "completed"}
+        store["b"] = {"status": "completed"}
+        store["a"]["progress"] = 100  # a is now the most recently updated
+        store["c"] = {"status": "processing"}
+
+        assert list(store) == ["a", "c"]
+        assert store.get_stats()["evicted"] == 1
+
+    def test_lru_never_evicts_active_entries(self):
+        store = make_store(max_entries=1)
+        store["a"] = {"status": "queued"}
+        store["b"] = {"status": "processing"}
+
+        assert list(store) == ["a", "b"]
+
+    def test_removal_notifies_listeners(self):
+        store = make_store()
+        events = []
+        store.add_listener(lambda upload_id, status: events.append((upload_id, status and status["status"])))
+        store["a"] = {"status": "completed"}
+        age(store, "a", 120)
+        asyncio.run(store.sweep())
+
+        assert events == [("a", "completed"), ("a", None)]
+
+    def test_version_increases_on_every_change(self):
+        store = make_store()
+        entry = store.setdefault("a", {"status": "queued"})
+        first = entry.version
+        entry.update(status="processing")
+
+        assert entry.version > first
+        assert store["a"] is entry
+
+
+class TestSQLiteStatusBackend:
+    """Test suite for the SQLite status backend (write-behind)"""
+
+    def test_round_trip_through_another_store(self, sqlite_store):
+        sqlite_store["a"] = {"status": "processing", "progress": 10}
+        sqlite_store["a"].update(progress=50)
+        version = sqlite_store["a"].version
+        sqlite_store.flush()
+
+        reader = make_store("sqlite")
+        entry = reader["a"]
+        assert dict(entry) == {"status": "processing", "progress": 50}
+        assert entry.version == version
+
+    def test_pending_write_is_visible_before_flush(self, sqlite_store):
+        sqlite_store["a"] = {"status": "processing"}
+        sqlite_store._entries.clear()  # Evicted from memory, row not written yet
+
+        assert sqlite_store["a"]["status"] == "processing"
+
+    def test_delete_is_written_behind(self, sqlite_store):
+        sqlite_store["a"] = {"status": "completed"}
+        sqlite_store.flush()
+        del sqlite_store["a"]
+        sqlite_store.flush()
+
+        assert make_store("sqlite").get("a") is None
+
+    def test_writer_thread_batches_changes(self, sqlite_store):
+        for progress in range(20):
+            sqlite_store["a"] = {"status": "processing", "progress": progress}
+
+        deadline = time.time() + 5
+        while sqlite_store._pending and time.time() < deadline:
+            time.sleep(0.05)
+        assert make_store("sqlite")["a"]["progress"] == 19
+
+    def test_sweep_expires_rows(self, sqlite_store):
+        sqlite_store["done"] = {"status": "completed"}
+        sqlite_store["active"] = {"status": "processing"}
+        sqlite_store.flush()
+        sqlite_store.backend.write_batch({"done": ({"status": "completed"}, time.time() - 120, 1)})
+
+        assert asyncio.run(sqlite_store.sweep()) == 1
+        assert sqlite_store.backend.load("done") is None
+        assert sqlite_store.backend.load("active") is not None
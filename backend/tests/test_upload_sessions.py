@@ -0,0 +1,204 @@
+"""
+Unit Tests for the resumable upload endpoints (session → PUT ranges → finalize)
+
+The upload router runs in a bare FastAPI app; the document queue is replaced
+by a fake that records enqueued uploads.
+"""
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import upload
+from app.core import processor
+from app.core.config import settings
+from app.services.upload_store import UploadStore
+
+CONTENT = b"%PDF-1.4 " + bytes(range(256)) * 4
+
+
+class FakeQueue:
+    """enqueue() records the upload; nothing is processed"""
+
+    def __init__(self):
+        self.queue = []
+        self.in_flight = {}
+        self.enqueued = []
+
+    def enqueue(self, file_path, upload_id, metadata):
+        self.enqueued.append({"file_path": file_path, "upload_id": upload_id, "metadata": metadata})
+        return {"queue_position": len(self.enqueued)}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = UploadStore(str(tmp_path / ".state" / "uploads.sqlite"), str(tmp_path))
+    monkeypatch.setattr(upload, "get_upload_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    queue = FakeQueue()
+    monkeypatch.setattr(upload, "get_document_queue", lambda: queue)
+    return queue
+
+
+@pytest.fixture
+def client(store, queue, monkeypatch):
+    monkeypatch.setattr(settings, "PREFLIGHT_ENABLED", False)
+    monkeypatch.setattr(settings, "UPLOAD_DEDUPLICATION_ENABLED", True)
+    monkeypatch.setattr(processor, "processing_status", {})
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/api")
+    return TestClient(app)
+
+
+def open_session(client, size=len(CONTENT)):
+    response = client.post("/api/upload/sessions", json={"filename": "manual.pdf", "size_bytes": size})
+    assert response.status_code == 201
+    return response.json()["session_id"]
+
+
+def put_range(client, session_id, start, end, total=len(CONTENT)):
+    return client.put(
+        f"/api/upload/sessions/{session_id}",
+        content=CONTENT[start:end + 1],
+        headers={"Content-Range": f"bytes {start}-{end}/{total}"},
+    )
+
+
+class TestPutRange:
+    """Test suite for PUT /upload/sessions/{id}"""
+
+    def test_ranges_are_appended(self, client, store):
+        session_id = open_session(client)
+
+        first = put_range(client, session_id, 0, 99)
+        second = put_range(client, session_id, 100, len(CONTENT) - 1)
+
+        assert first.json()["offset"] == 100
+        assert second.json()["offset"] == len(CONTENT)
+        assert second.json()["complete"] is True
+        with open(store.incoming_path(session_id), "rb") as f:
+            assert f.read() == CONTENT
+
+    def test_range_past_offset_is_rejected(self, client):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, 99)
+
+        response = put_range(client, session_id, 200, 299)
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["offset"] == 100
+
+    def test_overlapping_retry_skips_received_bytes(self, client, store):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, 99)
+
+        # Response to the first PUT was lost: client resends from 50
+        response = put_range(client, session_id, 50, 199)
+
+        assert response.json()["offset"] == 200
+        with open(store.incoming_path(session_id), "rb") as f:
+            assert f.read() == CONTENT[:200]
+
+    def test_invalid_content_range(self, client):
+        session_id = open_session(client)
+
+        assert put_range(client, session_id, 0, 99, total=10).status_code == 400
+        assert client.put(f"/api/upload/sessions/{session_id}", content=b"x").status_code == 400
+
+    def test_unknown_session(self, client):
+        assert put_range(client, "missing", 0, 99).status_code == 404
+
+    def test_busy_session_is_released(self, client):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, 99)
+        put_range(client, session_id, 200, 299)  # 409 inside the busy section
+
+        assert upload._busy_sessions == set()
+        assert put_range(client, session_id, 100, 199).status_code == 200
+
+    def test_concurrent_put_is_rejected(self, client):
+        session_id = open_session(client)
+        upload._busy_sessions.add(session_id)
+        try:
+            response = put_range(client, session_id, 0, 99)
+        finally:
+            upload._busy_sessions.discard(session_id)
+
+        assert response.status_code == 409
+
+
+class TestFinalize:
+    """Test suite for POST /upload/sessions/{id}/finalize"""
+
+    def test_complete_upload_is_enqueued(self, client, store, queue):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, len(CONTENT) - 1)
+
+        response = client.post(f"/api/upload/sessions/{session_id}/finalize")
+
+        assert response.status_code == 200
+        assert response.json()["upload_id"] == session_id
+        assert response.json()["status"] == "queued"
+        [entry] = queue.enqueued
+        assert entry["metadata"]["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+        with open(entry["file_path"], "rb") as f:
+            assert f.read() == CONTENT
+        assert store.get_session(session_id) is None
+        assert upload._busy_sessions == set()
+
+    def test_incomplete_upload_is_rejected(self, client, queue):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, 99)
+
+        response = client.post(f"/api/upload/sessions/{session_id}/finalize")
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["offset"] == 100
+        assert queue.enqueued == []
+
+    def test_second_finalize_is_rejected(self, client, queue):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, len(CONTENT) - 1)
+        assert client.post(f"/api/upload/sessions/{session_id}/finalize").status_code == 200
+
+        response = client.post(f"/api/upload/sessions/{session_id}/finalize")
+
+        assert response.status_code == 404
+        assert len(queue.enqueued) == 1
+
+    def test_finalize_during_another_finalize_is_rejected(self, client, store, queue):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, len(CONTENT) - 1)
+        upload._busy_sessions.add(session_id)  # First finalize still hashing
+        try:
+            response = client.post(f"/api/upload/sessions/{session_id}/finalize")
+        finally:
+            upload._busy_sessions.discard(session_id)
+
+        assert response.status_code == 409
+        assert queue.enqueued == []
+        assert store.get_session(session_id)["offset"] == len(CONTENT)
+
+    def test_abort_waits_for_range_in_progress(self, client, store):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, 99)
+        upload._busy_sessions.add(session_id)
+        try:
+            response = client.delete(f"/api/upload/sessions/{session_id}")
+        finally:
+            upload._busy_sessions.discard(session_id)
+
+        assert response.status_code == 409
+        assert store.get_session(session_id)["offset"] == 100
+
+    def test_abort_removes_session(self, client, store):
+        session_id = open_session(client)
+        put_range(client, session_id, 0, 99)
+
+        assert client.delete(f"/api/upload/sessions/{session_id}").status_code == 200
+        assert client.get(f"/api/upload/sessions/{session_id}").status_code == 404
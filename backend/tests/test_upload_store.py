@@ -0,0 +1,181 @@
+"""
+Unit Tests for the content-addressed upload store
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import document_queue
+from app.services.upload_store import UploadStore
+
+SHA = "ab" + "0" * 62
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadStore(str(tmp_path / ".state" / "uploads.sqlite"), str(tmp_path))
+
+
+def receive(store, upload_id, content=b"%PDF-1.4 manual"):
+    path = store.incoming_path(upload_id)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+class TestClaim:
+    """Test suite for UploadStore.claim (duplicate detection)"""
+
+    def test_first_upload_is_claimed(self, store):
+        assert store.claim(SHA, "u1", "manual.pdf", 15) is None
+        assert store.get(SHA)["status"] == "queued"
+
+    def test_completed_hash_is_duplicate(self, store):
+        store.claim(SHA, "u1", "manual.pdf", 15)
+        store.mark_finished("u1", succeeded=True)
+
+        duplicate = store.claim(SHA, "u2", "copy.pdf", 15)
+        assert duplicate["upload_id"] == "u1"
+        assert duplicate["status"] == "completed"
+
+    def test_live_queued_hash_is_duplicate(self, store):
+        store.claim(SHA, "u1", "manual.pdf", 15)
+
+        assert store.claim(SHA, "u2", "copy.pdf", 15, live_upload_ids={"u1"})["upload_id"] == "u1"
+
+    def test_orphaned_queued_hash_is_taken_over(self, store):
+        store.claim(SHA, "u1", "manual.pdf", 15)
+
+        assert store.claim(SHA, "u2", "copy.pdf", 15, live_upload_ids=set()) is None
+        assert store.get(SHA)["upload_id"] == "u2"
+
+    def test_failed_hash_can_be_uploaded_again(self, store):
+        store.claim(SHA, "u1", "manual.pdf", 15)
+        store.mark_finished("u1", succeeded=False)
+
+        assert store.claim(SHA, "u2", "manual.pdf", 15) is None
+
+
+class TestAdopt:
+    """Test suite for UploadStore.adopt (incoming → object store)"""
+
+    def test_moves_file_into_object_store(self, store):
+        store.claim(SHA, "u1", "manual.pdf", 15)
+        incoming = receive(store, "u1")
+
+        file_path = store.adopt(SHA, incoming, "manual.pdf")
+
+        assert file_path == os.path.join(store.objects_dir, SHA[:2], SHA, "manual.pdf")
+        assert os.path.exists(file_path)
+        assert not os.path.exists(incoming)
+        assert store.get(SHA)["file_path"] == file_path
+
+    def test_reuses_existing_object(self, store):
+        store.claim(SHA, "u1", "manual.pdf", 15)
+        first = store.adopt(SHA, receive(store, "u1"), "manual.pdf")
+        store.mark_finished("u1", succeeded=False)
+
+        store.claim(SHA, "u2", "renamed.pdf", 15)
+        incoming = receive(store, "u2")
+        assert store.adopt(SHA, incoming, "renamed.pdf") == first
+        assert not os.path.exists(incoming)
+
+
+class TestSweep:
+    """Test suite for UploadStore retention"""
+
+    def _stored(self, store, succeeded):
+        store.claim(SHA, "u1", "manual.pdf", 15)
+        file_path = store.adopt(SHA, receive(store, "u1"), "manual.pdf")
+        store.mark_finished("u1", succeeded=succeeded)
+        return file_path
+
+    def _age(self, store, days):
+        with store._lock:
+            store._conn.execute("UPDATE uploads SET updated_at = ?", (time.time() - days * 86400,))
+
+    def test_removes_old_finished_files(self, store):
+        file_path = self._stored(store, succeeded=True)
+        self._age(store, 40)
+
+        assert store.sweep(retention_days=30) == 1
+        assert not os.path.exists(file_path)
+        assert store.get(SHA)["file_deleted_at"] is not None
+
+    def test_keeps_recent_and_active_files(self, store):
+        file_path = self._stored(store, succeeded=True)
+        store.claim("cd" + "0" * 62, "u2", "other.pdf", 15)
+
+        assert store.sweep(retention_days=30) == 0
+        assert os.path.exists(file_path)
+
+    def test_removes_stale_incoming_files(self, store):
+        incoming = receive(store, "abandoned")
+        old = time.time() - 40 * 86400
+        os.utime(incoming, (old, old))
+
+        assert store.sweep(retention_days=30) == 1
+        assert not os.path.exists(incoming)
+
+    def test_undeletable_file_is_retried(self, store, monkeypatch):
+        file_path = self._stored(store, succeeded=True)
+        self._age(store, 40)
+
+        def refuse(path):
+            raise PermissionError(path)
+
+        monkeypatch.setattr(os, "unlink", refuse)
+        assert store.sweep(retention_days=30) == 0
+        assert store.get(SHA)["file_deleted_at"] is None
+        monkeypatch.undo()
+
+        assert store.sweep(retention_days=30) == 1
+        assert not os.path.exists(file_path)
+
+    def test_file_kept_after_success_by_default(self, store):
+        assert os.path.exists(self._stored(store, succeeded=True))
+
+    def test_delete_after_success(self, store, monkeypatch):
+        monkeypatch.setattr(settings, "UPLOAD_DELETE_AFTER_SUCCESS", True)
+
+        assert not os.path.exists(self._stored(store, succeeded=True))
+        assert store.get(SHA)["file_deleted_at"] is not None
+
+
+class TestQueueFinish:
+    """Test suite for DocumentQueue._finish (upload store outcome)"""
+
+    def test_store_updates_run_off_the_event_loop(self, store, monkeypatch):
+        queue = document_queue.DocumentQueue()
+        entry = {"upload_id": "u1", "filename": "manual.pdf"}
+        queue.in_flight["u1"] = entry
+        calls = []
+
+        def mark_finished(upload_id, succeeded):
+            calls.append(("mark_finished", succeeded, threading.get_ident(), "u1" in queue.in_flight))
+
+        def maybe_sweep():
+            calls.append(("maybe_sweep", None, threading.get_ident(), "u1" in queue.in_flight))
+
+        monkeypatch.setattr(store, "mark_finished", mark_finished)
+        monkeypatch.setattr(store, "maybe_sweep", maybe_sweep)
+        monkeypatch.setattr(document_queue, "get_upload_store", lambda: store)
+        monkeypatch.setattr(document_queue, "processing_status", {"u1": {"status": "completed"}})
+
+        async def finish():
+            await queue._finish(entry)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(finish())
+
+        assert [(name, succeeded, live) for name, succeeded, _, live in calls] == [
+            ("mark_finished", True, True),  # Still live until the outcome is recorded
+            ("maybe_sweep", None, False),
+        ]
+        assert all(thread != loop_thread for _, _, thread, _ in calls)
+        assert entry["status"] == "completed"
+        assert queue.in_flight == {}